@@ -0,0 +1,86 @@
+"""Benchmark how the superconducting ``build_quam`` steps scale with the number of qubits.
+
+Builds a flux-tunable machine from a synthetic wiring with an xy, rr and z line per
+qubit, with eight qubits per MW-FEM sharing one readout port, and times
+``add_ports``, ``add_transmons`` and ``add_pulses``. The time per qubit should stay
+roughly constant from 10 to 1000 qubits:
+
+    $ python benchmarks/build_quam_scaling.py --num-qubits 10 100 300 1000
+    $ python benchmarks/build_quam_scaling.py --num-qubits 300 --profile
+"""
+
+import argparse
+import cProfile
+import pstats
+import time
+import warnings
+from typing import Dict
+
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.builder.superconducting.build_quam import (
+    add_ports,
+    add_pulses,
+    add_transmons,
+    resolve_wiring_references,
+)
+
+QUBITS_PER_FEM = 8
+
+
+def synthetic_wiring(num_qubits: int) -> Dict[str, dict]:
+    """The wiring of ``num_qubits`` flux-tunable transmons on MW-FEMs and LF-FEMs."""
+    qubits = {}
+    for i in range(num_qubits):
+        controller = f"con{i // (2 * QUBITS_PER_FEM) + 1}"
+        fem = (i // QUBITS_PER_FEM) % 2 * 4 + 1
+        port = i % QUBITS_PER_FEM + 1
+        qubits[f"q{i}"] = {
+            "xy": {"opx_output": f"#/ports/mw_outputs/{controller}/{fem}/{port}"},
+            "rr": {
+                "opx_output": f"#/ports/mw_outputs/{controller}/{fem + 1}/1",
+                "opx_input": f"#/ports/mw_inputs/{controller}/{fem + 1}/1",
+            },
+            "z": {"opx_output": f"#/ports/analog_outputs/{controller}/{fem + 2}/{port}"},
+        }
+    return {"qubits": qubits}
+
+
+def build(num_qubits: int) -> FluxTunableQuam:
+    machine = FluxTunableQuam(ports=FEMPortsContainer())
+    machine.wiring = synthetic_wiring(num_qubits)
+    add_ports(machine, wiring_references=resolve_wiring_references(machine))
+    add_transmons(machine)
+    add_pulses(machine)
+    return machine
+
+
+def run(num_qubits: int, profile: bool = False) -> None:
+    start = time.perf_counter()
+    build(num_qubits)
+    build_time = time.perf_counter() - start
+    print(
+        f"{num_qubits} qubits: build {build_time:.2f} s "
+        f"({build_time / num_qubits * 1e3:.1f} ms/qubit)"
+    )
+
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(build, num_qubits)
+        pstats.Stats(profiler).sort_stats("cumtime").print_stats(25)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--num-qubits", type=int, nargs="+", default=[10, 100, 300, 1000])
+    parser.add_argument("--profile", action="store_true", help="Profile the build")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    for num_qubits in args.num_qubits:
+        run(num_qubits, profile=args.profile)
+
+
+if __name__ == "__main__":
+    main()
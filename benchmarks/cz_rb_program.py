@@ -0,0 +1,123 @@
+"""Benchmark the generation of a randomized benchmarking QUA program with CZ gates.
+
+Builds a flux-tunable machine with four transmons and a CZ gate on the pair q0-q1, with
+phase corrections and a spectator qubit, and generates QUA programs of random CZ,
+``sx`` and ``sy`` gates. Reports the time to build the full program, the time per CZ
+gate, and the time of ``CZGate.inferred_duration``:
+
+    $ python benchmarks/cz_rb_program.py --num-gates 1000 10000
+    $ python benchmarks/cz_rb_program.py --num-gates 1000 --profile
+"""
+
+import argparse
+import cProfile
+import pstats
+import random
+import time
+import warnings
+from typing import List
+
+from qm.qua import program
+from quam.components.ports import FEMPortsContainer
+from quam.components.pulses import SquarePulse
+
+from quam_builder.architecture.superconducting.custom_gates.flux_tunable_transmon_pair.two_qubit_gates import (
+    CZGate,
+)
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.architecture.superconducting.qubit_pair import FluxTunableTransmonPair
+from quam_builder.builder.superconducting.add_default_macros import add_default_transmon_macros
+from quam_builder.builder.superconducting.add_default_pulses import add_DragCosine_pulses
+from quam_builder.builder.superconducting.modify_quam import add_qubits
+
+from build_quam_scaling import synthetic_wiring
+
+
+def build_machine() -> FluxTunableQuam:
+    """Four flux-tunable transmons, with a CZ gate on q0-q1 and q2 as spectator."""
+    machine = FluxTunableQuam(ports=FEMPortsContainer())
+    wiring = synthetic_wiring(4)["qubits"]
+    add_qubits(machine, list(wiring), list(wiring.values()))
+    for qubit in machine.qubits.values():
+        add_DragCosine_pulses(qubit, 0.1, 40, alpha=0.0, detuning=0, anharmonicity=-200e6)
+        add_default_transmon_macros(qubit)
+
+    pair = FluxTunableTransmonPair(
+        id="q0-q1", qubit_control="#/qubits/q0", qubit_target="#/qubits/q1"
+    )
+    machine.qubit_pairs[pair.id] = pair
+    machine.qubits["q2"].z.operations["cz_spectator"] = SquarePulse(length=48, amplitude=0.04)
+    pair.macros["cz"] = CZGate(
+        flux_pulse_qubit="const",
+        phase_shift_control=0.1,
+        phase_shift_target=0.2,
+        spectator_qubits={"q2": "#/qubits/q2"},
+        spectator_qubits_control={"q2": "#/qubits/q2/z/operations/cz_spectator"},
+        spectator_qubits_phase_shift={"q2": 0.01},
+    )
+    return machine
+
+
+def random_gates(num_gates: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(["cz", "sx", "sy"]) for _ in range(num_gates)]
+
+
+def build_program(machine: FluxTunableQuam, gates: List[str]):
+    pair = machine.qubit_pairs["q0-q1"]
+    q0, q1 = machine.qubits["q0"], machine.qubits["q1"]
+    with program() as prog:
+        for gate in gates:
+            if gate == "cz":
+                pair.apply("cz")
+            elif gate == "sx":
+                q0.apply("sx")
+            else:
+                q1.apply("sy")
+    return prog
+
+
+def run(num_gates: int, profile: bool = False) -> None:
+    machine = build_machine()
+    gates = random_gates(num_gates)
+    num_cz = gates.count("cz")
+
+    start = time.perf_counter()
+    build_program(machine, gates)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    build_program(machine, ["cz"] * num_cz)
+    cz_time = time.perf_counter() - start
+
+    cz = machine.qubit_pairs["q0-q1"].macros["cz"]
+    start = time.perf_counter()
+    for _ in range(1000):
+        cz.inferred_duration  # pylint: disable=pointless-statement
+    duration_time = time.perf_counter() - start
+
+    print(
+        f"{num_gates} gates ({num_cz} CZ): build {build_time:.2f} s; "
+        f"CZ only {cz_time:.2f} s ({cz_time / num_cz * 1e6:.0f} us/CZ); "
+        f"inferred_duration {duration_time:.3f} ms/call"
+    )
+
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(build_program, machine, gates)
+        pstats.Stats(profiler).sort_stats("cumtime").print_stats(25)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--num-gates", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--profile", action="store_true", help="Profile the program build")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    for num_gates in args.num_gates:
+        run(num_gates, profile=args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark the batched synthesis of DRAG waveforms against per-pulse calls.
+
+Builds a flux-tunable machine with the DragGaussian and DragCosine pulses of
+``add_DragGaussian_pulses`` and ``add_DragCosine_pulses`` on every qubit, each qubit
+with its own amplitude. Times computing all DRAG waveforms with one
+``waveform_function`` call per pulse and with ``prefill_waveform_cache``, which groups
+the pulses by class and length. Both resolve the references of the pulse parameters,
+so the synthesis from resolved parameters is also timed separately, per pulse and
+batched. Optionally times ``generate_config`` with and without the prefilled cache:
+
+    $ python benchmarks/drag_batch_synthesis.py --num-qubits 10 50 200
+    $ python benchmarks/drag_batch_synthesis.py --num-qubits 50 --config
+"""
+
+import argparse
+import time
+import warnings
+from types import SimpleNamespace
+from typing import List
+
+from quam.components.pulses import Pulse
+
+from quam_builder.architecture.superconducting.components.pulses import (
+    DragCosinePulse,
+    DragGaussianPulse,
+)
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.builder.superconducting.add_default_pulses import (
+    add_DragCosine_pulses,
+    add_DragGaussian_pulses,
+)
+from quam_builder.tools.waveform_cache import (
+    disable_waveform_cache,
+    enable_waveform_cache,
+    prefill_waveform_cache,
+)
+
+from build_quam_scaling import build
+
+
+def build_machine(num_qubits: int) -> FluxTunableQuam:
+    machine = build(num_qubits)
+    for i, qubit in enumerate(machine.qubits.values()):
+        amplitude = 0.1 + 0.1 * i / num_qubits
+        qubit.anharmonicity = -200e6
+        add_DragGaussian_pulses(qubit, amplitude, 40, sigma=8, alpha=0.5, detuning=0.0)
+        add_DragCosine_pulses(qubit, amplitude, 40, alpha=0.5, detuning=0.0)
+    return machine
+
+
+def drag_pulses(machine: FluxTunableQuam) -> List[Pulse]:
+    return [
+        component
+        for component in machine.iterate_components()
+        if isinstance(component, (DragGaussianPulse, DragCosinePulse))
+    ]
+
+
+def resolved(pulse: Pulse) -> SimpleNamespace:
+    """The parameters of a DRAG pulse, with their references resolved."""
+    names = ["length", "amplitude", "alpha", "anharmonicity", "detuning", "axis_angle"]
+    if isinstance(pulse, DragGaussianPulse):
+        names += ["sigma", "subtracted"]
+    return SimpleNamespace(**{name: getattr(pulse, name) for name in names})
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def run(num_qubits: int, config: bool = False) -> None:
+    machine = build_machine(num_qubits)
+    pulses = drag_pulses(machine)
+
+    disable_waveform_cache()
+    per_pulse_time = timed(lambda: [pulse.waveform_function() for pulse in pulses])
+    enable_waveform_cache()
+    batch_time = timed(prefill_waveform_cache, pulses)
+    disable_waveform_cache()
+    print(
+        f"{num_qubits} qubits, {len(pulses)} DRAG pulses: "
+        f"waveform_function per pulse {per_pulse_time * 1e3:.1f} ms, "
+        f"prefill_waveform_cache {batch_time * 1e3:.1f} ms"
+    )
+
+    groups = {}
+    for pulse in pulses:
+        groups.setdefault(type(pulse), []).append(resolved(pulse))
+    synthesis_time = timed(
+        lambda: [
+            cls.batch_waveform_function([parameters])
+            for cls, group in groups.items()
+            for parameters in group
+        ]
+    )
+    batch_synthesis_time = timed(
+        lambda: [cls.batch_waveform_function(group) for cls, group in groups.items()]
+    )
+    print(
+        f"  synthesis from resolved parameters: per pulse {synthesis_time * 1e3:.1f} ms, "
+        f"batched {batch_synthesis_time * 1e3:.1f} ms"
+    )
+
+    if config:
+        disable_waveform_cache()
+        config_time = timed(machine.generate_config)
+        enable_waveform_cache()
+        prefilled_time = timed(
+            lambda: (
+                prefill_waveform_cache(machine.iterate_components()),
+                machine.generate_config(),
+            )
+        )
+        disable_waveform_cache()
+        print(
+            f"  generate_config {config_time:.2f} s, "
+            f"with prefilled waveform cache {prefilled_time:.2f} s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--num-qubits", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--config", action="store_true", help="Also time generate_config")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    for num_qubits in args.num_qubits:
+        run(num_qubits, config=args.config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the direct and FFT Gaussian filtering of flux pulse envelopes.
+
+Filters square envelopes of several lengths with the Gaussian filter of several
+``gaussian_filter_frequency_mhz`` values at 1 GS/s. For each, times the direct
+``scipy.ndimage.gaussian_filter1d``, the FFT convolution of ``gaussian_filter_envelope``,
+and the path that ``gaussian_filter_envelope`` picks, and reports the largest difference
+between the two results relative to the envelope peak:
+
+    $ python benchmarks/gaussian_filter_crossover.py
+    $ python benchmarks/gaussian_filter_crossover.py --lengths 10000 --frequencies-mhz 1 2 5
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+
+from quam_builder.common import pulses
+from quam_builder.common.pulses import gaussian_filter_envelope
+
+SAMPLE_RATE = 1e9
+
+
+def fft_filter(envelope: np.ndarray, sigma: float) -> np.ndarray:
+    """``gaussian_filter_envelope`` with the FFT convolution for any kernel size."""
+    thresholds = pulses.FFT_FILTER_MIN_KERNEL_SAMPLES, pulses.FFT_FILTER_MIN_WORK
+    pulses.FFT_FILTER_MIN_KERNEL_SAMPLES = pulses.FFT_FILTER_MIN_WORK = 0
+    try:
+        return gaussian_filter_envelope(envelope, sigma)
+    finally:
+        pulses.FFT_FILTER_MIN_KERNEL_SAMPLES, pulses.FFT_FILTER_MIN_WORK = thresholds
+
+
+def time_ms(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e3
+
+
+def run(length: int, frequency_mhz: float, number: int) -> None:
+    # A plateau of half the length, as for GaussianFilteredSquarePulse with zero padding
+    envelope = np.zeros(length)
+    envelope[length // 4 : 3 * length // 4] = 0.2
+    sigma = SAMPLE_RATE / (2.0 * np.pi * frequency_mhz * 1e6)
+
+    direct_time = time_ms(lambda: gaussian_filter1d(envelope, sigma=sigma), number)
+    fft_time = time_ms(lambda: fft_filter(envelope, sigma), number)
+    auto_time = time_ms(lambda: gaussian_filter_envelope(envelope, sigma), number)
+    error = np.max(np.abs(fft_filter(envelope, sigma) - gaussian_filter1d(envelope, sigma=sigma)))
+    print(
+        f"{length:>7} samples, {frequency_mhz:>5g} MHz (sigma {sigma:6.1f}): "
+        f"direct {direct_time:7.3f} ms, FFT {fft_time:7.3f} ms, "
+        f"gaussian_filter_envelope {auto_time:7.3f} ms; "
+        f"relative error {error / np.max(envelope):.1e}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--frequencies-mhz", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--number", type=int, default=10, help="Calls per timing")
+    args = parser.parse_args()
+
+    for length in args.lengths:
+        for frequency_mhz in args.frequencies_mhz:
+            run(length, frequency_mhz, args.number)
+
+
+if __name__ == "__main__":
+    main()
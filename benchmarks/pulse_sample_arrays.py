@@ -0,0 +1,95 @@
+"""Benchmark the time and memory of pulse waveforms as NumPy arrays versus Python lists.
+
+For a waveform of ``--num-samples`` samples, compares the NumPy array returned by
+``waveform_function`` with the Python list that ``SNZPulse`` used to return, and the
+``DragGaussianPulse`` samples with the list-based ``drag_gaussian_pulse_waveforms`` of
+``qualang_tools``. Memory is the size of the samples, including the float objects of a
+list:
+
+    $ python benchmarks/pulse_sample_arrays.py
+    $ python benchmarks/pulse_sample_arrays.py --num-samples 1000 10000 100000
+"""
+
+import argparse
+import sys
+import timeit
+import warnings
+
+import numpy as np
+from qualang_tools.config.waveform_tools import drag_gaussian_pulse_waveforms
+
+from quam_builder.architecture.superconducting.components.pulses import (
+    DragGaussianPulse,
+    SNZPulse,
+)
+
+
+def list_size(samples: list) -> int:
+    """The size in bytes of a list and of its float objects."""
+    return sys.getsizeof(samples) + sum(sys.getsizeof(sample) for sample in samples)
+
+
+def drag_gaussian_lists(pulse: DragGaussianPulse):
+    """The DRAG samples as computed before, as lists from ``qualang_tools``."""
+    I, Q = drag_gaussian_pulse_waveforms(
+        amplitude=pulse.amplitude,
+        length=pulse.length,
+        sigma=pulse.sigma,
+        alpha=pulse.alpha,
+        anharmonicity=pulse.anharmonicity,
+        detuning=pulse.detuning,
+        subtracted=pulse.subtracted,
+    )
+    I, Q = np.array(I), np.array(Q)
+    I_rot = I * np.cos(pulse.axis_angle) - Q * np.sin(pulse.axis_angle)
+    Q_rot = I * np.sin(pulse.axis_angle) + Q * np.cos(pulse.axis_angle)
+    return I_rot + 1.0j * Q_rot
+
+
+def time_us(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def run(num_samples: int, number: int) -> None:
+    snz = SNZPulse(amplitude=0.2, flat_length=num_samples - 4, t_phi_eff=1.5)
+    samples = snz.waveform_function()
+    array_time = time_us(snz.waveform_function, number)
+    list_time = time_us(lambda: snz.waveform_function().tolist(), number)
+    print(
+        f"SNZPulse, {len(samples)} samples: "
+        f"array {samples.nbytes / 1e3:.0f} kB, {array_time:.0f} us; "
+        f"list {list_size(samples.tolist()) / 1e3:.0f} kB, {list_time:.0f} us"
+    )
+
+    drag = DragGaussianPulse(
+        length=num_samples,
+        axis_angle=0.0,
+        amplitude=0.1,
+        sigma=num_samples / 5,
+        alpha=0.5,
+        anharmonicity=-200e6,
+    )
+    samples = drag.waveform_function()
+    assert np.allclose(samples, drag_gaussian_lists(drag))
+    array_time = time_us(drag.waveform_function, number)
+    list_time = time_us(lambda: drag_gaussian_lists(drag), number)
+    print(
+        f"DragGaussianPulse, {len(samples)} samples: "
+        f"array {samples.nbytes / 1e3:.0f} kB, {array_time:.0f} us; "
+        f"via lists {list_time:.0f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--num-samples", type=int, nargs="+", default=[10000])
+    parser.add_argument("--number", type=int, default=20, help="Calls per timing")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    for num_samples in args.num_samples:
+        run(num_samples, args.number)
+
+
+if __name__ == "__main__":
+    main()
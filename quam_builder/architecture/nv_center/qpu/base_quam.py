@@ -1,5 +1,6 @@
 from dataclasses import field
-from typing import List, Dict, ClassVar, Optional, Union
+from pathlib import Path
+from typing import List, Dict, ClassVar, Optional, Sequence, Union
 
 from qm import QuantumMachinesManager, QuantumMachine
 from qm.octave import QmOctaveConfig
@@ -14,6 +15,8 @@ from quam.serialisation import JSONSerialiser
 
 from quam_builder.architecture.nv_center.qubit_pair import NVCenterPair
 from quam_builder.architecture.nv_center.qubit import NVCenter
+from quam_builder.tools.pulse_templates import read_expanded_state, save_with_pulse_templates
+from quam_builder.tools.qmm_pool import get_qmm_pool
 
 from qualang_tools.results.data_handler import DataHandler
 
@@ -36,11 +39,16 @@ class BaseQuamNV(QuamRoot):
         ports (Union[FEMPortsContainer, OPXPlusPortsContainer]): The ports container.
         _data_handler (ClassVar[DataHandler]): The data handler.
         qmm (ClassVar[Optional[QuantumMachinesManager]]): The Quantum Machines Manager.
+        use_pulse_templates (bool): Whether to save repeated pulse definitions once, as
+            templates in the state file. See `quam_builder.tools.pulse_templates`.
 
     Methods:
         get_serialiser: Get the serialiser for the QuamRoot class, which is the JSONSerialiser.
+        save: Save the machine, with pulse templates if `use_pulse_templates` is set.
+        load: Load the machine, expanding pulse templates.
         get_octave_config: Return the Octave configuration.
         connect: Open a Quantum Machine Manager with the credentials ("host" and "cluster_name") as defined in the network file.
+        open_qm: Open a quantum machine, reusing or updating an open one where possible.
         calibrate_octave_ports: Calibrate the Octave ports for all the active qubits.
         active_qubits: Return the list of active qubits.
         active_qubit_pairs: Return the list of active qubit pairs.
@@ -63,6 +71,8 @@ class BaseQuamNV(QuamRoot):
 
     qmm: ClassVar[Optional[QuantumMachinesManager]] = None
 
+    use_pulse_templates: bool = False
+
     @classmethod
     def get_serialiser(cls) -> JSONSerialiser:
         """Get the serialiser for the QuamRoot class, which is the JSONSerialiser.
@@ -71,6 +81,36 @@ class BaseQuamNV(QuamRoot):
         """
         return JSONSerialiser(content_mapping={"wiring": "wiring.json", "network": "wiring.json"})
 
+    def save(
+        self,
+        path: Optional[Union[Path, str]] = None,
+        content_mapping: Optional[Dict[str, str]] = None,
+        include_defaults: Optional[bool] = None,
+        ignore: Optional[Sequence[str]] = None,
+    ):
+        """Save the machine, see `QuamRoot.save`.
+
+        If ``use_pulse_templates`` is set, repeated pulse definitions are saved once, as
+        templates, see `quam_builder.tools.pulse_templates`.
+        """
+        if not self.use_pulse_templates:
+            return super().save(path, content_mapping, include_defaults, ignore)
+        return save_with_pulse_templates(self, path, content_mapping, include_defaults, ignore)
+
+    @classmethod
+    def load(
+        cls,
+        filepath_or_dict: Optional[Union[str, Path, dict]] = None,
+        validate_type: bool = True,
+        fix_attrs: bool = True,
+    ):
+        """Load the machine, see `QuamRoot.load`. Pulse templates in the state are expanded."""
+        return super().load(
+            filepath_or_dict=read_expanded_state(cls, filepath_or_dict),
+            validate_type=validate_type,
+            fix_attrs=fix_attrs,
+        )
+
     def get_octave_config(self) -> QmOctaveConfig:
         """Return the Octave configuration."""
         octave_config = None
@@ -79,9 +119,14 @@ class BaseQuamNV(QuamRoot):
                 octave_config = octave.get_octave_config()
         return octave_config
 
-    def connect(self) -> QuantumMachinesManager:
+    def connect(self, reuse: bool = True) -> QuantumMachinesManager:
         """Open a Quantum Machine Manager with the credentials ("host" and "cluster_name") as defined in the network file.
 
+        Args:
+            reuse (bool): If True, an open connection with the same settings is taken from the
+                process-wide pool of `quam_builder.tools.qmm_pool`, if it still responds.
+                Default is True.
+
         Returns:
             QuantumMachinesManager: The opened Quantum Machine Manager.
         """
@@ -92,9 +137,37 @@ class BaseQuamNV(QuamRoot):
         )
         if "port" in self.network:
             settings["port"] = self.network["port"]
-        self.qmm = QuantumMachinesManager(**settings)
+        if reuse:
+            self.qmm = get_qmm_pool().connect(QuantumMachinesManager, settings)
+        else:
+            self.qmm = QuantumMachinesManager(**settings)
         return self.qmm
 
+    def open_qm(
+        self, config: Optional[dict] = None, runtime_updates: bool = True, **kwargs
+    ) -> QuantumMachine:
+        """Open a quantum machine, reusing an open one if its config is unchanged.
+
+        Connects first if needed, see `connect`. If only intermediate frequencies, mixer
+        corrections or overridable waveforms changed, the open quantum machine is updated
+        instead, see `quam_builder.tools.qmm_pool.QmmPool.open_qm`.
+
+        Args:
+            config (Optional[dict]): The QUA config. Defaults to `generate_config()`.
+            runtime_updates (bool): Whether to update an open quantum machine whose config
+                differs only in runtime-updatable values, instead of opening a new one.
+                Default is True.
+            **kwargs: Additional keyword arguments of `QuantumMachinesManager.open_qm`.
+
+        Returns:
+            QuantumMachine: The open quantum machine.
+        """
+        if self.qmm is None:
+            self.connect()
+        if config is None:
+            config = self.generate_config()
+        return get_qmm_pool().open_qm(self.qmm, config, runtime_updates=runtime_updates, **kwargs)
+
     def calibrate_octave_ports(self, QM: QuantumMachine) -> None:
         """Calibrate the Octave ports for all the active qubits.
 
@@ -10,7 +10,7 @@ Workflow:
 
 5. Create your QUA programme
     - For simultaneous stepping/ramping, use either
-        sequence = machine.voltage_sequences[gate_set_id]
+        sequence = machine.get_voltage_sequence(gate_set_id)
         sequence.step_to_voltages({"Q1": ..., "Q2": ...})
     or use sequence.simultaneous:
         with sequence.simultaneous(duration = ...):
@@ -165,7 +165,7 @@ machine.qubit_pairs["Q3_Q4"].add_point(
 # # Example QUA programme:
 # with program() as prog:
 #     i = declare(int)
-#     seq = machine.voltage_sequences["main_qpu"]
+#     seq = machine.get_voltage_sequence("main_qpu")
 #     with for_(i, 0, i<100, i+1):
 
 #         # Option 1 for simultaneous stepping
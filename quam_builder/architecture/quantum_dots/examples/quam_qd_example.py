@@ -18,7 +18,7 @@ Workflow:
 
 5. Create your QUA programme
     - For simultaneous stepping/ramping, use either
-        sequence = machine.voltage_sequences[gate_set_id]
+        sequence = machine.get_voltage_sequence(gate_set_id)
         sequence.step_to_voltages({"virtual_dot_1": ..., "virtual_dot_2": ...})
     or use sequence.simultaneous:
         with sequence.simultaneous(duration = ...):
@@ -294,7 +294,7 @@ machine.quantum_dot_pairs["dot3_dot4_pair"].add_point(
 # # Example QUA programme:
 # with program() as prog:
 #     i = declare(int)
-#     seq = machine.voltage_sequences["main_qpu"]
+#     seq = machine.get_voltage_sequence("main_qpu")
 #     with for_(i, 0, i<100, i+1):
 
 #         # Option 1 for simultaneous stepping
@@ -22,7 +22,7 @@ Workflow:
 
 6. Create your QUA programme
     - For simultaneous stepping/ramping, use either
-        sequence = machine.voltage_sequences[gate_set_id]
+        sequence = machine.get_voltage_sequence(gate_set_id)
         sequence.step_to_voltages({"qubit1": ..., "qubit2": ...})
     or use sequence.simultaneous:
         with sequence.simultaneous(duration = ...):
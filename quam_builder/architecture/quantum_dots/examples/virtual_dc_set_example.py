@@ -18,7 +18,7 @@ Workflow:
 
 5. Create your QUA programme
     - For simultaneous stepping/ramping, use either
-        sequence = machine.voltage_sequences[gate_set_id]
+        sequence = machine.get_voltage_sequence(gate_set_id)
         sequence.step_to_voltages({"virtual_dot_1": ..., "virtual_dot_2": ...})
     or use sequence.simultaneous:
         with sequence.simultaneous(duration = ...):
@@ -1,11 +1,12 @@
 from pathlib import Path
-from typing import List, Dict, Union, ClassVar, Optional, Literal, Tuple, Callable
+from typing import List, Dict, Union, ClassVar, Optional, Literal, Sequence, Tuple, Callable
 from dataclasses import field
 import numpy as np
 from collections import defaultdict
 from qm import QuantumMachinesManager, QuantumMachine
 from qm.octave import QmOctaveConfig
 from qm.qua.type_hints import QuaVariable, StreamType
+from qm.qua._expressions import QuaArrayVariable
 from qm.qua import declare, fixed, declare_stream
 
 from quam.serialisation import JSONSerialiser
@@ -30,6 +31,8 @@ from quam_builder.architecture.quantum_dots.components import (
 )
 
 from quam_builder.architecture.quantum_dots.components.global_gate import GlobalGate
+from quam_builder.tools.pulse_templates import read_expanded_state, save_with_pulse_templates
+from quam_builder.tools.qmm_pool import get_qmm_pool
 from quam_builder.tools.voltage_sequence import VoltageSequence
 from quam_builder.architecture.quantum_dots.qubit import AnySpinQubit
 
@@ -48,20 +51,25 @@ class BaseQuamQD(QuamRoot):
         sensor_dots (Dict[str, SensorDot]): A dictionary of the registered SensorDot objects.
         barrier_gates (Dict[str, BarrierGate]): A dictionary of the BarrierGate objects.
         virtual_gate_sets (Dict[str, VirtualGateSet]): A dictionary of the VirtualGateSet instances covering your QPU.
-        voltage_sequences (Dict[str, VoltageSequence]): A dictionary of the VoltageSequence object associated to each VirtualGateSet. Uniquely mapped.
+        voltage_sequences (Dict[str, VoltageSequence]): The VoltageSequence objects created so far, by VirtualGateSet id. Sequences are created on first access, use get_voltage_sequence(gate_set_id) rather than indexing this dictionary.
         global_gates (Dict[str, GlobalGate]): Global gate components associated with back gate, reservoirs, or splitter gates.
         wiring (dict): The wiring configuration.
         network (dict): The network configuration.
         ports (Union[FEMPortsContainer, OPXPlusPortsContainer]): The ports container.
         _data_handler (ClassVar[DataHandler]): The data handler.
         qmm (ClassVar[Optional[QuantumMachinesManager]]): The Quantum Machines Manager.
+        use_pulse_templates (bool): Whether to save repeated pulse definitions once, as
+            templates in the state file. See `quam_builder.tools.pulse_templates`.
 
     Methods:
         get_serialiser: Get the serialiser for the QuamRoot class, which is the JSONSerialiser.
+        save: Save the machine, with pulse templates if `use_pulse_templates` is set.
         get_octave_config: Return the Octave configuration.
         connect: Open a Quantum Machine Manager with the credentials ("host" and "cluster_name") as defined in the network file.
+        open_qm: Open a quantum machine, reusing or updating an open one where possible.
         calibrate_octave_ports: Calibrate the Octave ports for all the active qubits.
         declare_qua_variables: Macro to declare the necessary QUA variables for all qubits.
+        declare_qua_array_variables: Macro to declare array-backed QUA variables for all qubits.
         initialize_qpu: Initialize the QPU with the specified settings.
         create_virtual_gate_set: Creates a VirtualGateSet with the input physical channels, and layers a single compensation layer on top, with a default identity matrix.
         register_quantum_dots: Internally create QuantumDot objects from output physical channels.
@@ -98,6 +106,8 @@ class BaseQuamQD(QuamRoot):
 
     qmm: ClassVar[Optional[QuantumMachinesManager]] = None
 
+    use_pulse_templates: bool = False
+
     @classmethod
     def get_serialiser(cls) -> JSONSerialiser:
         """Get the serialiser for the QuamRoot class, which is the JSONSerialiser.
@@ -106,18 +116,46 @@ class BaseQuamQD(QuamRoot):
         """
         return JSONSerialiser(content_mapping={"wiring": "wiring.json", "network": "wiring.json"})
 
+    def save(
+        self,
+        path: Optional[Union[Path, str]] = None,
+        content_mapping: Optional[Dict[str, str]] = None,
+        include_defaults: Optional[bool] = None,
+        ignore: Optional[Sequence[str]] = None,
+    ):
+        """Save the machine, see `QuamRoot.save`.
+
+        If ``use_pulse_templates`` is set, repeated pulse definitions are saved once, as
+        templates, see `quam_builder.tools.pulse_templates`.
+        """
+        if not self.use_pulse_templates:
+            return super().save(path, content_mapping, include_defaults, ignore)
+        return save_with_pulse_templates(self, path, content_mapping, include_defaults, ignore)
+
     def get_voltage_sequence(self, gate_set_id: str) -> VoltageSequence:
+        """
+        Return the VoltageSequence of a VirtualGateSet, creating it on first access.
+
+        Sequences are built lazily, so loading a machine does not create state trackers for
+        gate sets that are never used in a QUA program. A newly created sequence keeps the
+        QuantumDots of the gate set at their stored ``current_voltage``.
+
+        Args:
+            gate_set_id (str): The id of the VirtualGateSet.
+        """
         if gate_set_id not in self.voltage_sequences:
             gate_set = self.virtual_gate_sets[gate_set_id]
-            seq = gate_set.new_sequence()
-
-            for qd_id, qd in self.quantum_dots.items():
-                try:
-                    qd_gate_set_name = self._get_virtual_gate_set(qd.physical_channel).id
-                    if qd_gate_set_name == gate_set.id:
-                        seq.state_trackers[qd.id].current_level = qd.current_voltage
-                except (AttributeError, ValueError, KeyError):
-                    pass
+            seq = gate_set.new_sequence(track_integrated_voltage=True)
+
+            gate_set_channels = {id(ch) for ch in gate_set.channels.values()}
+            valid_names = set(gate_set.valid_channel_names)
+            seq.seed_levels(
+                {
+                    qd.id: qd.current_voltage
+                    for qd in self.quantum_dots.values()
+                    if qd.id in valid_names and id(qd.physical_channel) in gate_set_channels
+                }
+            )
 
             self.voltage_sequences[gate_set_id] = seq
         return self.voltage_sequences[gate_set_id]
@@ -244,10 +282,9 @@ class BaseQuamQD(QuamRoot):
         return virtual_name
 
     def reset_voltage_sequence(self, gate_set_id) -> None:
-        self.voltage_sequences[gate_set_id] = self.virtual_gate_sets[gate_set_id].new_sequence(
-            track_integrated_voltage=True
-        )
-        return
+        """Replace the VoltageSequence of a VirtualGateSet with a new one, see get_voltage_sequence."""
+        self.voltage_sequences.pop(gate_set_id, None)
+        self.get_voltage_sequence(gate_set_id)
 
     def register_global_gates(
         self,
@@ -494,9 +531,8 @@ class BaseQuamQD(QuamRoot):
             target_gates=physical_gate_names,
             matrix=compensation_matrix,
         )
-        self.voltage_sequences[gate_set_id] = self.virtual_gate_sets[gate_set_id].new_sequence(
-            track_integrated_voltage=True
-        )
+        # The VoltageSequence is created on first use by get_voltage_sequence
+        self.voltage_sequences.pop(gate_set_id, None)
 
     def create_virtual_dc_set(
         self,
@@ -667,9 +703,14 @@ class BaseQuamQD(QuamRoot):
         except:
             raise RuntimeError(f"Failed to initialise qubit {qubit_name}")
 
-    def connect(self) -> QuantumMachinesManager:
+    def connect(self, reuse: bool = True) -> QuantumMachinesManager:
         """Open a Quantum Machine Manager with the credentials ("host" and "cluster_name") as defined in the network file.
 
+        Args:
+            reuse (bool): If True, an open connection with the same settings is taken from the
+                process-wide pool of `quam_builder.tools.qmm_pool`, if it still responds.
+                Default is True.
+
         Returns:
             QuantumMachinesManager: The opened Quantum Machine Manager.
         """
@@ -680,9 +721,37 @@ class BaseQuamQD(QuamRoot):
         )
         if "port" in self.network:
             settings["port"] = self.network["port"]
-        self.qmm = QuantumMachinesManager(**settings)
+        if reuse:
+            self.qmm = get_qmm_pool().connect(QuantumMachinesManager, settings)
+        else:
+            self.qmm = QuantumMachinesManager(**settings)
         return self.qmm
 
+    def open_qm(
+        self, config: Optional[dict] = None, runtime_updates: bool = True, **kwargs
+    ) -> QuantumMachine:
+        """Open a quantum machine, reusing an open one if its config is unchanged.
+
+        Connects first if needed, see `connect`. If only intermediate frequencies, mixer
+        corrections or overridable waveforms changed, the open quantum machine is updated
+        instead, see `quam_builder.tools.qmm_pool.QmmPool.open_qm`.
+
+        Args:
+            config (Optional[dict]): The QUA config. Defaults to `generate_config()`.
+            runtime_updates (bool): Whether to update an open quantum machine whose config
+                differs only in runtime-updatable values, instead of opening a new one.
+                Default is True.
+            **kwargs: Additional keyword arguments of `QuantumMachinesManager.open_qm`.
+
+        Returns:
+            QuantumMachine: The open quantum machine.
+        """
+        if self.qmm is None:
+            self.connect()
+        if config is None:
+            config = self.generate_config()
+        return get_qmm_pool().open_qm(self.qmm, config, runtime_updates=runtime_updates, **kwargs)
+
     def get_octave_config(self) -> QmOctaveConfig:
         """Return the Octave configuration."""
         octave_config = None
@@ -722,6 +791,44 @@ class BaseQuamQD(QuamRoot):
         Q_st = [declare_stream() for _ in range(num_IQ_pairs)]
         return I, I_st, Q, Q_st, n, n_st
 
+    def declare_qua_array_variables(
+        self,
+        num_IQ_pairs: Optional[int] = None,
+    ) -> tuple[
+        QuaArrayVariable,
+        StreamType,
+        QuaArrayVariable,
+        StreamType,
+        QuaVariable,
+        StreamType,
+    ]:
+        """Macro to declare array-backed QUA variables for all qubits.
+
+        Array-backed variant of `declare_qua_variables`: I and Q are single `fixed` arrays
+        with one slot per qubit, and each has a single stream. Measure into the slots with
+        ``qua_vars=(I[i], Q[i])``, save them with
+        `quam_builder.tools.qua_tools.save_qua_array`, and recover one value per qubit in
+        the stream processing with ``I_st.buffer(num_IQ_pairs)``.
+
+        Args:
+            num_IQ_pairs (Optional[int]): Size of the I and Q arrays.
+                If None, it defaults to the number of qubits in `self.quantum_dots`.
+
+        Returns:
+            tuple: A tuple containing the I and Q arrays, their streams, and the averaging
+                counter with its stream.
+        """
+        if num_IQ_pairs is None:
+            num_IQ_pairs = len(self.quantum_dots)
+
+        n = declare(int)
+        n_st = declare_stream()
+        I = declare(fixed, size=num_IQ_pairs)
+        Q = declare(fixed, size=num_IQ_pairs)
+        I_st = declare_stream()
+        Q_st = declare_stream()
+        return I, I_st, Q, Q_st, n, n_st
+
     def initialize_qpu(self, **kwargs):
         """Initialize the QPU with the specified settings."""
         pass
@@ -747,20 +854,17 @@ class BaseQuamQD(QuamRoot):
         validate_type: bool = True,
         fix_attrs: bool = True,
     ):
-        """Load machine from file and recreate voltage sequences"""
+        """Load machine from file.
+
+        Pulse templates in the state are expanded, see `quam_builder.tools.pulse_templates`.
+        Voltage sequences are not serialised; they are recreated on first access through
+        get_voltage_sequence, seeded from QuantumDot.current_voltage.
+        """
         instance = super().load(
-            filepath_or_dict=filepath_or_dict,
+            filepath_or_dict=read_expanded_state(cls, filepath_or_dict),
             validate_type=validate_type,
             fix_attrs=fix_attrs,
         )
         instance.voltage_sequences = {}
 
-        # Recreate voltage sequences for each virtual gate set
-        for gate_set_id, vgs in instance.virtual_gate_sets.items():
-            instance.voltage_sequences[gate_set_id] = vgs.new_sequence(
-                track_integrated_voltage=True
-            )
-
-        # We can also update the state_tracker here to hold the value held by QuantumDot.current_voltage.
-
         return instance
@@ -6,6 +6,7 @@ from pathlib import Path
 from qm import QuantumMachinesManager, QuantumMachine
 from qm.octave import QmOctaveConfig
 from qm.qua.type_hints import QuaVariable, StreamType
+from qm.qua._expressions import QuaArrayVariable
 from qm.qua import declare, fixed, declare_stream
 
 from quam.serialisation import JSONSerialiser
@@ -54,6 +55,7 @@ class LossDiVincenzoQuam(BaseQuamQD):
         active_qubits: Return the list of active qubits.
         active_qubit_pairs: Return the list of active qubit pairs.
         declare_qua_variables: Macro to declare the necessary QUA variables for all qubits.
+        declare_qua_array_variables: Macro to declare array-backed QUA variables for all qubits.
         initialize_qpu: Initialize the QPU with the specified settings.
         register_qubit: Creates an internal Qubit object out of the specified QuantumDot. Specify the qubit type in the input, default "loss_divincenzo"
         register_qubit_pair: Creates a QubitPair object internally, given a control qubit and a target qubit.
@@ -74,7 +76,7 @@ class LossDiVincenzoQuam(BaseQuamQD):
         validate_type: bool = True,
         fix_attrs: bool = True,
     ):
-        """Load machine from file and recreate voltage sequences"""
+        """Load machine from file. Voltage sequences are created lazily, see get_voltage_sequence"""
         instance = super().load(
             filepath_or_dict=filepath_or_dict,
             validate_type=validate_type,
@@ -229,6 +231,33 @@ class LossDiVincenzoQuam(BaseQuamQD):
         Q_st = [declare_stream() for _ in range(num_IQ_pairs)]
         return I, I_st, Q, Q_st, n, n_st
 
+    def declare_qua_array_variables(
+        self,
+        num_IQ_pairs: Optional[int] = None,
+    ) -> tuple[
+        QuaArrayVariable,
+        StreamType,
+        QuaArrayVariable,
+        StreamType,
+        QuaVariable,
+        StreamType,
+    ]:
+        """Macro to declare array-backed QUA variables for all qubits.
+
+        See `BaseQuamQD.declare_qua_array_variables`.
+
+        Args:
+            num_IQ_pairs (Optional[int]): Size of the I and Q arrays.
+                If None, it defaults to the number of qubits in `self.qubits`.
+
+        Returns:
+            tuple: A tuple containing the I and Q arrays, their streams, and the averaging
+                counter with its stream.
+        """
+        if num_IQ_pairs is None:
+            num_IQ_pairs = len(self.qubits)
+        return super().declare_qua_array_variables(num_IQ_pairs)
+
     def initialize_qpu(self, **kwargs):
         """Initialize the QPU with the specified settings."""
         pass
@@ -1,10 +1,15 @@
 import math
 import warnings
+from typing import List, Optional, Sequence
+
 import numpy as np
 
 from quam.core import quam_dataclass
 from quam.components.pulses import Pulse
 
+from quam_builder.common.pulses import FlatTopPulse, gaussian_filter_envelope
+from quam_builder.tools.waveform_cache import cached_waveform
+
 __all__ = [
     "DragGaussianPulse",
     "DragCosinePulse",
@@ -18,6 +23,60 @@ __all__ = [
 ]
 
 
+def _pulse_parameters(pulses: Sequence[Pulse], *names: str) -> List[np.ndarray]:
+    """Return each named parameter of the pulses as a column vector."""
+    return [
+        np.array([getattr(pulse, name) for pulse in pulses], dtype=float)[:, None] for name in names
+    ]
+
+
+def _drag_batch(
+    envelope: np.ndarray,
+    derivative: np.ndarray,
+    t: np.ndarray,
+    alpha: np.ndarray,
+    anharmonicity: np.ndarray,
+    detuning: np.ndarray,
+    axis_angle: np.ndarray,
+) -> List[Optional[np.ndarray]]:
+    """Combine DRAG envelopes into rotated complex waveforms, one row per pulse.
+
+    Implements the DRAG correction and detuning of
+    ``qualang_tools.config.waveform_tools.drag_*_pulse_waveforms`` followed by the
+    ``axis_angle`` rotation, with the pulse parameters given as column vectors. Rows
+    with invalid parameters are returned as None.
+    """
+    has_drag = anharmonicity != detuning
+    valid = ~((alpha != 0) & ((anharmonicity == 0) | ~has_drag)) & ~np.isnan(axis_angle)
+
+    z = envelope + 1j * 0
+    drag_coefficient = np.divide(
+        alpha,
+        2 * np.pi * anharmonicity - 2 * np.pi * detuning,
+        out=np.zeros_like(alpha),
+        where=has_drag,
+    )
+    z += 1j * derivative * drag_coefficient
+    z *= np.exp(1j * 2 * np.pi * detuning * t * 1e-9)
+
+    I, Q = z.real, z.imag
+    I_rot = I * np.cos(axis_angle) - Q * np.sin(axis_angle)
+    Q_rot = I * np.sin(axis_angle) + Q * np.cos(axis_angle)
+    waveforms = I_rot + 1.0j * Q_rot
+    return [waveform if ok else None for waveform, ok in zip(waveforms, valid[:, 0])]
+
+
+def _raise_invalid_drag_parameters(pulse: Pulse) -> None:
+    if pulse.axis_angle is None:
+        raise ValueError(f"{type(pulse).__name__}.axis_angle must be set")
+    if pulse.anharmonicity == 0:
+        raise ValueError("Cannot create a DRAG pulse with `anharmonicity=0`")
+    raise ValueError(
+        "The complex envelope for the DRAG waveform cannot be created if "
+        "anharmonicity = detuning and alpha != 0."
+    )
+
+
 @quam_dataclass
 class DragGaussianPulse(Pulse):
     """Gaussian-based DRAG pulse that compensate for the leakage and AC stark shift.
@@ -57,24 +116,47 @@ class DragGaussianPulse(Pulse):
     def __post_init__(self) -> None:
         return super().__post_init__()
 
+    @cached_waveform
     def waveform_function(self):
-        from qualang_tools.config.waveform_tools import drag_gaussian_pulse_waveforms
-
-        I, Q = drag_gaussian_pulse_waveforms(
-            amplitude=self.amplitude,
-            length=self.length,
-            sigma=self.sigma,
-            alpha=self.alpha,
-            anharmonicity=self.anharmonicity,
-            detuning=self.detuning,
-            subtracted=self.subtracted,
+        waveform = self.batch_waveform_function([self])[0]
+        if waveform is None:
+            _raise_invalid_drag_parameters(self)
+        return waveform
+
+    @classmethod
+    def batch_waveform_function(
+        cls, pulses: Sequence["DragGaussianPulse"]
+    ) -> List[Optional[np.ndarray]]:
+        """Compute the waveforms of several pulses of equal length as one array operation.
+
+        Args:
+            pulses: The pulses, all with the same ``length``, or objects holding their
+                resolved parameters as attributes.
+
+        Returns:
+            List[Optional[np.ndarray]]: The waveform of each pulse, or None for pulses
+            whose parameters are invalid.
+        """
+        length = pulses[0].length
+        amplitude, sigma, alpha, anharmonicity, detuning, subtracted, axis_angle = (
+            _pulse_parameters(
+                pulses,
+                "amplitude",
+                "sigma",
+                "alpha",
+                "anharmonicity",
+                "detuning",
+                "subtracted",
+                "axis_angle",
+            )
         )
-        I, Q = np.array(I), np.array(Q)
-
-        I_rot = I * np.cos(self.axis_angle) - Q * np.sin(self.axis_angle)
-        Q_rot = I * np.sin(self.axis_angle) + Q * np.cos(self.axis_angle)
-
-        return I_rot + 1.0j * Q_rot
+        t = np.arange(length, step=1.0)
+        center = (length - 1.0) / 2
+        gaussian = np.exp(-((t - center) ** 2) / (2 * sigma**2))
+        envelope = amplitude * gaussian
+        derivative = amplitude * (-2 * 1e9 * (t - center) / (2 * sigma**2)) * gaussian
+        envelope = np.where(subtracted != 0, envelope - envelope[:, -1:], envelope)
+        return _drag_batch(envelope, derivative, t, alpha, anharmonicity, detuning, axis_angle)
 
 
 @quam_dataclass
@@ -119,26 +201,42 @@ class DragCosinePulse(Pulse):
     def __post_init__(self) -> None:
         return super().__post_init__()
 
+    @cached_waveform
     def waveform_function(self):
-        from qualang_tools.config.waveform_tools import drag_cosine_pulse_waveforms
-
-        I, Q = drag_cosine_pulse_waveforms(
-            amplitude=self.amplitude,
-            length=self.length,
-            alpha=self.alpha,
-            anharmonicity=self.anharmonicity,
-            detuning=self.detuning,
+        waveform = self.batch_waveform_function([self])[0]
+        if waveform is None:
+            _raise_invalid_drag_parameters(self)
+        return waveform
+
+    @classmethod
+    def batch_waveform_function(
+        cls, pulses: Sequence["DragCosinePulse"]
+    ) -> List[Optional[np.ndarray]]:
+        """Compute the waveforms of several pulses of equal length as one array operation.
+
+        Args:
+            pulses: The pulses, all with the same ``length``, or objects holding their
+                resolved parameters as attributes.
+
+        Returns:
+            List[Optional[np.ndarray]]: The waveform of each pulse, or None for pulses
+            whose parameters are invalid.
+        """
+        length = pulses[0].length
+        amplitude, alpha, anharmonicity, detuning, axis_angle = _pulse_parameters(
+            pulses, "amplitude", "alpha", "anharmonicity", "detuning", "axis_angle"
         )
-        I, Q = np.array(I), np.array(Q)
-
-        I_rot = I * np.cos(self.axis_angle) - Q * np.sin(self.axis_angle)
-        Q_rot = I * np.sin(self.axis_angle) + Q * np.cos(self.axis_angle)
-
-        return I_rot + 1.0j * Q_rot
+        t = np.arange(length, step=1.0)
+        end_point = length - 1.0
+        envelope = 0.5 * amplitude * (1 - np.cos(t * 2 * np.pi / end_point))
+        derivative = (
+            0.5 * amplitude * (2 * np.pi / end_point * 1e9) * np.sin(t * 2 * np.pi / end_point)
+        )
+        return _drag_batch(envelope, derivative, t, alpha, anharmonicity, detuning, axis_angle)
 
 
 @quam_dataclass
-class FlatTopBlackmanPulse(Pulse):
+class FlatTopBlackmanPulse(FlatTopPulse):
     """Blackman rise/fall, flat-top pulse.
 
     Args:
@@ -146,32 +244,23 @@ class FlatTopBlackmanPulse(Pulse):
         amplitude (float): Peak amplitude (V).
         flat_length (int): Flat-top length (samples).
         axis_angle (float, optional): IQ axis angle in radians.
+        split_flat_top (bool): Whether to compile the pulse into rise, plateau and
+            fall operations, see ``FlatTopPulse``.
     """
 
     amplitude: float
     axis_angle: float = None
     flat_length: int
 
-    def waveform_function(self):
+    def flat_top_envelope(self, rise_fall_length: int, return_part: str = "all"):
         from qualang_tools.config.waveform_tools import flattop_blackman_waveform
 
-        rise_fall_length = (self.length - self.flat_length) // 2
-        if self.flat_length + 2 * rise_fall_length != self.length:
-            raise ValueError(
-                "FlatTopBlackmanPulse requires (length - flat_length) to be even "
-                f"({self.length=} {self.flat_length=})"
-            )
-
-        wf = flattop_blackman_waveform(
+        return flattop_blackman_waveform(
             amplitude=self.amplitude,
             flat_length=self.flat_length,
             rise_fall_length=rise_fall_length,
-            return_part="all",
+            return_part=return_part,
         )
-        wf = np.array(wf)
-        if self.axis_angle is not None:
-            wf = wf * np.exp(1j * self.axis_angle)
-        return wf
 
 
 @quam_dataclass
@@ -204,7 +293,7 @@ class BlackmanIntegralPulse(Pulse):
 
 
 @quam_dataclass
-class FlatTopTanhPulse(Pulse):
+class FlatTopTanhPulse(FlatTopPulse):
     """tanh rise/fall, flat-top pulse.
 
     Args:
@@ -212,32 +301,23 @@ class FlatTopTanhPulse(Pulse):
         amplitude (float): Peak amplitude (V).
         flat_length (int): Flat-top length (samples). Defaults to 0.
         axis_angle (float, optional): IQ axis angle in radians.
+        split_flat_top (bool): Whether to compile the pulse into rise, plateau and
+            fall operations, see ``FlatTopPulse``.
     """
 
     amplitude: float
     axis_angle: float = None
     flat_length: int = 0
 
-    def waveform_function(self):
+    def flat_top_envelope(self, rise_fall_length: int, return_part: str = "all"):
         from qualang_tools.config.waveform_tools import flattop_tanh_waveform
 
-        rise_fall_length = (self.length - self.flat_length) // 2
-        if self.flat_length + 2 * rise_fall_length != self.length:
-            raise ValueError(
-                "FlatTopTanhPulse requires (length - flat_length) to be even "
-                f"({self.length=} {self.flat_length=})"
-            )
-
-        wf = flattop_tanh_waveform(
+        return flattop_tanh_waveform(
             amplitude=self.amplitude,
             flat_length=self.flat_length,
             rise_fall_length=rise_fall_length,
-            return_part="all",
+            return_part=return_part,
         )
-        wf = np.array(wf)
-        if self.axis_angle is not None:
-            wf = wf * np.exp(1j * self.axis_angle)
-        return wf
 
 
 @quam_dataclass
@@ -313,7 +393,7 @@ class CosineBipolarPulse(Pulse):
         if self.axis_angle is not None:
             p = p * np.exp(1j * self.axis_angle)
 
-        return p.tolist()
+        return p
 
 
 @quam_dataclass
@@ -360,6 +440,7 @@ class GaussianFilteredSymmetricBipolarPulse(Pulse):
     def inferred_length(self) -> int:
         return int(np.ceil((self.pulse_length + self.padding_length) / 4) * 4)
 
+    @cached_waveform
     def waveform_function(self):
         if self.pulse_length <= 0:
             raise ValueError("GaussianFilteredSymmetricBipolarPulse.pulse_length must be positive")
@@ -381,8 +462,6 @@ class GaussianFilteredSymmetricBipolarPulse(Pulse):
         if self.amplitude == 0:
             return np.zeros(self.length, dtype=np.float64)
 
-        from scipy.ndimage import gaussian_filter1d
-
         zero_pad_len = self.length - self.pulse_length
         left_pad = zero_pad_len // 2
         right_pad = zero_pad_len - left_pad
@@ -399,7 +478,7 @@ class GaussianFilteredSymmetricBipolarPulse(Pulse):
 
         f_hz = self.gaussian_filter_frequency_mhz * 1e6
         sigma = self.sample_rate / (2.0 * np.pi * f_hz)
-        env = gaussian_filter1d(env, sigma=sigma)
+        env = gaussian_filter_envelope(env, sigma)
 
         peak = float(np.max(np.abs(env)))
         if peak > 0:
@@ -501,4 +580,4 @@ class SNZPulse(Pulse):
         if self.axis_angle is not None:
             p = p * np.exp(1j * self.axis_angle)
 
-        return p.tolist()
+        return p
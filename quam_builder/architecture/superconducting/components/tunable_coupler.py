@@ -2,6 +2,9 @@ from typing import Literal
 
 from quam.core import quam_dataclass
 from quam.components import SingleChannel
+from qm.qua.type_hints import Scalar
+
+from quam_builder.tools.dc_offset_tracker import is_dc_offset_set, record_dc_offset
 
 __all__ = ["TunableCoupler"]
 
@@ -32,18 +35,36 @@ class TunableCoupler(SingleChannel):
         if self.settle_time is not None:
             self.wait(int(self.settle_time) // 4 * 4)
 
-    def to_decouple_idle(self):
+    def set_dc_offset(self, offset: Scalar[float], skip_unchanged: bool = False) -> bool:
+        """Set the DC offset and record it for the current QUA scope.
+
+        Args:
+            offset (Scalar[float]): The DC offset in V.
+            skip_unchanged (bool): If True, the offset is not emitted when it was already set
+                to this value in the current QUA scope, see
+                ``quam_builder.tools.dc_offset_tracker``. Default is False.
+
+        Returns:
+            bool: Whether a ``set_dc_offset`` statement was emitted.
+        """
+        if skip_unchanged and is_dc_offset_set(self.name, offset):
+            return False
+        super().set_dc_offset(offset)
+        record_dc_offset(self.name, offset)
+        return True
+
+    def to_decouple_idle(self, skip_unchanged: bool = False) -> bool:
         """Set the tunable coupler to the decouple offset."""
-        self.set_dc_offset(self.decouple_offset)
+        return self.set_dc_offset(self.decouple_offset, skip_unchanged=skip_unchanged)
 
-    def to_interaction_idle(self):
+    def to_interaction_idle(self, skip_unchanged: bool = False) -> bool:
         """Set the tunable coupler to the interaction offset."""
-        self.set_dc_offset(self.interaction_offset)
+        return self.set_dc_offset(self.interaction_offset, skip_unchanged=skip_unchanged)
 
-    def to_arbitrary_idle(self):
+    def to_arbitrary_idle(self, skip_unchanged: bool = False) -> bool:
         """Set the tunable coupler to the arbitrary offset."""
-        self.set_dc_offset(self.arbitrary_offset)
+        return self.set_dc_offset(self.arbitrary_offset, skip_unchanged=skip_unchanged)
 
-    def to_zero(self):
+    def to_zero(self, skip_unchanged: bool = False) -> bool:
         """Set the tunable coupler to 0V."""
-        self.set_dc_offset(0.0)
+        return self.set_dc_offset(0.0, skip_unchanged=skip_unchanged)
@@ -1,12 +1,12 @@
-from typing import Any, Union
-from dataclasses import field
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+from dataclasses import dataclass, field
 
 import numpy as np
 from qm.qua import align
 
 from quam.components.macro import QubitPairMacro
 from quam.components.pulses import Pulse
-from quam.core import quam_dataclass
+from quam.core import QuamDict, quam_dataclass
 from quam.utils.qua_types import ScalarInt
 
 from quam_builder.architecture.superconducting.custom_gates.flux_tunable_transmon_pair.utils import (
@@ -28,6 +28,48 @@ def get_pulse_name(pulse: Pulse) -> str:
         raise AttributeError(f"Cannot infer id of {pulse} because it is not attached to a parent")
 
 
+def _raw_key(value: Any) -> Hashable:
+    """Identifies an attribute value without following references."""
+    if isinstance(value, (str, int, float, type(None))):
+        return value
+    if isinstance(value, Pulse):
+        return id(value), value.__dict__.get("id")
+    return id(value)
+
+
+def _raw_items_key(mapping: Any) -> Tuple[Tuple[str, Hashable], ...]:
+    items = mapping.__dict__["data"] if isinstance(mapping, QuamDict) else mapping
+    return tuple((name, _raw_key(value)) for name, value in items.items())
+
+
+@dataclass
+class _CZGateStructure:
+    """The qubits, channels and pulse labels of a CZ gate, derived from its attributes."""
+
+    key: Tuple[Hashable, ...]
+    qubit_control: Any
+    qubit_target: Any
+    moving_qubit: Any
+    flux_pulse_qubit: Pulse
+    flux_pulse_qubit_label: str
+    coupler: Any
+    coupler_flux_pulse: Optional[Pulse]
+    coupler_flux_pulse_label: Optional[str]
+    spectator_qubits: Dict[str, Any]
+    # Spectator qubit name -> (qubit, control pulse, control pulse label)
+    spectator_controls: Dict[str, Tuple[Any, Pulse, str]]
+    qubit_channel_names: Tuple[str, ...]
+    channel_names: Tuple[str, ...]
+    # (channel, operation name, pulse) of the pulses that are given by name or reference
+    named_pulses: Tuple[Tuple[Any, str, Pulse], ...] = ()
+
+    def pulses_are_current(self) -> bool:
+        """Whether the operations entries of the pulses given by name were not replaced."""
+        return all(
+            channel.operations.get(name) is pulse for channel, name, pulse in self.named_pulses
+        )
+
+
 @quam_dataclass
 class CZGate(QubitPairMacro):
     """
@@ -163,6 +205,11 @@ class CZGate(QubitPairMacro):
 
     Usage Notes
     -----------
+    - The qubits, channel names and pulse labels used by ``apply`` are derived once and
+      reused until the qubit pair, its qubits or coupler, the moving qubit, the flux pulses
+      or the spectator qubits and pulses of the gate are replaced, including the operations
+      entries of pulses given by name or reference. Call ``invalidate_cache()`` after
+      changes that do not replace any of these, e.g. after replacing a qubit of the machine.
     - Virtual Z rotations are in units of full turns (i.e., value = 0.25 corresponds to π/2).
     - Provide per‑invocation phase_shift_* arguments to dynamically correct accumulated phases
       from calibration drifts or echo structures.
@@ -184,26 +231,115 @@ class CZGate(QubitPairMacro):
     extras: dict[str, Any] = field(default_factory=dict)
     duration_qubit: ScalarInt = None
 
-    @property
-    def flux_pulse_qubit_label(self) -> str:
-        qubit = (
-            self.qubit_control if self.qubit_pair.moving_qubit == "control" else self.qubit_target
+    _structure: Optional[_CZGateStructure] = None
+    _skip_attrs = ["_structure"]
+
+    # apply() ends with an align over all channels of the gate
+    ends_aligned = True
+
+    def _structure_key(self) -> Tuple[Hashable, ...]:
+        """The raw attribute values from which the structure of the gate is derived."""
+        qubit_pair = self.qubit_pair
+        pair_attrs = qubit_pair.__dict__
+        attrs = self.__dict__
+        return (
+            id(qubit_pair),
+            _raw_key(pair_attrs.get("qubit_control")),
+            _raw_key(pair_attrs.get("qubit_target")),
+            _raw_key(pair_attrs.get("moving_qubit")),
+            _raw_key(pair_attrs.get("coupler")),
+            _raw_key(attrs["flux_pulse_qubit"]),
+            _raw_key(attrs["coupler_flux_pulse"]),
+            _raw_items_key(attrs["spectator_qubits"]),
+            _raw_items_key(attrs["spectator_qubits_control"]),
         )
-        pulse = (
-            qubit.get_pulse(self.flux_pulse_qubit)
-            if isinstance(self.flux_pulse_qubit, str)
-            else self.flux_pulse_qubit
+
+    def _get_structure(self) -> _CZGateStructure:
+        """Return the derived structure of the gate, rebuilding it if an input was replaced."""
+        key = self._structure_key()
+        structure = self.__dict__["_structure"]
+        if structure is None or structure.key != key or not structure.pulses_are_current():
+            structure = self._build_structure(key)
+            self.__dict__["_structure"] = structure
+        return structure
+
+    def _build_structure(self, key: Tuple[Hashable, ...]) -> _CZGateStructure:
+        qubit_pair = self.qubit_pair
+        qubit_control, qubit_target = qubit_pair.qubit_control, qubit_pair.qubit_target
+        moving_qubit = qubit_control if qubit_pair.moving_qubit == "control" else qubit_target
+        flux_pulse_qubit = get_pulse(self.flux_pulse_qubit, moving_qubit)
+
+        coupler = getattr(qubit_pair, "coupler", None)
+        coupler_flux_pulse = self.coupler_flux_pulse
+        if isinstance(coupler_flux_pulse, str):
+            coupler_flux_pulse = coupler.operations[coupler_flux_pulse]
+
+        spectator_qubits = dict(self.spectator_qubits.items())
+        spectator_controls = {
+            qubit_name: (spectator_qubits[qubit_name], pulse, get_pulse_name(pulse))
+            for qubit_name, pulse in self.spectator_qubits_control.items()
+            if qubit_name in spectator_qubits
+        }
+
+        all_qubits = [qubit_control, qubit_target]
+        all_qubits += [qubit for qubit, _, _ in spectator_controls.values()]
+        qubit_channel_names = tuple(
+            dict.fromkeys(ch.name for qubit in all_qubits for ch in qubit.channels.values())
+        )
+        channel_names = qubit_channel_names
+        if coupler is not None:
+            channel_names += (coupler.name,)
+
+        raw_pulses = [(self.__dict__["flux_pulse_qubit"], flux_pulse_qubit)]
+        raw_pulses.append((self.__dict__["coupler_flux_pulse"], coupler_flux_pulse))
+        raw_controls = self.__dict__["spectator_qubits_control"]
+        if isinstance(raw_controls, QuamDict):
+            raw_controls = raw_controls.__dict__["data"]
+        raw_pulses += [
+            (raw_controls[qubit_name], pulse)
+            for qubit_name, (_, pulse, _) in spectator_controls.items()
+        ]
+        named_pulses = tuple(
+            (pulse.parent.parent, pulse.parent.get_attr_name(pulse), pulse)
+            for raw, pulse in raw_pulses
+            if isinstance(raw, str)
+        )
+
+        return _CZGateStructure(
+            key=key,
+            qubit_control=qubit_control,
+            qubit_target=qubit_target,
+            moving_qubit=moving_qubit,
+            flux_pulse_qubit=flux_pulse_qubit,
+            flux_pulse_qubit_label=get_pulse_name(flux_pulse_qubit),
+            coupler=coupler,
+            coupler_flux_pulse=coupler_flux_pulse,
+            coupler_flux_pulse_label=(
+                None if coupler_flux_pulse is None else get_pulse_name(coupler_flux_pulse)
+            ),
+            spectator_qubits=spectator_qubits,
+            spectator_controls=spectator_controls,
+            qubit_channel_names=qubit_channel_names,
+            channel_names=channel_names,
+            named_pulses=named_pulses,
         )
-        return get_pulse_name(pulse)
+
+    def invalidate_cache(self) -> None:
+        """Derive the qubits, channel names and pulse labels of the gate again on next use."""
+        self.__dict__["_structure"] = None
+
+    @property
+    def flux_pulse_qubit_label(self) -> str:
+        return self._get_structure().flux_pulse_qubit_label
 
     @property
     def coupler_flux_pulse_label(self) -> str:
-        pulse = (
-            self.coupler.get_pulse(self.coupler_flux_pulse)
-            if isinstance(self.coupler_flux_pulse, str)
-            else self.coupler_flux_pulse
-        )
-        return get_pulse_name(pulse)
+        return self._get_structure().coupler_flux_pulse_label
+
+    @property
+    def scheduled_channels(self) -> list[str]:
+        """The channels aligned by this gate, see ``quam_builder.tools.gate_scheduler``."""
+        return list(self._get_structure().channel_names)
 
     def apply(
         self,
@@ -216,95 +352,57 @@ class CZGate(QubitPairMacro):
         **kwargs,
     ) -> None:
 
-        # Build list of spectator qubits and their pulse names
-        spectator_qubits_list = []
-        spectator_pulse_names = {}
-        for qubit_name, pulse in self.spectator_qubits_control.items():
-            if qubit_name in self.spectator_qubits:
-                spectator_qubit = self.spectator_qubits[qubit_name]
-                spectator_qubits_list.append(spectator_qubit)
-                spectator_pulse_names[qubit_name] = get_pulse_name(pulse)
+        structure = self._get_structure()
 
         # Align all qubits (including coupler and spectator qubits) before playing to ensure simultaneous start
-        all_qubits = [
-            self.qubit_pair.qubit_control,
-            self.qubit_pair.qubit_target,
-        ] + spectator_qubits_list
-        channel_names = {ch.name for qubit in all_qubits for ch in qubit.channels.values()}
-        if hasattr(self.qubit_pair, "coupler") and self.qubit_pair.coupler is not None:
-            channel_names.add(self.qubit_pair.coupler.name)
-        align(*channel_names)
+        align(*structure.channel_names)
 
         # Spectator qubit flux pulses
-        for qubit_name, pulse_name in spectator_pulse_names.items():
-            if qubit_name in self.spectator_qubits:
-                self.spectator_qubits[qubit_name].z.play(pulse_name)
+        for spectator_qubit, _, pulse_name in structure.spectator_controls.values():
+            spectator_qubit.z.play(pulse_name)
 
         # Moving qubit flux
-        moving_qubit = (
-            self.qubit_pair.qubit_control
-            if self.qubit_pair.moving_qubit == "control"
-            else self.qubit_pair.qubit_target
-        )
-        moving_qubit.z.play(
-            self.flux_pulse_qubit_label,
+        structure.moving_qubit.z.play(
+            structure.flux_pulse_qubit_label,
             amplitude_scale=amplitude_scale_qubit,
             duration=duration_qubit,
         )
 
         # Coupler flux
-        if self.coupler_flux_pulse is not None:
-            self.qubit_pair.coupler.play(
-                self.coupler_flux_pulse_label,
+        if structure.coupler_flux_pulse is not None:
+            structure.coupler.play(
+                structure.coupler_flux_pulse_label,
                 validate=False,
                 amplitude_scale=amplitude_scale_coupler,
             )
 
         # Align all resources after playing pulses
-        self.qubit_pair.qubit_control.align([self.qubit_pair.qubit_target] + spectator_qubits_list)
+        align(*structure.qubit_channel_names)
 
         # Apply phase shifts
+        qubit_control, qubit_target = structure.qubit_control, structure.qubit_target
         if phase_shift_control is not None:
-            self.qubit_pair.qubit_control.xy.frame_rotation_2pi(phase_shift_control)
+            qubit_control.xy.frame_rotation_2pi(phase_shift_control)
         elif np.abs(self.phase_shift_control) > 1e-6:
-            self.qubit_pair.qubit_control.xy.frame_rotation_2pi(self.phase_shift_control)
+            qubit_control.xy.frame_rotation_2pi(self.phase_shift_control)
         if phase_shift_target is not None:
-            self.qubit_pair.qubit_target.xy.frame_rotation_2pi(phase_shift_target)
+            qubit_target.xy.frame_rotation_2pi(phase_shift_target)
         elif np.abs(self.phase_shift_target) > 1e-6:
-            self.qubit_pair.qubit_target.xy.frame_rotation_2pi(self.phase_shift_target)
+            qubit_target.xy.frame_rotation_2pi(self.phase_shift_target)
 
         # Apply spectator qubit phase shifts
         for qubit_name, phase_shift in self.spectator_qubits_phase_shift.items():
-            if qubit_name in self.spectator_qubits and np.abs(phase_shift) > 1e-6:
-                self.spectator_qubits[qubit_name].xy.frame_rotation_2pi(phase_shift)
+            if qubit_name in structure.spectator_qubits and np.abs(phase_shift) > 1e-6:
+                structure.spectator_qubits[qubit_name].xy.frame_rotation_2pi(phase_shift)
 
         # Final alignment (includes coupler if present)
-        final_channel_names = {ch.name for qubit in all_qubits for ch in qubit.channels.values()}
-        if hasattr(self.qubit_pair, "coupler") and self.qubit_pair.coupler is not None:
-            final_channel_names.add(self.qubit_pair.coupler.name)
-        align(*final_channel_names)
+        align(*structure.channel_names)
 
     @property
     def inferred_duration(self) -> float:
-        moving_qubit = (
-            self.qubit_pair.qubit_control
-            if self.qubit_pair.moving_qubit == "control"
-            else self.qubit_pair.qubit_target
-        )
-        max_length_samples = get_pulse(self.flux_pulse_qubit_label, moving_qubit).length
-
-        for qubit_name, pulse in self.spectator_qubits_control.items():
-            if qubit_name in self.spectator_qubits:
-                spectator_qubit = self.spectator_qubits[qubit_name]
-                max_length_samples = max(
-                    max_length_samples,
-                    get_pulse(pulse, spectator_qubit).length,
-                )
-
-        if self.coupler_flux_pulse is not None:
-            max_length_samples = max(
-                max_length_samples,
-                get_pulse(self.coupler_flux_pulse_label, self.coupler).length,
-            )
-
-        return max_length_samples * 1e-9
+        structure = self._get_structure()
+        pulses = [structure.flux_pulse_qubit]
+        pulses += [pulse for _, pulse, _ in structure.spectator_controls.values()]
+        if structure.coupler_flux_pulse is not None:
+            pulses.append(structure.coupler_flux_pulse)
+        return max(pulse.length for pulse in pulses) * 1e-9
@@ -1,4 +1,4 @@
-from typing import Union, Literal, Optional
+from typing import Literal, Optional, Tuple, Union
 from quam.components.macro import QubitMacro
 from quam.core import quam_dataclass
 from quam.components.pulses import Pulse, ReadoutPulse
@@ -28,9 +28,11 @@ class MeasureMacro(QubitMacro):
         pulse = get_pulse(self.pulse, self.qubit)
         resonator: ReadoutResonatorIQ = self.qubit.resonator
 
-        qua_vars = kwargs.get("qua_vars", (declare(fixed), declare(fixed)))
-        I, Q = qua_vars
-        state: QuaVariableBool = kwargs.get("state", declare(bool))
+        qua_vars = kwargs.get("qua_vars")
+        I, Q = qua_vars if qua_vars is not None else (declare(fixed), declare(fixed))
+        state: QuaVariableBool = kwargs.get("state")
+        if state is None:
+            state = declare(bool)
         stream_I: Optional[StreamType] = kwargs.get("stream_I", None)
         stream_Q: Optional[StreamType] = kwargs.get("stream_Q", None)
 
@@ -44,6 +46,11 @@ class MeasureMacro(QubitMacro):
 
         return state
 
+    @property
+    def scheduled_channels(self) -> Tuple[str, ...]:
+        """The channels used by this macro, see ``quam_builder.tools.gate_scheduler``."""
+        return (self.qubit.resonator.name,)
+
     @property
     def inferred_duration(self) -> float:
         readout_pulse: ReadoutPulse = (
@@ -95,6 +102,7 @@ class ResetMacro(QubitMacro):
                 pi_pulse_name=get_pulse_name(pi_pulse),
                 readout_pulse_name=get_pulse_name(readout_pulse),
                 max_attempts=self.max_attempts,
+                qua_vars=kwargs.get("qua_vars", None),
             )
         elif self.reset_type == "active_gef":
             if pi_12_pulse is None:
@@ -139,6 +147,11 @@ class VirtualZMacro(QubitMacro):
     def __post_init__(self) -> None:
         self.fidelity = 1.0  # Virtual Z gate is assumed to be perfect
 
+    @property
+    def scheduled_channels(self) -> Tuple[str, ...]:
+        """The channels used by this macro, see ``quam_builder.tools.gate_scheduler``."""
+        return (self.qubit.xy.name,)
+
     @property
     def inferred_duration(self) -> float:
         return 0.0  # Virtual Z gate is assumed to be instantaneous
@@ -150,6 +163,9 @@ class DelayMacro(QubitMacro):
     Macro for delaying a qubit.
     """
 
+    # Waits on all channels of the qubit for the same duration
+    ends_aligned = True
+
     def apply(self, duration: int, **kwargs) -> None:
         qubit: AnyTransmon = self.qubit
         qubit.wait(duration)
@@ -162,6 +178,8 @@ class IdMacro(QubitMacro):
     In QUA, we assimilate it to an align statement across all the channels of the qubit.
     """
 
+    ends_aligned = True
+
     def apply(self, **kwargs) -> None:
         qubit: AnyTransmon = self.qubit
         qubit.align()
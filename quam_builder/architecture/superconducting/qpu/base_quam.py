@@ -1,12 +1,15 @@
 from dataclasses import field
-from typing import List, Dict, ClassVar, Optional, Union
+from functools import reduce
+from pathlib import Path
+from typing import List, Dict, ClassVar, Optional, Sequence, Tuple, Union
 import importlib
 import logging
 
 from qm import QuantumMachinesManager, QuantumMachine
 from qm.octave import QmOctaveConfig
 from qm.qua.type_hints import QuaVariable, StreamType
-from qm.qua import declare_stream, declare, fixed, align
+from qm.qua._expressions import QuaArrayVariable
+from qm.qua import Cast, align, assign, declare, declare_stream, fixed, wait, while_
 
 from quam.components import FrequencyConverter
 from quam.components.quantum_components import Qubit
@@ -18,6 +21,14 @@ from quam.serialisation import JSONSerialiser
 from quam_builder.architecture.superconducting.components.twpa import TWPA
 from quam_builder.architecture.superconducting.qubit_pair import AnyTransmonPair
 from quam_builder.architecture.superconducting.qubit import AnyTransmon
+from quam_builder.tools.octave_calibration import (
+    OctaveCalibrationLedger,
+    calibrate_elements,
+    octave_calibration,
+)
+from quam_builder.tools.pulse_templates import read_expanded_state, save_with_pulse_templates
+from quam_builder.tools.qmm_pool import get_qmm_pool
+from quam_builder.tools.qua_tools import save_qua_array
 
 logger = logging.getLogger(__name__)
 
@@ -41,16 +52,25 @@ class BaseQuam(QuamRoot):
         # _data_handler (ClassVar[DataHandler]): The data handler. # Unused
         qmm (Optional[QuantumMachinesManager]): The Quantum Machines Manager.
         extras (dict): Additional attributes for the QUAM.
+        use_pulse_templates (bool): Whether to save repeated pulse definitions once, as
+            templates in the state file. See `quam_builder.tools.pulse_templates`.
     Methods:
         get_serialiser: Get the serialiser for the QuamRoot class.
+        save: Save the machine, with pulse templates if `use_pulse_templates` is set.
+        load: Load the machine, expanding pulse templates.
         get_octave_config: Return the Octave configuration.
         connect: Open a Quantum Machine Manager with network credentials.
+        open_qm: Open a quantum machine, reusing or updating an open one where possible.
         calibrate_octave_ports: Calibrate Octave ports for active qubits.
         active_qubits: Return the list of active qubits.
         active_qubit_pairs: Return the list of active qubit pairs.
         depletion_time: Return longest depletion time amongst active qubits.
         thermalization_time: Return longest thermalization time.
         declare_qua_variables: Declare necessary QUA variables for qubits.
+        declare_qua_array_variables: Declare array-backed QUA variables for qubits.
+        measure_all: Measure the resonators of several qubits simultaneously.
+        readout_states: Read out the states of several qubits with one simultaneous measurement.
+        reset_qubits_active: Actively reset several qubits in parallel.
         initialize_qpu: Initialize the QPU with specified settings.
         twpa_keepalive: Align the TWPA pumps with the given qubits to keep them on.
     """
@@ -73,6 +93,8 @@ class BaseQuam(QuamRoot):
 
     extras: dict = field(default_factory=dict)
 
+    use_pulse_templates: bool = False
+
     @classmethod
     def get_serialiser(cls) -> JSONSerialiser:
         """Get the serialiser for the QuamRoot class, which is the JSONSerialiser.
@@ -81,6 +103,36 @@ class BaseQuam(QuamRoot):
         """
         return JSONSerialiser(content_mapping={"wiring": "wiring.json", "network": "wiring.json"})
 
+    def save(
+        self,
+        path: Optional[Union[Path, str]] = None,
+        content_mapping: Optional[Dict[str, str]] = None,
+        include_defaults: Optional[bool] = None,
+        ignore: Optional[Sequence[str]] = None,
+    ):
+        """Save the machine, see `QuamRoot.save`.
+
+        If ``use_pulse_templates`` is set, repeated pulse definitions are saved once, as
+        templates, see `quam_builder.tools.pulse_templates`.
+        """
+        if not self.use_pulse_templates:
+            return super().save(path, content_mapping, include_defaults, ignore)
+        return save_with_pulse_templates(self, path, content_mapping, include_defaults, ignore)
+
+    @classmethod
+    def load(
+        cls,
+        filepath_or_dict: Optional[Union[str, Path, dict]] = None,
+        validate_type: bool = True,
+        fix_attrs: bool = True,
+    ):
+        """Load the machine, see `QuamRoot.load`. Pulse templates in the state are expanded."""
+        return super().load(
+            filepath_or_dict=read_expanded_state(cls, filepath_or_dict),
+            validate_type=validate_type,
+            fix_attrs=fix_attrs,
+        )
+
     def get_octave_config(self) -> Optional[QmOctaveConfig]:
         """Return the Octave configuration."""
         octave_config = None
@@ -232,7 +284,7 @@ class BaseQuam(QuamRoot):
                 f"Class '{class_name}' not found in module '{module_path}': {e}"
             ) from e
 
-    def connect(self) -> QuantumMachinesManager:
+    def connect(self, reuse: bool = True) -> QuantumMachinesManager:
         """Open a Quantum Machine Manager with credentials from network config.
 
         The method supports both standard QuantumMachinesManager and custom QMM
@@ -254,6 +306,11 @@ class BaseQuam(QuamRoot):
         For custom QMM classes, `qmm_settings` must be provided with all required
         connection parameters.
 
+        Args:
+            reuse (bool): If True, an open connection with the same QMM class and settings is
+                taken from the process-wide pool of `quam_builder.tools.qmm_pool`, if it still
+                responds. Default is True.
+
         Returns:
             QuantumMachinesManager: The opened Quantum Machine Manager.
 
@@ -283,7 +340,10 @@ class BaseQuam(QuamRoot):
             # Attempt to create and connect QMM
             host = settings.get("host", "unknown host")
             logger.info(f"Connecting to {qmm_class.__name__} at {host}")
-            self.qmm = qmm_class(**settings)
+            if reuse:
+                self.qmm = get_qmm_pool().connect(qmm_class, settings)
+            else:
+                self.qmm = qmm_class(**settings)
 
             return self.qmm
 
@@ -294,19 +354,59 @@ class BaseQuam(QuamRoot):
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Quantum Machines Manager: {e}") from e
 
-    def calibrate_octave_ports(self, QM: QuantumMachine) -> None:
-        """Calibrate the Octave ports for all the active qubits.
+    def open_qm(
+        self, config: Optional[dict] = None, runtime_updates: bool = True, **kwargs
+    ) -> QuantumMachine:
+        """Open a quantum machine, reusing an open one if its config is unchanged.
+
+        Connects first if needed, see `connect`. If only intermediate frequencies, mixer
+        corrections or overridable waveforms changed, the open quantum machine is updated
+        instead, see `quam_builder.tools.qmm_pool.QmmPool.open_qm`.
 
         Args:
-            QM (QuantumMachine): The running quantum machine.
+            config (Optional[dict]): The QUA config. Defaults to `generate_config()`.
+            runtime_updates (bool): Whether to update an open quantum machine whose config
+                differs only in runtime-updatable values, instead of opening a new one.
+                Default is True.
+            **kwargs: Additional keyword arguments of `QuantumMachinesManager.open_qm`.
+
+        Returns:
+            QuantumMachine: The open quantum machine.
         """
-        from qm.octave.octave_mixer_calibration import NoCalibrationElements
+        if self.qmm is None:
+            self.connect()
+        if config is None:
+            config = self.generate_config()
+        return get_qmm_pool().open_qm(self.qmm, config, runtime_updates=runtime_updates, **kwargs)
 
-        for name in self.active_qubit_names:
-            try:
-                self.qubits[name].calibrate_octave(QM)
-            except NoCalibrationElements:
-                print(f"No calibration elements found for {name}. Skipping calibration.")
+    def calibrate_octave_ports(
+        self,
+        QM: Union[QuantumMachine, Dict[str, QuantumMachine]],
+        ledger: Optional[OctaveCalibrationLedger] = None,
+        max_workers: int = 1,
+    ) -> None:
+        """Calibrate the Octave ports for all the active qubits.
+
+        The channels are calibrated one after the other, since a quantum machine runs one
+        calibration job at a time. The channels of different Octaves can be calibrated in
+        parallel by separate quantum machines.
+
+        Args:
+            QM (Union[QuantumMachine, Dict[str, QuantumMachine]]): The running quantum machine,
+                or a mapping from Octave name to the quantum machine calibrating its channels.
+            ledger (Optional[OctaveCalibrationLedger]): The ledger of previous calibrations. If
+                given, channels that were already calibrated with their current LO frequency,
+                intermediate frequency and Octave gain are skipped, and new calibrations are
+                recorded in it.
+            max_workers (int): The number of quantum machines calibrating in parallel, if
+                `QM` is a mapping to several quantum machines. Defaults to 1.
+        """
+        calibrations = []
+        for qubit in self.active_qubits:
+            for channel in (qubit.resonator, qubit.xy):
+                if channel is not None:
+                    calibrations.append(octave_calibration(channel))
+        calibrate_elements(QM, calibrations, ledger=ledger, max_workers=max_workers)
 
     @property
     def active_qubits(self) -> List[AnyTransmon]:
@@ -341,6 +441,9 @@ class BaseQuam(QuamRoot):
     ]:
         """Macro to declare the necessary QUA variables for all qubits.
 
+        The per-qubit streams can be averaged on the controller with the templates of
+        `quam_builder.tools.stream_processing`, e.g. ``save_averaged_iq(I_st, Q_st, shape)``.
+
         Args:
             num_IQ_pairs (Optional[int]): Number of IQ pairs (I and Q variables) to declare.
                 If None, it defaults to the number of qubits in `self.qubits`.
@@ -359,6 +462,215 @@ class BaseQuam(QuamRoot):
         Q_st = [declare_stream() for _ in range(num_IQ_pairs)]
         return I, I_st, Q, Q_st, n, n_st
 
+    def declare_qua_array_variables(
+        self,
+        num_IQ_pairs: Optional[int] = None,
+    ) -> tuple[
+        QuaArrayVariable,
+        StreamType,
+        QuaArrayVariable,
+        StreamType,
+        QuaVariable,
+        StreamType,
+    ]:
+        """Macro to declare array-backed QUA variables for all qubits.
+
+        Array-backed variant of `declare_qua_variables`: I and Q are single `fixed` arrays
+        with one slot per qubit, and each has a single stream. Measure into the slots with
+        ``qua_vars=(I[i], Q[i])``, save them with
+        `quam_builder.tools.qua_tools.save_qua_array`, and recover one value per qubit in
+        the stream processing with ``I_st.buffer(num_IQ_pairs)``, or average them with
+        ``save_averaged_iq(I_st, Q_st, shape, num_qubits=num_IQ_pairs)`` from
+        `quam_builder.tools.stream_processing`.
+
+        Args:
+            num_IQ_pairs (Optional[int]): Size of the I and Q arrays.
+                If None, it defaults to the number of qubits in `self.qubits`.
+
+        Returns:
+            tuple: A tuple containing the I and Q arrays, their streams, and the averaging
+                counter with its stream.
+        """
+        if num_IQ_pairs is None:
+            num_IQ_pairs = len(self.qubits)
+
+        n = declare(int)
+        n_st = declare_stream()
+        I = declare(fixed, size=num_IQ_pairs)
+        Q = declare(fixed, size=num_IQ_pairs)
+        I_st = declare_stream()
+        Q_st = declare_stream()
+        return I, I_st, Q, Q_st, n, n_st
+
+    def measure_all(
+        self,
+        qubits: Optional[Sequence[AnyTransmon]] = None,
+        pulse_name: str = "readout",
+        qua_vars: Optional[Tuple[QuaArrayVariable, QuaArrayVariable]] = None,
+    ) -> Tuple[QuaArrayVariable, QuaArrayVariable]:
+        """Measure the resonators of several qubits simultaneously.
+
+        The resonators are aligned once and their readout pulses are then played at the
+        same time, so that resonators sharing a feedline are frequency multiplexed. The
+        results are demodulated into the slots of I and Q arrays, one slot per qubit.
+
+        Args:
+            qubits (Sequence[AnyTransmon], optional): The qubits to measure.
+                Defaults to `self.active_qubits`.
+            pulse_name (str): The name of the readout pulse of each resonator. Default is "readout".
+            qua_vars (Tuple[QuaArrayVariable, QuaArrayVariable], optional): The (I, Q) arrays to
+                demodulate into, e.g. from `declare_qua_array_variables`. Slot i holds the
+                result of ``qubits[i]``. If None, new arrays are declared.
+
+        Returns:
+            Tuple[QuaArrayVariable, QuaArrayVariable]: The I and Q arrays.
+        """
+        if qubits is None:
+            qubits = self.active_qubits
+        if qua_vars is None:
+            qua_vars = (declare(fixed, size=len(qubits)), declare(fixed, size=len(qubits)))
+        I, Q = qua_vars
+
+        align(*[qubit.resonator.name for qubit in qubits])
+        for i, qubit in enumerate(qubits):
+            qubit.resonator.measure(pulse_name, qua_vars=(I[i], Q[i]))
+        return I, Q
+
+    def readout_states(
+        self,
+        states,
+        qubits: Optional[Sequence[AnyTransmon]] = None,
+        pulse_name: str = "readout",
+        thresholds: Optional[Sequence[float]] = None,
+        qua_vars: Optional[Tuple[QuaArrayVariable, QuaArrayVariable]] = None,
+    ) -> Tuple[QuaArrayVariable, QuaArrayVariable]:
+        """Read out the states of several qubits with one simultaneous measurement.
+
+        Multiplexed counterpart of `BaseTransmon.readout_state`: all resonators are
+        measured at once with `measure_all`, each I value is compared to the threshold
+        of its qubit, and the resonators then wait once for the longest depletion time
+        instead of once per qubit.
+
+        Args:
+            states: The variables to assign the states to, indexed like ``qubits``, e.g. an
+                int array of the same size or a list of int variables.
+            qubits (Sequence[AnyTransmon], optional): The qubits to read out.
+                Defaults to `self.active_qubits`.
+            pulse_name (str): The name of the readout pulse of each resonator. Default is "readout".
+            thresholds (Sequence[float], optional): The threshold of each qubit. If None, the
+                threshold of each readout pulse is used.
+            qua_vars (Tuple[QuaArrayVariable, QuaArrayVariable], optional): The (I, Q) arrays to
+                demodulate into. If None, new arrays are declared.
+
+        Returns:
+            Tuple[QuaArrayVariable, QuaArrayVariable]: The I and Q arrays.
+
+        Raises:
+            ValueError: If the number of thresholds differs from the number of qubits.
+        """
+        if qubits is None:
+            qubits = self.active_qubits
+        if thresholds is not None and len(thresholds) != len(qubits):
+            raise ValueError(f"Got {len(thresholds)} thresholds for {len(qubits)} qubits")
+        if thresholds is None:
+            thresholds = [qubit.resonator.operations[pulse_name].threshold for qubit in qubits]
+
+        I, Q = self.measure_all(qubits, pulse_name=pulse_name, qua_vars=qua_vars)
+        for i, threshold in enumerate(thresholds):
+            assign(states[i], Cast.to_int(I[i] > threshold))
+
+        resonators = [qubit.resonator.name for qubit in qubits]
+        align(*resonators)
+        wait(max(qubit.resonator.depletion_time for qubit in qubits) // 4, *resonators)
+        return I, Q
+
+    def reset_qubits_active(
+        self,
+        qubits: Optional[Sequence[AnyTransmon]] = None,
+        save_qua_var: Optional[StreamType] = None,
+        pi_pulse_name: str = "x180",
+        readout_pulse_name: str = "readout",
+        max_attempts: int = 15,
+        qua_vars: Optional[Tuple[QuaArrayVariable, QuaArrayVariable]] = None,
+    ) -> Optional[QuaArrayVariable]:
+        """Actively reset several qubits in parallel.
+
+        Parallel counterpart of `BaseTransmon.reset_qubit_active`. Each round measures all
+        qubits simultaneously with `measure_all`, waits once for the depletion and then
+        plays the conditional pi pulses of all qubits at the same time. When
+        ``max_attempts > 1``, rounds are repeated in a single ``while_`` loop until every
+        qubit was below the ``rus_exit_threshold`` of its readout pulse once, or the attempt
+        limit is reached. A qubit that was below its exit threshold is no longer flipped in
+        later rounds, so that a false positive cannot excite it again. The reset thus takes
+        as many rounds as the slowest qubit needs, instead of the sum over all qubits.
+
+        Args:
+            qubits (Sequence[AnyTransmon], optional): The qubits to reset.
+                Defaults to `self.active_qubits`.
+            save_qua_var (Optional[StreamType]): The stream to save the number of attempts of
+                each qubit to, in the order of ``qubits``. Use ``stream.buffer(len(qubits))``
+                in the stream processing. Ignored when ``max_attempts`` is ``1``.
+            pi_pulse_name (str): The name of the pi pulse to use for the reset. Default is "x180".
+            readout_pulse_name (str): The name of the readout pulse to use for measuring the
+                qubit states. Default is "readout".
+            max_attempts (int): Maximum number of reset rounds. Default is 15. Use ``1`` for a
+                single-shot active reset with no retry loop.
+            qua_vars (Tuple[QuaArrayVariable, QuaArrayVariable], optional): The (I, Q) arrays
+                to demodulate into. If None, new arrays are declared.
+
+        Returns:
+            Optional[QuaArrayVariable]: The int array with the number of attempts of each
+                qubit, i.e. the number of rounds until it was first below its exit threshold.
+                None when ``max_attempts`` is ``1``.
+        """
+        if qubits is None:
+            qubits = self.active_qubits
+        pulses = [qubit.resonator.operations[readout_pulse_name] for qubit in qubits]
+        resonators = [qubit.resonator.name for qubit in qubits]
+        channels = [channel.name for qubit in qubits for channel in qubit.channels.values()]
+        depletion_time = max(qubit.resonator.depletion_time for qubit in qubits)
+        if qua_vars is None:
+            qua_vars = (declare(fixed, size=len(qubits)), declare(fixed, size=len(qubits)))
+        I, _ = qua_vars
+        states = declare(bool, size=len(qubits))
+
+        # Qubits that were below their exit threshold once are no longer measured for a flip
+        done = declare(bool, value=[False] * len(qubits)) if max_attempts > 1 else None
+
+        def measure_and_flip():
+            align(*channels)
+            self.measure_all(qubits, pulse_name=readout_pulse_name, qua_vars=qua_vars)
+            for i, pulse in enumerate(pulses):
+                assign(states[i], I[i] > pulse.threshold)
+            wait(depletion_time // 2, *resonators)
+            for i, qubit in enumerate(qubits):
+                condition = states[i] if done is None else states[i] & ~done[i]
+                qubit.xy.play(pi_pulse_name, condition=condition)
+
+        def update_done():
+            for i, pulse in enumerate(pulses):
+                assign(done[i], done[i] | (I[i] < pulse.rus_exit_threshold))
+            return reduce(lambda a, b: a | b, [~done[i] for i in range(len(qubits))])
+
+        measure_and_flip()
+        attempts = None
+        if max_attempts > 1:
+            attempts = declare(int, value=[1] * len(qubits))
+            round_number = declare(int, value=1)
+            pending = declare(bool)
+            assign(pending, update_done())
+            with while_(pending & (round_number < max_attempts)):
+                for i in range(len(qubits)):
+                    assign(attempts[i], attempts[i] + Cast.to_int(~done[i]))
+                measure_and_flip()
+                assign(round_number, round_number + 1)
+                assign(pending, update_done())
+            if save_qua_var is not None:
+                save_qua_array(attempts, save_qua_var, len(qubits))
+        wait(500, *[qubit.xy.name for qubit in qubits])
+        align(*channels)
+        return attempts
+
     def initialize_qpu(self, isolation: bool = False, **kwargs):
         """Initialize the QPU with the calibrated TWPA pumping points.
 
@@ -1,10 +1,12 @@
 import warnings
 from dataclasses import field
-from typing import Dict, Union, ClassVar, Type
+from typing import ClassVar, Dict, List, Sequence, Type, Union
 
 from quam.core import quam_dataclass
 from qm.qua import update_frequency
 
+from quam_builder.architecture.superconducting.components.flux_line import FluxLine
+from quam_builder.architecture.superconducting.components.tunable_coupler import TunableCoupler
 from quam_builder.architecture.superconducting.qubit import FluxTunableTransmon
 from quam_builder.architecture.superconducting.qubit_pair import FluxTunableTransmonPair
 from quam_builder.architecture.superconducting.qpu.base_quam import BaseQuam
@@ -42,51 +44,112 @@ class FluxTunableQuam(BaseQuam):
     def load(cls, *args, **kwargs) -> "FluxTunableQuam":
         return super().load(*args, **kwargs)
 
-    def apply_all_couplers_to_min(self) -> None:
-        """Apply the offsets that bring all the active qubit pairs to a decoupled point."""
+    def apply_all_couplers_to_min(self, skip_unchanged: bool = False) -> List[TunableCoupler]:
+        """Apply the offsets that bring all the active qubit pairs to a decoupled point.
+
+        Args:
+            skip_unchanged (bool): If True, offsets already set in the current QUA scope are
+                not emitted again. Default is False.
+
+        Returns:
+            List[TunableCoupler]: The couplers whose offset was emitted.
+        """
+        changed = []
         for qp in self.active_qubit_pairs:
             if qp.coupler is not None:
-                qp.coupler.to_decouple_idle()
+                if qp.coupler.to_decouple_idle(skip_unchanged=skip_unchanged):
+                    changed.append(qp.coupler)
+        return changed
+
+    def apply_all_flux_to_joint_idle(
+        self, skip_unchanged: bool = False
+    ) -> List[Union[FluxLine, TunableCoupler]]:
+        """Apply the offsets that bring all the active qubits to the joint sweet spot.
 
-    def apply_all_flux_to_joint_idle(self) -> None:
-        """Apply the offsets that bring all the active qubits to the joint sweet spot."""
+        Args:
+            skip_unchanged (bool): If True, offsets already set in the current QUA scope are
+                not emitted again. Default is False.
+
+        Returns:
+            List[Union[FluxLine, TunableCoupler]]: The flux lines and couplers whose offset
+                was emitted.
+        """
+        changed = []
         for q in self.active_qubits:
             if q.z is not None:
-                q.z.to_joint_idle()
+                if q.z.to_joint_idle(skip_unchanged=skip_unchanged):
+                    changed.append(q.z)
             else:
                 warnings.warn(f"Didn't find z-element on qubit {q.name}, didn't set to joint-idle")
         for q in self.qubits:
             if self.qubits[q] not in self.active_qubits:
                 if self.qubits[q].z is not None:
-                    self.qubits[q].z.to_min()
+                    if self.qubits[q].z.to_min(skip_unchanged=skip_unchanged):
+                        changed.append(self.qubits[q].z)
                 else:
                     warnings.warn(f"Didn't find z-element on qubit {q}, didn't set to min")
-        self.apply_all_couplers_to_min()
+        changed += self.apply_all_couplers_to_min(skip_unchanged=skip_unchanged)
+        return changed
+
+    def apply_all_flux_to_min(
+        self, skip_unchanged: bool = False, exclude: Sequence[FluxTunableTransmon] = ()
+    ) -> List[Union[FluxLine, TunableCoupler]]:
+        """Apply the offsets that bring all the active qubits to the minimum frequency point.
 
-    def apply_all_flux_to_min(self) -> None:
-        """Apply the offsets that bring all the active qubits to the minimum frequency point."""
+        Args:
+            skip_unchanged (bool): If True, offsets already set in the current QUA scope are
+                not emitted again. Default is False.
+            exclude (Sequence[FluxTunableTransmon]): Qubits whose flux is not set, e.g.
+                since the caller sets them to another point right after.
+
+        Returns:
+            List[Union[FluxLine, TunableCoupler]]: The flux lines and couplers whose offset
+                was emitted.
+        """
+        changed = []
         for q in self.qubits:
+            if self.qubits[q] in exclude:
+                continue
             if self.qubits[q].z is not None:
-                self.qubits[q].z.to_min()
+                if self.qubits[q].z.to_min(skip_unchanged=skip_unchanged):
+                    changed.append(self.qubits[q].z)
             else:
                 warnings.warn(f"Didn't find z-element on qubit {q}, didn't set to min")
-        self.apply_all_couplers_to_min()
+        changed += self.apply_all_couplers_to_min(skip_unchanged=skip_unchanged)
+        return changed
 
-    def apply_all_flux_to_zero(self) -> None:
-        """Apply the offsets that bring all the active qubits to the zero bias point."""
-        for q in self.active_qubits:
-            q.z.to_zero()
+    def apply_all_flux_to_zero(self, skip_unchanged: bool = False) -> List[FluxLine]:
+        """Apply the offsets that bring all the active qubits to the zero bias point.
+
+        Args:
+            skip_unchanged (bool): If True, offsets already set in the current QUA scope are
+                not emitted again. Default is False.
+
+        Returns:
+            List[FluxLine]: The flux lines whose offset was emitted.
+        """
+        return [q.z for q in self.active_qubits if q.z.to_zero(skip_unchanged=skip_unchanged)]
 
     def set_all_fluxes(
         self,
         flux_point: str,
         target: Union[FluxTunableTransmon, FluxTunableTransmonPair] | None = None,
+        skip_unchanged: bool = True,
     ):
         """Set the fluxes to the specified point for the target qubit or qubit pair.
 
+        Only the flux lines and couplers whose offset changes are settled. By default,
+        offsets that were already set by a previous call in the same QUA scope are not
+        emitted again, see ``quam_builder.tools.dc_offset_tracker``. This avoids redundant
+        ``set_dc_offset`` statements and settle times when switching flux points often,
+        e.g. once per qubit in a Python loop. Offsets set through raw
+        ``qua.set_dc_offset`` calls are taken into account.
+
         Args:
             flux_point (str): The flux point to set ('independent', 'pairwise', 'joint', 'min').
             target (Union[FluxTunableTransmon, FluxTunableTransmonPair]): The target qubit or qubit pair.
+            skip_unchanged (bool): If False, all offsets are emitted and settled again.
+                Default is True.
         """
         if flux_point == "independent":
             assert isinstance(
@@ -99,28 +162,37 @@ class FluxTunableQuam(BaseQuam):
 
         target_bias = None
         if flux_point == "joint":
-            self.apply_all_flux_to_joint_idle()
+            changed = self.apply_all_flux_to_joint_idle(skip_unchanged=skip_unchanged)
             if isinstance(target, FluxTunableTransmonPair):
                 target_bias = target.mutual_flux_bias
             elif isinstance(target, FluxTunableTransmon):
                 target_bias = target.z.joint_offset
         else:
-            self.apply_all_flux_to_min()
+            # Emitting the min offset of the target right before its idle offset is redundant
+            exclude = []
+            if skip_unchanged and flux_point == "independent":
+                exclude = [target]
+            elif skip_unchanged and flux_point == "pairwise":
+                exclude = [target.qubit_control, target.qubit_target]
+            changed = self.apply_all_flux_to_min(skip_unchanged=skip_unchanged, exclude=exclude)
 
         if flux_point == "independent":
-            target.z.to_independent_idle()
+            if target.z.to_independent_idle(skip_unchanged=skip_unchanged):
+                changed.append(target.z)
             target_bias = target.z.independent_offset
 
         elif flux_point == "pairwise":
-            target.to_mutual_idle()
+            changed += target.to_mutual_idle(skip_unchanged=skip_unchanged)
             target_bias = target.mutual_flux_bias
 
+        # A line may have been set twice, e.g. to min and then to the independent offset
+        for line in {line.name: line for line in changed}.values():
+            line.settle()
+
         if target is None:
             for q in self.qubits:
-                self.qubits[q].z.settle()
                 self.qubits[q].align()
         else:
-            target.z.settle()
             target.align()
 
         return target_bias
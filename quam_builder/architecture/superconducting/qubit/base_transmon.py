@@ -12,8 +12,15 @@ from quam_builder.architecture.superconducting.components.xy_drive import (
     XYDriveIQ,
     XYDriveMW,
 )
+from quam_builder.tools.octave_calibration import (
+    OctaveCalibrationLedger,
+    calibrate_elements,
+    octave_calibration,
+)
+from quam_builder.tools.qua_tools import declare_pooled
+from quam_builder.tools.state_discrimination import nearest_center_discriminator
 
-from qm import QuantumMachine, logger
+from qm import QuantumMachine
 from qm.qua.type_hints import QuaVariable
 from qm.octave.octave_mixer_calibration import MixerCalibrationResults
 from qm.qua import (
@@ -26,7 +33,6 @@ from qm.qua import (
     StreamType,
     if_,
     update_frequency,
-    Math,
     Cast,
 )
 
@@ -135,6 +141,7 @@ class BaseTransmon(Qubit):
         QM: QuantumMachine,
         calibrate_drive: bool = True,
         calibrate_resonator: bool = True,
+        ledger: Optional[OctaveCalibrationLedger] = None,
     ) -> Tuple[Union[None, MixerCalibrationResults], Union[None, MixerCalibrationResults]]:
         """Calibrate the Octave channels (xy and resonator) linked to this transmon for the LO frequency, intermediate
         frequency and Octave gain as defined in the state.
@@ -143,47 +150,24 @@ class BaseTransmon(Qubit):
             QM (QuantumMachine): the running quantum machine.
             calibrate_drive (bool): flag to calibrate xy line.
             calibrate_resonator (bool): flag to calibrate the resonator line.
+            ledger (Optional[OctaveCalibrationLedger]): ledger of previous calibrations. If given, channels that were
+                already calibrated with their current LO frequency, intermediate frequency and gain are skipped.
 
         Return:
-            The Octave calibration results as (resonator, xy_drive)
+            The Octave calibration results as (resonator, xy_drive). Skipped channels return None.
         """
+        channels = []
         if calibrate_resonator and self.resonator is not None:
-            if hasattr(self.resonator, "frequency_converter_up"):
-                logger.info(f"Calibrating {self.resonator.name}")
-                resonator_calibration_output = QM.calibrate_element(
-                    self.resonator.name,
-                    {
-                        self.resonator.frequency_converter_up.LO_frequency: (
-                            self.resonator.intermediate_frequency,
-                        )
-                    },
-                )
-            else:
-                raise RuntimeError(
-                    f"{self.resonator.name} doesn't have a 'frequency_converter_up' attribute, it is thus most likely "
-                    "not connected to an Octave."
-                )
-        else:
-            resonator_calibration_output = None
-
+            channels.append(self.resonator)
         if calibrate_drive and self.xy is not None:
-            if hasattr(self.xy, "frequency_converter_up"):
-                logger.info(f"Calibrating {self.xy.name}")
-                xy_drive_calibration_output = QM.calibrate_element(
-                    self.xy.name,
-                    {
-                        self.xy.frequency_converter_up.LO_frequency: (
-                            self.xy.intermediate_frequency,
-                        )
-                    },
-                )
-            else:
-                raise RuntimeError(
-                    f"{self.xy.name} doesn't have a 'frequency_converter_up' attribute, it is thus most likely not "
-                    "connected to an Octave."
-                )
-        else:
-            xy_drive_calibration_output = None
+            channels.append(self.xy)
+        calibrations = [octave_calibration(channel) for channel in channels]
+
+        results = calibrate_elements(QM, calibrations, ledger=ledger, max_workers=1)
+        resonator_calibration_output = (
+            results.get(self.resonator.name) if self.resonator is not None else None
+        )
+        xy_drive_calibration_output = results.get(self.xy.name) if self.xy is not None else None
         return resonator_calibration_output, xy_drive_calibration_output
 
     def set_gate_shape(self, gate_shape: str) -> None:
@@ -196,7 +180,13 @@ class BaseTransmon(Qubit):
                     f"The gate '{gate}_{gate_shape}' is not part of the existing operations for {self.xy.name} --> {self.xy.operations.keys()}."
                 )
 
-    def readout_state(self, state, pulse_name: str = "readout", threshold: Optional[float] = None):
+    def readout_state(
+        self,
+        state,
+        pulse_name: str = "readout",
+        threshold: Optional[float] = None,
+        qua_vars: Optional[Tuple[QuaVariable, QuaVariable]] = None,
+    ):
         """
         Perform a readout of the qubit state using the specified pulse.
 
@@ -207,15 +197,17 @@ class BaseTransmon(Qubit):
             state: The variable to assign the readout result to.
             pulse_name (str): The name of the readout pulse to use. Default is "readout".
             threshold (float, optional): The threshold value for the readout. If None, the default threshold for the pulse is used.
+            qua_vars (Tuple[QuaVariable, QuaVariable], optional): The (I, Q) variables to demodulate into,
+                e.g. ``(I[i], Q[i])`` slots of the arrays from `declare_qua_array_variables`.
+                If None, new fixed variables are declared.
 
         Returns:
             None
 
-        The function declares fixed variables I and Q, measures the qubit state using the specified pulse, and assigns the result to the state variable based on the threshold.
+        The function measures the qubit state using the specified pulse, and assigns the result to the state variable based on the threshold.
         It then waits for the resonator depletion time.
         """
-        I = declare(fixed)
-        Q = declare(fixed)
+        I, Q = qua_vars if qua_vars is not None else (declare(fixed), declare(fixed))
         if threshold is None:
             threshold = self.resonator.operations[pulse_name].threshold
         self.resonator.measure(pulse_name, qua_vars=(I, Q))
@@ -278,6 +270,7 @@ class BaseTransmon(Qubit):
         pi_pulse_name: str = "x180",
         readout_pulse_name: str = "readout",
         max_attempts: int = 15,
+        qua_vars: Optional[Tuple[QuaVariable, QuaVariable]] = None,
     ):
         """
         Perform an active reset of the qubit.
@@ -298,6 +291,9 @@ class BaseTransmon(Qubit):
             max_attempts (int): Maximum number of reset attempts. Default is 15.
                 Must be a strictly positive integer. Use ``1`` for a single-shot active
                 reset with no retry loop.
+            qua_vars (Tuple[QuaVariable, QuaVariable], optional): The (I, Q) variables to demodulate into,
+                e.g. ``(I[i], Q[i])`` slots of the arrays from `declare_qua_array_variables`.
+                If None, new fixed variables are declared.
 
         Returns:
             None
@@ -312,8 +308,7 @@ class BaseTransmon(Qubit):
 
         pulse = self.resonator.operations[readout_pulse_name]
 
-        I = declare(fixed)
-        Q = declare(fixed)
+        I, Q = qua_vars if qua_vars is not None else (declare(fixed), declare(fixed))
         state = declare(bool)
         self.align()
         self.resonator.measure(readout_pulse_name, qua_vars=(I, Q))
@@ -389,25 +384,37 @@ class BaseTransmon(Qubit):
             self.align()
             assign(attempts, attempts + 1)
 
-    def readout_state_gef(self, state: QuaVariable, pulse_name: str = "readout_GEF"):
+    def readout_state_gef(
+        self,
+        state: QuaVariable,
+        pulse_name: str = "readout_GEF",
+        qua_vars: Optional[Tuple[QuaVariable, QuaVariable]] = None,
+    ):
         """
         Perform a GEF state readout using the specified pulse and update the state variable.
 
         This function measures the 'I' and 'Q' quadrature components of the resonator's response
-        to a given pulse, calculates the squared Euclidean distance between the measured
-        (I, Q) values and the predefined GEF state centers, and assigns the state variable
-        to the index of the closest GEF state.
+        to a given pulse and assigns the state variable to the index of the GEF state center
+        closest to the measured (I, Q) values. The boundaries between the centers are computed
+        when the program is generated, so that the pulse processor only evaluates two linear
+        comparisons of I and Q, see `quam_builder.tools.state_discrimination`.
 
         Args:
             state (QuaVariableBool): The variable to store the readout state (0 for 'g', 1 for 'e', 2 for 'f').
             pulse_name (str, optional): The name of the pulse to use for the readout. Defaults to "readout_GEF".
+            qua_vars (Tuple[QuaVariable, QuaVariable], optional): The (I, Q) variables to demodulate into.
+                If None, fixed variables that are shared by all GEF readouts of this resonator in the
+                program are used.
 
         Returns:
             None
         """
-        I = declare(fixed)
-        Q = declare(fixed)
-        diff = declare(fixed, size=3)
+        if qua_vars is not None:
+            I, Q = qua_vars
+        else:
+            # One pair per resonator, so that multiplexed readouts stay independent
+            I = declare_pooled(fixed, ("readout_state_gef", self.resonator.name, "I"))
+            Q = declare_pooled(fixed, ("readout_state_gef", self.resonator.name, "Q"))
 
         self.resonator.update_frequency(
             int(self.resonator.intermediate_frequency + self.resonator.GEF_frequency_shift)
@@ -415,17 +422,8 @@ class BaseTransmon(Qubit):
         self.resonator.measure(pulse_name, qua_vars=(I, Q))
         self.resonator.update_frequency(self.resonator.intermediate_frequency)
 
-        gef_centers = [
-            self.resonator.gef_centers[0],
-            self.resonator.gef_centers[1],
-            self.resonator.gef_centers[2],
-        ]
-        for p in range(3):
-            assign(
-                diff[p],
-                Math.abs(I - gef_centers[p][0]) + Math.abs(Q - gef_centers[p][1]),
-            )
-        assign(state, Math.argmin(diff))
+        gef_centers = [self.resonator.gef_centers[p] for p in range(3)]
+        nearest_center_discriminator(gef_centers).assign_state(state, I, Q)
         wait(self.resonator.depletion_time // 4, self.resonator.name)
 
     def wait(self, duration: int):
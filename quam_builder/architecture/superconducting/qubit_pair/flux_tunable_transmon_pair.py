@@ -4,6 +4,7 @@ from qm.qua import align, wait
 
 from quam.core import quam_dataclass
 from quam.components.quantum_components import QubitPair
+from quam_builder.architecture.superconducting.components.flux_line import FluxLine
 from quam_builder.architecture.superconducting.components.tunable_coupler import (
     TunableCoupler,
 )
@@ -84,7 +85,18 @@ class FluxTunableTransmonPair(QubitPair):
 
         wait(duration, *channels)
 
-    def to_mutual_idle(self):
-        """Sets the flux bias to the mutual idle offset for the control and target qubits."""
-        self.qubit_control.z.set_dc_offset(self.mutual_flux_bias[0])
-        self.qubit_target.z.set_dc_offset(self.mutual_flux_bias[1])
+    def to_mutual_idle(self, skip_unchanged: bool = False) -> List[FluxLine]:
+        """Sets the flux bias to the mutual idle offset for the control and target qubits.
+
+        Args:
+            skip_unchanged (bool): If True, offsets already set in the current QUA scope are
+                not emitted again. Default is False.
+
+        Returns:
+            List[FluxLine]: The flux lines whose offset was emitted.
+        """
+        changed = []
+        for qubit, offset in zip((self.qubit_control, self.qubit_target), self.mutual_flux_bias):
+            if qubit.z.set_dc_offset(offset, skip_unchanged=skip_unchanged):
+                changed.append(qubit.z)
+        return changed
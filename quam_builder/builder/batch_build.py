@@ -0,0 +1,244 @@
+"""Build several QUAM machines in parallel.
+
+Regenerating the states of many chips or cooldown variants runs ``build_quam_wiring``,
+``build_quam`` and ``save`` once per machine. These builds are independent and CPU
+bound, so ``build_quams`` runs them in a process pool:
+
+    >>> from quam_builder.builder.batch_build import BuildSpec, build_quams
+    >>> specs = [
+    ...     BuildSpec("chip_a", connectivity_a, FluxTunableQuam, "states/chip_a"),
+    ...     BuildSpec("chip_b", connectivity_b, FluxTunableQuam, "states/chip_b"),
+    ... ]
+    >>> report = build_quams(specs, max_workers=4)
+    >>> print(report)
+    >>> report.raise_for_errors()
+
+Every machine is saved to the ``output_path`` of its spec, regardless of the
+``QUAM_STATE_PATH`` of the environment. Results are reported in the order of the specs,
+independent of the order in which the builds finish. A failing build does not stop the
+others; its traceback is collected in the report instead.
+"""
+
+import logging
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, Union
+
+from quam.core import QuamRoot
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["BuildSpec", "BuildResult", "BatchBuildReport", "BatchBuildError", "build_quams"]
+
+
+@dataclass
+class BuildSpec:
+    """Everything needed to build and save one machine.
+
+    All attributes must be picklable, so ``build_function`` should be a module-level
+    function.
+
+    Attributes:
+        name (str): A unique name of the machine, used in the report.
+        connectivity: The ``Connectivity`` from which the wiring is generated.
+        machine_class (Type[QuamRoot]): The QUAM class to instantiate, e.g. ``FluxTunableQuam``.
+        output_path (Union[Path, str]): The folder to which the machine is saved.
+        calibration_db_path (Optional[Union[Path, str]]): The path to the Octave calibration
+            database.
+        host_ip (str): The IP address of the Quantum Orchestration Platform.
+        cluster_name (str): The name of the cluster as displayed in the admin panel.
+        port (Optional[int]): The port number of the Quantum Orchestration Platform.
+        build_function (Optional[Callable]): The function that builds the machine from
+            its wiring, called as ``build_function(machine, calibration_db_path=..., **build_kwargs)``.
+            Defaults to the superconducting ``build_quam``.
+        build_kwargs (Dict[str, Any]): Additional keyword arguments of ``build_function``.
+    """
+
+    name: str
+    connectivity: Any
+    machine_class: Type[QuamRoot]
+    output_path: Union[Path, str]
+    calibration_db_path: Optional[Union[Path, str]] = None
+    host_ip: str = "127.0.0.1"
+    cluster_name: str = "Cluster_1"
+    port: Optional[int] = None
+    build_function: Optional[Callable] = None
+    build_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BuildResult:
+    """The outcome of building one machine.
+
+    Attributes:
+        name (str): The name of the build spec.
+        output_path (Path): The folder to which the machine was saved.
+        timings (Dict[str, float]): The duration in seconds of the "wiring" and "build"
+            steps. Failed builds only contain the steps that completed.
+        error (Optional[str]): The formatted traceback if the build failed, otherwise None.
+    """
+
+    name: str
+    output_path: Path
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def duration(self) -> float:
+        """The total build duration in seconds."""
+        return sum(self.timings.values())
+
+
+class BatchBuildError(RuntimeError):
+    """Raised by ``BatchBuildReport.raise_for_errors`` if any build failed."""
+
+
+@dataclass
+class BatchBuildReport:
+    """The results of ``build_quams``, in the order of the build specs.
+
+    Attributes:
+        results (List[BuildResult]): The result of each build spec.
+        duration (float): The wall-clock duration of the whole batch in seconds.
+    """
+
+    results: List[BuildResult]
+    duration: float
+
+    @property
+    def failed(self) -> List[BuildResult]:
+        return [result for result in self.results if not result.ok]
+
+    def raise_for_errors(self) -> None:
+        """Raise a ``BatchBuildError`` with the tracebacks of all failed builds."""
+        if not self.failed:
+            return
+        details = "\n\n".join(f"{result.name}:\n{result.error}" for result in self.failed)
+        raise BatchBuildError(
+            f"{len(self.failed)} of {len(self.results)} builds failed\n\n{details}"
+        )
+
+    def __str__(self) -> str:
+        name_width = max([len("name")] + [len(result.name) for result in self.results])
+        lines = [f"{'name':<{name_width}}  {'status':<6}  {'wiring':>8}  {'build':>8}  output"]
+        for result in self.results:
+            status = "ok" if result.ok else "FAILED"
+            wiring, build = (result.timings.get(step) for step in ("wiring", "build"))
+            lines.append(
+                f"{result.name:<{name_width}}  {status:<6}  {_format_seconds(wiring)}  "
+                f"{_format_seconds(build)}  {result.output_path}"
+            )
+        lines.append(
+            f"{len(self.results) - len(self.failed)}/{len(self.results)} succeeded "
+            f"in {self.duration:.2f} s"
+        )
+        return "\n".join(lines)
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    return f"{'-':>8}" if seconds is None else f"{seconds:>7.2f}s"
+
+
+def _build_machine(spec: BuildSpec) -> BuildResult:
+    """Build and save the machine of a single spec. Runs in a worker process."""
+    # Imported here so that worker processes only import the builders they need
+    from quam_builder.builder.qop_connectivity.build_quam_wiring import build_quam_wiring
+
+    result = BuildResult(name=spec.name, output_path=Path(spec.output_path).resolve())
+    try:
+        if spec.build_function is None:
+            from quam_builder.builder.superconducting.build_quam import build_quam
+
+            build_function = build_quam
+        else:
+            build_function = spec.build_function
+
+        start = time.perf_counter()
+        machine = spec.machine_class()
+        # Save to the output folder of this spec rather than the global state path
+        machine.serialiser.state_path = result.output_path
+        build_quam_wiring(
+            spec.connectivity, spec.host_ip, spec.cluster_name, machine, port=spec.port
+        )
+        result.timings["wiring"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_function(machine, calibration_db_path=spec.calibration_db_path, **spec.build_kwargs)
+        result.timings["build"] = time.perf_counter() - start
+    except Exception:  # pylint: disable=broad-exception-caught
+        result.error = traceback.format_exc()
+    return result
+
+
+def _validate_specs(specs: Sequence[BuildSpec]) -> None:
+    names, output_paths = set(), set()
+    for spec in specs:
+        if spec.name in names:
+            raise ValueError(f"Duplicate build spec name '{spec.name}'")
+        output_path = Path(spec.output_path).resolve()
+        if output_path in output_paths:
+            raise ValueError(f"Build spec '{spec.name}' writes to the same folder as another spec")
+        names.add(spec.name)
+        output_paths.add(output_path)
+
+
+def build_quams(
+    specs: Sequence[BuildSpec],
+    max_workers: Optional[int] = None,
+    mp_context: Optional[str] = None,
+) -> BatchBuildReport:
+    """Build and save the machines of several build specs in a process pool.
+
+    Args:
+        specs (Sequence[BuildSpec]): The machines to build. Names and output folders must
+            be unique.
+        max_workers (Optional[int]): The number of worker processes. Defaults to the number
+            of CPUs, and at most the number of specs. With ``max_workers=1`` the machines
+            are built one after the other in the current process, which eases debugging.
+        mp_context (Optional[str]): The multiprocessing start method of the workers, e.g.
+            "spawn" or "fork". Defaults to the platform default.
+
+    Returns:
+        BatchBuildReport: The result of each spec, in the order of ``specs``.
+
+    Raises:
+        ValueError: If two specs have the same name or output folder.
+    """
+    _validate_specs(specs)
+    start = time.perf_counter()
+
+    if max_workers is None:
+        max_workers = min(len(specs), multiprocessing.cpu_count()) or 1
+
+    if max_workers == 1:
+        results = [_build_machine(spec) for spec in specs]
+    else:
+        context = multiprocessing.get_context(mp_context) if mp_context else None
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = [executor.submit(_build_machine, spec) for spec in specs]
+            results = []
+            for spec, future in zip(specs, futures):
+                try:
+                    results.append(future.result())
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # E.g. a worker process that died or a spec that could not be pickled
+                    results.append(
+                        BuildResult(
+                            name=spec.name,
+                            output_path=Path(spec.output_path).resolve(),
+                            error=traceback.format_exc(),
+                        )
+                    )
+
+    report = BatchBuildReport(results=results, duration=time.perf_counter() - start)
+    for result in report.failed:
+        logger.warning(f"Building '{result.name}' failed")
+    return report
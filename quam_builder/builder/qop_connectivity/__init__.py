@@ -9,3 +9,5 @@ from .modify_ports import (
     remove_mw_port,
     remove_port,
 )
+from .wiring_diff import WiringDiff, apply_wiring_diff, diff_wiring
+from .reference_index import ReferenceIndex, get_reference_index, invalidate_reference_index
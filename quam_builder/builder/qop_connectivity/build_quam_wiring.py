@@ -6,6 +6,7 @@ from quam.components.ports import FEMPortsContainer, OPXPlusPortsContainer
 from quam_builder.architecture.superconducting.qpu import AnyQuam as AnyQuamSC
 from quam_builder.architecture.nv_center.qpu import AnyQuamNV
 from quam_builder.builder.qop_connectivity.create_wiring import create_wiring
+from quam_builder.builder.qop_connectivity.wiring_diff import apply_wiring_diff, diff_wiring
 
 AnyQuam = Union[AnyQuamSC, AnyQuamNV]
 
@@ -16,6 +17,7 @@ def build_quam_wiring(
     cluster_name: str,
     quam_instance: AnyQuam,
     port: Optional[int] = None,
+    incremental: bool = False,
 ):
     """Builds the QUAM wiring configuration and saves the machine setup.
 
@@ -25,8 +27,19 @@ def build_quam_wiring(
         cluster_name (str): The name of the cluster as displayed in the admin panel.
         quam_instance (AnyQuam): The QUAM instance to be configured.
         port (Optional[int]): The port number. Defaults to None.
+        incremental (bool): If True and the machine already has wiring, only the wiring
+            lines that differ from `connectivity` are replaced, together with the ports
+            they reference, see `wiring_diff.apply_wiring_diff`. The existing ports
+            container and the ports of unchanged lines are kept. Defaults to False,
+            which regenerates the complete wiring.
     """
     machine = quam_instance
+    if incremental and machine.wiring and machine.ports is not None:
+        add_name_and_ip(machine, host_ip, cluster_name, port)
+        apply_wiring_diff(machine, diff_wiring(machine.wiring, create_wiring(connectivity)))
+        machine.save()
+        return machine
+
     add_ports_container(connectivity, machine)
     add_name_and_ip(machine, host_ip, cluster_name, port)
     machine.wiring = create_wiring(connectivity)
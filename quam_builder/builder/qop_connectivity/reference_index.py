@@ -0,0 +1,240 @@
+"""Reverse lookups from qubits to qubit pairs and from ports to wiring lines.
+
+Finding the qubit pairs of a qubit, or the wiring lines that use a port, otherwise
+means scanning every pair or line of the machine and resolving its references. When
+many qubits or lines are edited in a row, e.g. when retiring a column of qubits, these
+scans make the edits quadratic in the size of the machine.
+
+``get_reference_index`` returns a ``ReferenceIndex`` of a machine that is built lazily
+on first use and kept up to date by the ``modify_quam`` helpers (including
+``add_qubit_pair`` and ``remove_qubit_pair``) and ``wiring_diff.apply_wiring_diff`` as
+they edit the machine. Assigning a new ``machine.wiring`` or ``machine.qubit_pairs`` is
+detected and triggers a rebuild. After editing individual wiring lines, adding or
+removing qubit pairs by hand or reassigning their qubits, call
+``invalidate_reference_index``.
+"""
+
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Set, Tuple
+
+from quam.core.quam_classes import QuamDict
+
+__all__ = [
+    "WiringLine",
+    "flatten_wiring",
+    "port_references",
+    "ReferenceIndex",
+    "get_reference_index",
+    "invalidate_reference_index",
+]
+
+# (element_type, element_id, line_type), e.g. ("qubits", "q1", "xy")
+WiringLine = Tuple[str, str, str]
+
+_indices: "weakref.WeakKeyDictionary[Any, ReferenceIndex]" = weakref.WeakKeyDictionary()
+
+
+def _raw_items(mapping: Mapping) -> Iterator[Tuple[str, Any]]:
+    """Yield the items of a wiring dict without resolving references."""
+    for key in mapping:
+        if isinstance(mapping, QuamDict):
+            yield key, mapping.get_raw_value(key)
+        else:
+            yield key, mapping[key]
+
+
+def flatten_wiring(wiring: Mapping) -> Dict[WiringLine, Dict[str, Any]]:
+    """Return the raw port dicts of a wiring dict by wiring line, without resolving references."""
+    lines = {}
+    for element_type, wiring_by_element in _raw_items(wiring):
+        for element_id, wiring_by_line_type in _raw_items(wiring_by_element):
+            for line_type, ports in _raw_items(wiring_by_line_type):
+                lines[(element_type, element_id, line_type)] = dict(_raw_items(ports))
+    return lines
+
+
+def port_references(ports: Mapping) -> Iterator[str]:
+    """Yield the port references of the port dict of a wiring line."""
+    for reference in ports.values():
+        if isinstance(reference, str) and reference.startswith("#/ports/"):
+            yield reference
+
+
+def _qubit_id(reference: Any) -> Any:
+    """Qubit id of a raw qubit reference such as "#/qubits/q1" or a qubit component."""
+    if reference is None:
+        return None
+    if isinstance(reference, str):
+        return reference.rstrip("/").split("/")[-1]
+    return reference.name
+
+
+def _pair_qubit_ids_from_wiring(pair_id: str) -> Tuple[str, str]:
+    qc, qt = pair_id.split("-", 1)
+    qt = qt if str(qt).startswith("q") else f"q{qt}"
+    return qc, qt
+
+
+class ReferenceIndex:
+    """Reverse index of the qubit pairs and the wiring of a machine.
+
+    Args:
+        machine: The QUAM machine to index. Only a weak reference is kept.
+    """
+
+    def __init__(self, machine):
+        self._machine = weakref.ref(machine)
+        self._pairs_by_qubit: Dict[str, Set[str]] = {}
+        # Qubit ids of the pairs in machine.qubit_pairs, and line types of the wired pairs
+        self._component_pairs: Dict[str, frozenset] = {}
+        self._wired_pairs: Dict[str, Set[str]] = {}
+        self._indexed_qubit_pairs = None
+        self._pairs_indexed_wiring = None
+        self._lines_by_port: Dict[str, Set[WiringLine]] = {}
+        self._indexed_wiring = None
+
+    def _pair_qubits(self, pair_id: str) -> Set[str]:
+        qubit_ids = set(self._component_pairs.get(pair_id, ()))
+        if pair_id in self._wired_pairs:
+            qubit_ids.update(_pair_qubit_ids_from_wiring(pair_id))
+        return qubit_ids
+
+    def _update_pair(self, pair_id: str, old_qubit_ids: Set[str]) -> None:
+        """Move ``pair_id`` from the entries of its old qubits to those of its current ones."""
+        new_qubit_ids = self._pair_qubits(pair_id)
+        for qubit_id in old_qubit_ids - new_qubit_ids:
+            pair_ids = self._pairs_by_qubit[qubit_id]
+            pair_ids.discard(pair_id)
+            if not pair_ids:
+                del self._pairs_by_qubit[qubit_id]
+        for qubit_id in new_qubit_ids - old_qubit_ids:
+            self._pairs_by_qubit.setdefault(qubit_id, set()).add(pair_id)
+
+    def _build_pairs(self, machine) -> None:
+        self._pairs_by_qubit = {}
+        self._component_pairs = {}
+        self._wired_pairs = {}
+        self._indexed_qubit_pairs = getattr(machine, "qubit_pairs", None)
+        self._pairs_indexed_wiring = machine.wiring
+        for pair_id, pair in (self._indexed_qubit_pairs or {}).items():
+            self.add_qubit_pair(
+                pair_id,
+                [pair.get_raw_value(attr) for attr in ("qubit_control", "qubit_target")],
+            )
+        for pair_id, wiring_by_line_type in _raw_items(machine.wiring.get("qubit_pairs", {})):
+            self._wired_pairs[pair_id] = set(wiring_by_line_type)
+            self._update_pair(pair_id, set())
+
+    def _build_lines(self, machine) -> None:
+        self._lines_by_port = {}
+        self._indexed_wiring = machine.wiring
+        for line, ports in flatten_wiring(machine.wiring).items():
+            self.add_wiring_line(line, ports)
+
+    def _get_machine(self):
+        machine = self._machine()
+        if machine is None:
+            raise ReferenceError("The indexed machine no longer exists")
+        return machine
+
+    def qubit_pair_ids(self, qubit_id: str) -> List[str]:
+        """Return the sorted ids of the qubit pairs that reference a qubit.
+
+        Pairs are found both in ``machine.qubit_pairs`` and in ``machine.wiring``.
+        """
+        machine = self._get_machine()
+        if (
+            getattr(machine, "qubit_pairs", None) is not self._indexed_qubit_pairs
+            or machine.wiring is not self._pairs_indexed_wiring
+        ):
+            self._build_pairs(machine)
+        return sorted(self._pairs_by_qubit.get(qubit_id, ()))
+
+    def add_qubit_pair(self, pair_id: str, qubits: Iterable[Any]) -> None:
+        """Record that ``machine.qubit_pairs[pair_id]`` pairs the given qubits.
+
+        Args:
+            pair_id (str): The id of the qubit pair.
+            qubits (Iterable): The qubit ids, raw qubit references such as "#/qubits/q1",
+                or qubit components.
+        """
+        if self._pairs_indexed_wiring is None:
+            return  # Not built yet
+        old_qubit_ids = self._pair_qubits(pair_id)
+        self._component_pairs[pair_id] = frozenset(
+            _qubit_id(qubit) for qubit in qubits if qubit is not None
+        )
+        self._update_pair(pair_id, old_qubit_ids)
+
+    def remove_qubit_pair(self, pair_id: str) -> None:
+        """Record that ``pair_id`` was removed from ``machine.qubit_pairs``."""
+        if self._pairs_indexed_wiring is None:
+            return  # Not built yet
+        old_qubit_ids = self._pair_qubits(pair_id)
+        self._component_pairs.pop(pair_id, None)
+        self._update_pair(pair_id, old_qubit_ids)
+
+    def _add_wired_pair_line(self, pair_id: str, line_type: str) -> None:
+        old_qubit_ids = self._pair_qubits(pair_id)
+        self._wired_pairs.setdefault(pair_id, set()).add(line_type)
+        self._update_pair(pair_id, old_qubit_ids)
+
+    def _remove_wired_pair_line(self, pair_id: str, line_type: str) -> None:
+        old_qubit_ids = self._pair_qubits(pair_id)
+        line_types = self._wired_pairs.get(pair_id, set())
+        line_types.discard(line_type)
+        if not line_types:
+            self._wired_pairs.pop(pair_id, None)
+        self._update_pair(pair_id, old_qubit_ids)
+
+    def wiring_lines_using_port(self, port_reference: str) -> Set[WiringLine]:
+        """Return the wiring lines that reference a port, e.g. "#/ports/mw_outputs/con1/1/2"."""
+        machine = self._get_machine()
+        if machine.wiring is not self._indexed_wiring:
+            self._build_lines(machine)
+        return set(self._lines_by_port.get(port_reference, ()))
+
+    def add_wiring_line(self, line: WiringLine, ports: Mapping) -> None:
+        """Record that a wiring line references the ports in ``ports``."""
+        element_type, element_id, line_type = line
+        if element_type == "qubit_pairs" and self._pairs_indexed_wiring is not None:
+            self._add_wired_pair_line(element_id, line_type)
+        if self._indexed_wiring is None:
+            return  # Not built yet
+        for reference in port_references(ports):
+            self._lines_by_port.setdefault(reference, set()).add(line)
+
+    def remove_wiring_line(self, line: WiringLine, ports: Mapping) -> None:
+        """Record that a wiring line no longer references the ports in ``ports``."""
+        element_type, element_id, line_type = line
+        if element_type == "qubit_pairs" and self._pairs_indexed_wiring is not None:
+            self._remove_wired_pair_line(element_id, line_type)
+        if self._indexed_wiring is None:
+            return  # Not built yet
+        for reference in port_references(ports):
+            lines = self._lines_by_port.get(reference)
+            if lines is None:
+                continue
+            lines.discard(line)
+            if not lines:
+                del self._lines_by_port[reference]
+
+    def update_wiring_element(self, element_type: str, element_id: str, old, new) -> None:
+        """Record that the wiring of an element was replaced, e.g. ``{"xy": {...}}``."""
+        for line_type, ports in _raw_items(old or {}):
+            self.remove_wiring_line((element_type, element_id, line_type), dict(_raw_items(ports)))
+        for line_type, ports in _raw_items(new or {}):
+            self.add_wiring_line((element_type, element_id, line_type), dict(_raw_items(ports)))
+
+
+def get_reference_index(machine) -> ReferenceIndex:
+    """Return the reference index of a machine, creating it on first use."""
+    index = _indices.get(machine)
+    if index is None:
+        index = _indices[machine] = ReferenceIndex(machine)
+    return index
+
+
+def invalidate_reference_index(machine) -> None:
+    """Discard the reference index of a machine, e.g. after editing its wiring by hand."""
+    _indices.pop(machine, None)
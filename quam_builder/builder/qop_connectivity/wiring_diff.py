@@ -0,0 +1,176 @@
+"""Compare and incrementally apply QUAM wiring.
+
+``create_wiring`` regenerates the complete wiring dict from a ``Connectivity``.
+For large setups where only a few lines change, ``diff_wiring`` compares the
+existing ``machine.wiring`` with freshly generated wiring line by line, and
+``apply_wiring_diff`` applies only the differences: touched wiring lines are
+replaced, ports referenced by new lines are created, and ports that are no
+longer referenced by any line are removed.
+
+Example::
+
+    from quam_builder.builder.qop_connectivity.create_wiring import create_wiring
+    from quam_builder.builder.qop_connectivity.wiring_diff import (
+        apply_wiring_diff,
+        diff_wiring,
+    )
+
+    diff = diff_wiring(machine.wiring, create_wiring(connectivity))
+    apply_wiring_diff(machine, diff)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from quam_builder.builder.qop_connectivity.modify_ports import add_port, remove_port
+from quam_builder.builder.qop_connectivity.reference_index import (
+    WiringLine,
+    flatten_wiring,
+    get_reference_index,
+    port_references,
+)
+
+__all__ = [
+    "WiringLine",
+    "WiringDiff",
+    "diff_wiring",
+    "apply_wiring_diff",
+    "remove_unreferenced_ports",
+]
+
+
+@dataclass
+class WiringDiff:
+    """Line-level differences between two wiring dicts.
+
+    Attributes:
+        added: Port dicts of lines that only exist in the new wiring.
+        removed: Port dicts of lines that only exist in the old wiring.
+        changed: Old and new port dicts of lines whose ports differ between the two
+            wirings.
+    """
+
+    added: Dict[WiringLine, Dict[str, Any]] = field(default_factory=dict)
+    removed: Dict[WiringLine, Dict[str, Any]] = field(default_factory=dict)
+    changed: Dict[WiringLine, Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=dict)
+
+    def new_lines(self) -> Dict[WiringLine, Dict[str, Any]]:
+        """Return the new port dicts of all added and changed lines."""
+        lines = dict(self.added)
+        lines.update((line, new_ports) for line, (_, new_ports) in self.changed.items())
+        return lines
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self) -> str:
+        lines = []
+        for label, entries in (("+", self.added), ("-", self.removed), ("~", self.changed)):
+            lines.extend(f"{label} {'/'.join(line)}" for line in entries)
+        return "\n".join(lines) if lines else "No wiring changes"
+
+
+def diff_wiring(old_wiring: Mapping, new_wiring: Mapping) -> WiringDiff:
+    """Compare two wiring dicts, e.g. ``machine.wiring`` and ``create_wiring(connectivity)``.
+
+    Args:
+        old_wiring (Mapping): The current wiring.
+        new_wiring (Mapping): The wiring to move to.
+
+    Returns:
+        WiringDiff: The added, removed and changed wiring lines.
+    """
+    old_lines = flatten_wiring(old_wiring)
+    new_lines = flatten_wiring(new_wiring)
+
+    diff = WiringDiff()
+    for line, ports in new_lines.items():
+        if line not in old_lines:
+            diff.added[line] = ports
+        elif old_lines[line] != ports:
+            diff.changed[line] = (old_lines[line], ports)
+    for line, ports in old_lines.items():
+        if line not in new_lines:
+            diff.removed[line] = ports
+    return diff
+
+
+def _parse_port_reference(reference: str) -> Tuple[str, Union[str, int], Optional[int], int]:
+    """Split e.g. "#/ports/mw_outputs/con1/1/2" into port type, controller, FEM and port."""
+    elems = reference.split("/")[2:]
+    port_type = elems[0][:-1]
+    controller_id = int(elems[1]) if elems[1].isdigit() else elems[1]
+    if len(elems) == 4:
+        return port_type, controller_id, int(elems[2]), int(elems[3])
+    return port_type, controller_id, None, int(elems[2])
+
+
+def apply_wiring_diff(machine, diff: WiringDiff, remove_unused_ports: bool = True) -> None:
+    """Apply a wiring diff to ``machine.wiring`` and ``machine.ports``.
+
+    Only the lines in the diff are touched. Ports referenced by added or changed
+    lines are created through ``modify_ports.add_port``. Ports that were referenced by
+    removed or changed lines and are no longer referenced by any wiring line are
+    removed through ``modify_ports.remove_port``.
+
+    This updates the wiring only; components that were already built from it are
+    left as is. For superconducting qubits, use
+    ``modify_quam.apply_qubit_wiring_diff`` to also update the qubit channels.
+
+    Args:
+        machine: A QUAM machine with ``wiring`` and ``ports`` attributes.
+        diff (WiringDiff): The differences, as returned by ``diff_wiring``.
+        remove_unused_ports (bool): Whether to remove ports that are no longer wired.
+    """
+    wiring = machine.wiring
+    index = get_reference_index(machine)
+    stale_references = set()
+
+    for line, ports in diff.removed.items():
+        element_type, element_id, line_type = line
+        stale_references.update(port_references(ports))
+        index.remove_wiring_line(line, ports)
+        wiring_by_element = wiring.get(element_type, {})
+        wiring_by_line_type = wiring_by_element.get(element_id, {})
+        if line_type in wiring_by_line_type:
+            del wiring_by_line_type[line_type]
+        if element_id in wiring_by_element and not wiring_by_element[element_id]:
+            del wiring_by_element[element_id]
+
+    for line, (old_ports, _) in diff.changed.items():
+        stale_references.update(port_references(old_ports))
+        index.remove_wiring_line(line, old_ports)
+
+    for line, ports in diff.new_lines().items():
+        element_type, element_id, line_type = line
+        # QuamDict.setdefault returns the default rather than the stored (converted) dict
+        if element_type not in wiring:
+            wiring[element_type] = {}
+        if element_id not in wiring[element_type]:
+            wiring[element_type][element_id] = {}
+        wiring[element_type][element_id][line_type] = dict(ports)
+        index.add_wiring_line(line, ports)
+        for reference in port_references(ports):
+            port_type, controller_id, fem_id, port_id = _parse_port_reference(reference)
+            add_port(machine, port_type, controller_id, fem_id=fem_id, port_id=port_id)
+
+    if remove_unused_ports:
+        remove_unreferenced_ports(machine, stale_references)
+
+
+def remove_unreferenced_ports(machine, references: Iterable[str]) -> None:
+    """Remove the given ports that are no longer referenced by any wiring line.
+
+    Args:
+        machine: A QUAM machine with ``wiring`` and ``ports`` attributes.
+        references (Iterable[str]): Port references, e.g. "#/ports/mw_outputs/con1/1/2".
+    """
+    index = get_reference_index(machine)
+    for reference in sorted(set(references)):
+        if index.wiring_lines_using_port(reference):
+            continue
+        port_type, controller_id, fem_id, port_id = _parse_port_reference(reference)
+        try:
+            remove_port(machine, port_type, controller_id, fem_id=fem_id, port_id=port_id)
+        except KeyError:
+            continue  # The port was never created
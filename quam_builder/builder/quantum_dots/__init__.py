@@ -1,12 +1,15 @@
 """Quantum dot builder module for constructing QuAM configurations."""
 
 from . import build_utils as _build_utils, build_qpu as _build_qpu, build_quam as _build_quam
+from . import stage1_cache as _stage1_cache
 from .build_utils import *
 from .build_qpu import *
 from .build_quam import *
+from .stage1_cache import *
 
 __all__ = [
     *_build_utils.__all__,
     *_build_qpu.__all__,
     *_build_quam.__all__,
+    *_stage1_cache.__all__,
 ]
@@ -36,7 +36,7 @@ from quam_builder.builder.quantum_dots.build_utils import (
     _make_sticky_channel,
     _make_voltage_gate,
     _natural_sort_key,
-    _normalize_element_type,
+    normalize_element_type,
     _parse_qubit_pair_ids,
     _set_default_grid_location,
     _sorted_items,
@@ -157,7 +157,7 @@ class _QpuBuilder:  # pylint: disable=too-few-public-methods
     def _normalize_wiring(self, wiring: Mapping[str, Any]) -> Dict[str, Mapping[str, Any]]:
         normalized: Dict[str, Mapping[str, Any]] = {}
         for element_type, wiring_by_element in wiring.items():
-            canonical_type = _normalize_element_type(element_type)
+            canonical_type = normalize_element_type(element_type)
             if canonical_type in normalized:
                 raise ValueError(
                     f"Duplicate wiring entries for element type '{canonical_type}' detected"
@@ -483,7 +483,7 @@ __all__ = [
     "_set_default_grid_location",
     "_natural_sort_key",
     "_sorted_items",
-    "_normalize_element_type",
+    "normalize_element_type",
     "_validate_line_type",
     "_make_sticky_channel",
     "_make_voltage_gate",
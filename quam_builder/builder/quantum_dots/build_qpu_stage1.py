@@ -23,7 +23,7 @@ from quam_builder.builder.quantum_dots.build_utils import (
     _extract_qubit_number,
     _make_resonator,
     _make_voltage_gate_with_qdac,
-    _normalize_element_type,
+    normalize_element_type,
     _parse_qubit_pair_ids,
     _validate_line_type,
 )
@@ -91,7 +91,7 @@ class _BaseQpuBuilder:  # pylint: disable=too-few-public-methods
         """Normalize wiring structure by element type."""
         normalized = {}
         for element_type_raw, elements in wiring.items():
-            element_type = _normalize_element_type(element_type_raw)
+            element_type = normalize_element_type(element_type_raw)
             if element_type:
                 normalized[element_type] = elements
         return normalized
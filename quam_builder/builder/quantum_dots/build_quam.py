@@ -21,6 +21,7 @@ from quam_builder.builder.quantum_dots.build_qpu import (
     _set_default_grid_location,
 )
 from quam_builder.builder.quantum_dots.build_qpu_stage1 import _BaseQpuBuilder
+from quam_builder.builder.quantum_dots.build_utils import resolve_calibration_db_path
 from quam_builder.builder.quantum_dots.build_qpu_stage2 import _LDQubitBuilder
 from quam_builder.architecture.quantum_dots.qpu import BaseQuamQD, LossDiVincenzoQuam
 from quam_builder.builder.quantum_dots.add_default_pulses import (
@@ -107,7 +108,6 @@ __all__ = [
     "add_ports",
     "add_qpu",
     "add_pulses",
-    "_resolve_calibration_db_path",
     "_set_default_grid_location",
 ]
 # pylint: enable=undefined-all-variable
@@ -362,28 +362,6 @@ def add_pulses(machine: AnyQuam) -> None:
             add_default_resonator_pulses(sensor_dot.readout_resonator)
 
 
-def _resolve_calibration_db_path(
-    machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]]
-) -> Path:
-    """Resolve and normalize Octave calibration database path.
-
-    Args:
-        machine: QuAM instance.
-        calibration_db_path: User-provided path or None.
-
-    Returns:
-        Resolved Path object for calibration database.
-    """
-    if calibration_db_path is None:
-        serializer = machine.get_serialiser()
-        calibration_db_path = serializer._get_state_path().parent
-
-    if isinstance(calibration_db_path, str):
-        calibration_db_path = Path(calibration_db_path)
-
-    return calibration_db_path
-
-
 def add_octaves(
     machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]] = None
 ) -> AnyQuam:
@@ -399,7 +377,7 @@ def add_octaves(
     Returns:
         The machine with Octaves registered.
     """
-    calibration_db_path = _resolve_calibration_db_path(machine, calibration_db_path)
+    calibration_db_path = resolve_calibration_db_path(machine, calibration_db_path)
 
     for wiring_by_element in machine.wiring.values():
         for qubit, wiring_by_line_type in wiring_by_element.items():
@@ -12,7 +12,8 @@ This module provides helper functions for:
 # pylint: disable=undefined-all-variable
 
 import re
-from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 from numpy import ceil, sqrt
 from qualang_tools.wirer.connectivity.wiring_spec import WiringLineType
@@ -83,7 +84,7 @@ def _sorted_items(mapping: Mapping[str, Any]) -> Iterable[Tuple[str, Any]]:
         yield key, mapping[key]
 
 
-def _normalize_element_type(element_type: str) -> str:
+def normalize_element_type(element_type: str) -> str:
     """Normalize element type aliases to canonical names.
 
     Maps various element type names (e.g., 'global_gates', 'sensor_dots') to their
@@ -104,6 +105,28 @@ def _normalize_element_type(element_type: str) -> str:
         raise ValueError(f"Unsupported element type '{element_type}' in wiring") from exc
 
 
+def resolve_calibration_db_path(
+    machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]]
+) -> Path:
+    """Resolve and normalize Octave calibration database path.
+
+    Args:
+        machine: QuAM instance.
+        calibration_db_path: User-provided path or None.
+
+    Returns:
+        Resolved Path object for calibration database.
+    """
+    if calibration_db_path is None:
+        serializer = machine.get_serialiser()
+        calibration_db_path = serializer._get_state_path().parent
+
+    if isinstance(calibration_db_path, str):
+        calibration_db_path = Path(calibration_db_path)
+
+    return calibration_db_path
+
+
 def _validate_line_type(element_type: str, line_type: str) -> None:
     """Validate that a line type is allowed for the given element type.
 
@@ -413,7 +436,8 @@ __all__ = [
     "DEFAULT_READOUT_AMPLITUDE",
     "_natural_sort_key",
     "_sorted_items",
-    "_normalize_element_type",
+    "normalize_element_type",
+    "resolve_calibration_db_path",
     "_validate_line_type",
     "_set_default_grid_location",
     "_make_sticky_channel",
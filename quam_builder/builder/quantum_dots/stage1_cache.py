@@ -0,0 +1,179 @@
+"""On-disk cache of Stage 1 quantum dot builds.
+
+Stage 1 (``build_base_quam``) creates the gate topology of a device: voltage gates,
+the virtual gate set, quantum dots, dot pairs and sensor dots. Stage 2
+(``build_loss_divincenzo_quam``) only adds qubits, their XY drives and qubit pairs.
+When iterating on qubit and XY drive assignments, the gate topology stays the same,
+yet ``build_quam`` rebuilds it every time.
+
+``build_base_quam_cached`` fingerprints everything Stage 1 depends on, i.e. the wiring
+without the XY drive lines and the rest of the machine state, and stores the Stage 1
+machine under that fingerprint. Later builds with the same fingerprint load it instead
+of rebuilding it, and only add the ports, Octaves and mixers of the current wiring:
+
+    >>> from quam_builder.builder.quantum_dots import (
+    ...     build_base_quam_cached,
+    ...     build_loss_divincenzo_quam,
+    ... )
+    >>> base = build_base_quam_cached(machine, cache_dir="~/.cache/quam_builder/stage1")
+    >>> machine = build_loss_divincenzo_quam(base)
+
+Every call returns a new machine, so Stage 2 can be re-run against the same cached
+Stage 1 result as often as needed.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+from qualang_tools.wirer.connectivity.wiring_spec import WiringLineType
+from quam_builder.architecture.quantum_dots.qpu import BaseQuamQD
+from quam_builder.builder.quantum_dots.build_quam import (
+    add_external_mixers,
+    add_octaves,
+    add_ports,
+    build_base_quam,
+)
+from quam_builder.builder.quantum_dots.build_utils import (
+    normalize_element_type,
+    resolve_calibration_db_path,
+)
+
+__all__ = ["stage1_wiring", "stage1_fingerprint", "build_base_quam_cached"]
+
+logger = logging.getLogger(__name__)
+
+# Bump when the Stage 1 output changes, so that stale cache entries are not reused
+STAGE1_CACHE_VERSION = 1
+
+
+def stage1_wiring(wiring: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the subset of a wiring dict that Stage 1 depends on.
+
+    This is the complete wiring except for the qubit XY drive lines, which are only
+    used by Stage 2. Qubits without any remaining lines are left out.
+
+    Args:
+        wiring: The raw wiring dict, e.g. ``machine.wiring.to_dict()``.
+
+    Returns:
+        A new wiring dict.
+    """
+    subset = {}
+    for element_type, wiring_by_element in wiring.items():
+        stage2_line_types = set()
+        if normalize_element_type(element_type) == "qubits":
+            stage2_line_types.add(WiringLineType.DRIVE.value)
+
+        elements = {}
+        for element_id, wiring_by_line_type in wiring_by_element.items():
+            lines = {
+                line_type: ports
+                for line_type, ports in wiring_by_line_type.items()
+                if line_type not in stage2_line_types
+            }
+            if lines:
+                elements[element_id] = lines
+        if elements:
+            subset[element_type] = elements
+    return subset
+
+
+def stage1_fingerprint(
+    machine: BaseQuamQD, calibration_db_path: Optional[Union[Path, str]] = None
+) -> str:
+    """Return a fingerprint of everything that determines the Stage 1 build of a machine.
+
+    The fingerprint covers the machine class, the Stage 1 wiring, the remaining machine
+    state (e.g. network settings and the ports container) and the calibration database.
+
+    Args:
+        machine: The unbuilt machine with wiring defined.
+        calibration_db_path: Path to the Octave calibration database.
+
+    Returns:
+        A hex digest that is stable across Python sessions.
+    """
+    state = machine.to_dict()
+    wiring = state.pop("wiring", None) or {}
+    contents = {
+        "version": STAGE1_CACHE_VERSION,
+        "class": f"{type(machine).__module__}.{type(machine).__qualname__}",
+        "state": state,
+        "wiring": stage1_wiring(wiring),
+        "calibration_db_path": str(resolve_calibration_db_path(machine, calibration_db_path)),
+    }
+    serialised = json.dumps(contents, sort_keys=True, default=str)
+    return hashlib.sha256(serialised.encode()).hexdigest()
+
+
+def build_base_quam_cached(
+    machine: BaseQuamQD,
+    cache_dir: Union[Path, str],
+    calibration_db_path: Optional[Union[Path, str]] = None,
+    qdac_ip: Optional[str] = None,
+    connect_qdac: bool = False,
+) -> BaseQuamQD:
+    """Build Stage 1 of a machine, reusing a cached build with the same fingerprint.
+
+    On a cache miss, Stage 1 is built from the Stage 1 wiring on a copy of the machine
+    and stored in ``cache_dir``. On a hit, it is loaded from there. In both cases, the
+    Stage 1 machine is then given the full wiring of ``machine``, together with its Octaves, external mixers and
+    ports. The result equals ``build_base_quam(machine, save=False)``.
+
+    Args:
+        machine: BaseQuamQD instance with wiring defined. It is not modified.
+        cache_dir: Folder in which Stage 1 builds are stored, one subfolder per
+            fingerprint.
+        calibration_db_path: Path to Octave calibration database. If None, uses
+            the machine's state directory.
+        qdac_ip: IP address for QDAC connection, see ``build_base_quam``.
+        connect_qdac: If True, connects to QDAC using qdac_ip or machine.network['qdac_ip'].
+
+    Returns:
+        A new BaseQuamQD ready for Stage 2. It is not saved.
+    """
+    machine_class = type(machine)
+    calibration_db_path = resolve_calibration_db_path(machine, calibration_db_path)
+    fingerprint = stage1_fingerprint(machine, calibration_db_path)
+    cache_path = Path(cache_dir).expanduser() / fingerprint
+
+    contents = machine.to_dict()
+    if not cache_path.exists():
+        logger.info(f"Building Stage 1 {fingerprint[:12]}")
+        contents_stage1 = dict(contents, wiring=stage1_wiring(contents.get("wiring") or {}))
+        base = machine_class.load(contents_stage1)
+        build_base_quam(base, calibration_db_path=calibration_db_path, save=False)
+        # Write to a temporary folder of this build first, so that concurrent builds never
+        # see or write into a partial state
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(tempfile.mkdtemp(prefix=f"tmp_{fingerprint[:12]}_", dir=cache_path.parent))
+        try:
+            base.save(tmp_path)
+            tmp_path.replace(cache_path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not cache_path.exists():
+                raise
+            # Another build stored the same fingerprint in the meantime
+            logger.info(f"Loading concurrently stored Stage 1 build {fingerprint[:12]}")
+            base = machine_class.load(cache_path)
+    else:
+        logger.info(f"Loading Stage 1 build {fingerprint[:12]} from {cache_path}")
+        base = machine_class.load(cache_path)
+
+    base.wiring = contents.get("wiring") or {}
+    add_octaves(base, calibration_db_path=calibration_db_path)
+    add_external_mixers(base)
+    add_ports(base)
+
+    if connect_qdac:
+        if qdac_ip:
+            base.network["qdac_ip"] = qdac_ip
+        base.connect_to_external_source(external_qdac=True)
+
+    return base
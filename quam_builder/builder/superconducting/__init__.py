@@ -1,2 +1,12 @@
 from .build_quam import build_quam
-from .modify_quam import add_qubit, remove_qubit, add_channel, remove_channel
+from .modify_quam import (
+    add_qubit,
+    add_qubits,
+    remove_qubit,
+    remove_qubits,
+    add_qubit_pair,
+    remove_qubit_pair,
+    add_channel,
+    remove_channel,
+    apply_qubit_wiring_diff,
+)
@@ -19,6 +19,10 @@ from typing import Union
 # Class containing tools to help handling units and conversions.
 u = unit(coerce_to_integer=True)
 
+# Default durations in ns. These are plain integers because every `u.us` conversion
+# inspects the call stack to detect an open QUA program, which dominates large builds.
+DEFAULT_SATURATION_LENGTH = 20_000  # 20 us
+
 
 def add_DragGaussian_pulses(
     transmon: Union[FixedFrequencyTransmon, FluxTunableTransmon],
@@ -279,7 +283,7 @@ def add_default_transmon_pulses(transmon: Union[FixedFrequencyTransmon, FluxTuna
     if hasattr(transmon, "xy"):
         if transmon.xy is not None:
             transmon.xy.operations["saturation"] = SquarePulse(
-                amplitude=0.25, length=20 * u.us, axis_angle=0
+                amplitude=0.25, length=DEFAULT_SATURATION_LENGTH, axis_angle=0
             )
 
     if hasattr(transmon, "z"):
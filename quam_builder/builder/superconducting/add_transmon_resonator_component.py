@@ -1,4 +1,6 @@
 from typing import Dict
+
+from quam.core import QuamDict
 from quam_builder.builder.qop_connectivity.channel_ports import (
     iq_in_out_channel_ports,
     mw_in_out_channel_ports,
@@ -15,6 +17,14 @@ from quam_builder.architecture.superconducting.qubit import AnyTransmon
 
 u = unit(coerce_to_integer=True)
 
+# Plain integer instead of `1 * u.us`, which inspects the call stack on every call
+DEFAULT_DEPLETION_TIME = 1_000  # 1 us
+
+
+def _raw_value(ports: Dict[str, str], key: str):
+    """The value of a wiring port dict without resolving it as a reference."""
+    return ports.get_raw_value(key) if isinstance(ports, QuamDict) else ports[key]
+
 
 def add_transmon_resonator_component(
     transmon: AnyTransmon, wiring_path: str, ports: Dict[str, str]
@@ -31,7 +41,7 @@ def add_transmon_resonator_component(
     """
     digital_outputs = get_digital_outputs(wiring_path, ports)
 
-    depletion_time = 1 * u.us
+    depletion_time = DEFAULT_DEPLETION_TIME
     time_of_flight = 32  # 4ns above default so that it appears in state.json
 
     if all(key in ports for key in iq_in_out_channel_ports):
@@ -69,8 +79,12 @@ def add_transmon_resonator_component(
             RF_frequency=None,
             time_of_flight=time_of_flight,
         )
+        # The wiring holds the reference of the output port, which saves resolving it
+        output_reference = _raw_value(ports, "opx_output")
+        if not (isinstance(output_reference, str) and output_reference.startswith("#/ports/")):
+            output_reference = transmon.resonator.opx_output.get_reference()
         transmon.resonator.opx_input.downconverter_frequency = (
-            f"{transmon.resonator.opx_output.get_reference()}/upconverter_frequency"
+            f"{output_reference}/upconverter_frequency"
         )
 
     else:
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Union, Optional
+from typing import List, NamedTuple, Optional, Union
 from numpy import sqrt, ceil
 from quam.components import Octave, LocalOscillator, FrequencyConverter
 from quam_builder.architecture.superconducting.components.mixer import StandaloneMixer
@@ -31,6 +31,42 @@ from qualang_tools.wirer.connectivity.wiring_spec import WiringLineType
 from quam_builder.architecture.superconducting.qpu import AnyQuam
 
 
+class WiringReference(NamedTuple):
+    """A single wiring entry with its reference resolved to a plain string."""
+
+    element_type: str
+    element_id: str
+    line_type: str
+    key: str
+    reference: str
+
+
+def resolve_wiring_references(machine: AnyQuam) -> List[WiringReference]:
+    """Flattens the machine's wiring into a table of unreferenced values in a single pass.
+
+    The wiring stores references such as "#/ports/mw_outputs/con1/1/1" that are otherwise
+    looked up repeatedly by every build step. Resolving them once keeps the build linear in
+    the number of wiring entries.
+
+    Args:
+        machine (AnyQuam): The QuAM whose wiring is resolved.
+
+    Returns:
+        List[WiringReference]: One entry per wiring key whose value is a string.
+    """
+    table = []
+    for element_type, wiring_by_element in machine.wiring.items():
+        for element_id, wiring_by_line_type in wiring_by_element.items():
+            for line_type, references in wiring_by_line_type.items():
+                for key in references:
+                    reference = references.get_raw_value(key)
+                    if isinstance(reference, str):
+                        table.append(
+                            WiringReference(element_type, element_id, line_type, key, reference)
+                        )
+    return table
+
+
 def build_quam(machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]] = None) -> AnyQuam:
     """Builds the QuAM by adding various components and saving the machine configuration.
 
@@ -41,9 +77,14 @@ def build_quam(machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]]
     Returns:
         AnyQuam: The built QuAM.
     """
-    add_octaves(machine, calibration_db_path=calibration_db_path)
-    add_external_mixers(machine)
-    add_ports(machine)
+    wiring_references = resolve_wiring_references(machine)
+    add_octaves(
+        machine,
+        calibration_db_path=calibration_db_path,
+        wiring_references=wiring_references,
+    )
+    add_external_mixers(machine, wiring_references=wiring_references)
+    add_ports(machine, wiring_references=wiring_references)
     add_transmons(machine)
     add_pulses(machine)
     machine.save()
@@ -51,20 +92,24 @@ def build_quam(machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]]
     return machine
 
 
-def add_ports(machine: AnyQuam):
+def add_ports(machine: AnyQuam, wiring_references: Optional[List[WiringReference]] = None):
     """Creates and stores all input/output ports according to what has been allocated to each element in the machine's wiring.
 
+    Ports shared by several elements (e.g. a multiplexed readout line) are created once.
+
     Args:
         machine (AnyQuam): The QuAM to which the ports will be added.
+        wiring_references (Optional[List[WiringReference]]): The pre-resolved wiring, as
+            returned by `resolve_wiring_references`. Resolved from the machine if None.
     """
-    for wiring_by_element in machine.wiring.values():
-        for wiring_by_line_type in wiring_by_element.values():
-            for ports in wiring_by_line_type.values():
-                for port in ports:
-                    if "ports" in ports.get_unreferenced_value(port):
-                        machine.ports.reference_to_port(
-                            ports.get_unreferenced_value(port), create=True
-                        )
+    if wiring_references is None:
+        wiring_references = resolve_wiring_references(machine)
+
+    port_references = dict.fromkeys(
+        entry.reference for entry in wiring_references if "ports" in entry.reference
+    )
+    for port_reference in port_references:
+        machine.ports.reference_to_port(port_reference, create=True)
 
 
 def _set_default_grid_location(qubit_number: int, total_number_of_qubits: int) -> str:
@@ -181,13 +226,19 @@ def add_pulses(machine: AnyQuam):
 
 
 def add_octaves(
-    machine: AnyQuam, calibration_db_path: Optional[Union[Path, str]] = None
+    machine: AnyQuam,
+    calibration_db_path: Optional[Union[Path, str]] = None,
+    wiring_references: Optional[List[WiringReference]] = None,
 ) -> AnyQuam:
     """Adds octave components to the machine based on the wiring configuration and initializes their frequency converters.
 
+    Each octave is created once, however many wiring entries refer to it.
+
     Args:
         machine (AnyQuam): The QuAM to which the octaves will be added.
         calibration_db_path (Optional[Union[Path, str]]): The path to the calibration database.
+        wiring_references (Optional[List[WiringReference]]): The pre-resolved wiring, as
+            returned by `resolve_wiring_references`. Resolved from the machine if None.
 
     Returns:
         AnyQuam: The QuAM with the added octaves.
@@ -199,47 +250,52 @@ def add_octaves(
     if isinstance(calibration_db_path, str):
         calibration_db_path = Path(calibration_db_path)
 
-    for wiring_by_element in machine.wiring.values():
-        for qubit, wiring_by_line_type in wiring_by_element.items():
-            for line_type, references in wiring_by_line_type.items():
-                for reference in references:
-                    if "octaves" in references.get_unreferenced_value(reference):
-                        octave_name = references.get_unreferenced_value(reference).split("/")[2]
-                        octave = Octave(
-                            name=octave_name,
-                            calibration_db_path=str(calibration_db_path),
-                        )
-                        machine.octaves[octave_name] = octave
-                        octave.initialize_frequency_converters()
+    if wiring_references is None:
+        wiring_references = resolve_wiring_references(machine)
+
+    octave_names = dict.fromkeys(
+        entry.reference.split("/")[2] for entry in wiring_references if "octaves" in entry.reference
+    )
+    for octave_name in octave_names:
+        octave = Octave(
+            name=octave_name,
+            calibration_db_path=str(calibration_db_path),
+        )
+        machine.octaves[octave_name] = octave
+        octave.initialize_frequency_converters()
 
     return machine
 
 
-def add_external_mixers(machine: AnyQuam) -> AnyQuam:
+def add_external_mixers(
+    machine: AnyQuam, wiring_references: Optional[List[WiringReference]] = None
+) -> AnyQuam:
     """Adds external mixers to the machine based on the wiring configuration.
 
     Args:
         machine (AnyQuam): The QuAM to which the external mixers will be added.
+        wiring_references (Optional[List[WiringReference]]): The pre-resolved wiring, as
+            returned by `resolve_wiring_references`. Resolved from the machine if None.
 
     Returns:
         AnyQuam: The QuAM with the added external mixers.
     """
-    for wiring_by_element in machine.wiring.values():
-        for qubit, wiring_by_line_type in wiring_by_element.items():
-            for line_type, references in wiring_by_line_type.items():
-                for reference in references:
-                    if "mixers" in references.get_unreferenced_value(reference):
-                        mixer_name = references.get_unreferenced_value(reference).split("/")[2]
-                        transmon_channel = {
-                            WiringLineType.DRIVE.value: "xy",
-                            WiringLineType.RESONATOR.value: "resonator",
-                        }
-                        frequency_converter = FrequencyConverter(
-                            local_oscillator=LocalOscillator(),
-                            mixer=StandaloneMixer(
-                                intermediate_frequency=f"#/qubits/{qubit}/{transmon_channel[line_type]}/intermediate_frequency",
-                            ),
-                        )
-                        machine.mixers[mixer_name] = frequency_converter
+    if wiring_references is None:
+        wiring_references = resolve_wiring_references(machine)
+
+    transmon_channel = {
+        WiringLineType.DRIVE.value: "xy",
+        WiringLineType.RESONATOR.value: "resonator",
+    }
+    for entry in wiring_references:
+        if "mixers" in entry.reference:
+            mixer_name = entry.reference.split("/")[2]
+            frequency_converter = FrequencyConverter(
+                local_oscillator=LocalOscillator(),
+                mixer=StandaloneMixer(
+                    intermediate_frequency=f"#/qubits/{entry.element_id}/{transmon_channel[entry.line_type]}/intermediate_frequency",
+                ),
+            )
+            machine.mixers[mixer_name] = frequency_converter
 
     return machine
@@ -15,6 +15,7 @@ Example::
 
     from quam_builder.builder.superconducting.modify_quam import (
         add_qubit, remove_qubit, add_channel, remove_channel,
+        add_qubit_pair, remove_qubit_pair,
     )
 
     add_qubit(
@@ -29,12 +30,13 @@ Example::
 
     add_channel(machine, "q5", "z", {"opx_output": "#/ports/analog_outputs/con1/3/1"})
 
+    add_qubit_pair(machine, "q4", "q5")
+    remove_qubit_pair(machine, "q4-q5")
     remove_qubit(machine, "q5")
 """
 
 from pathlib import Path
 
-from qualang_tools.units import unit
 from qualang_tools.wirer.connectivity.wiring_spec import WiringLineType
 from quam.components import FrequencyConverter, LocalOscillator, Octave
 from quam.components.pulses import SquarePulse, SquareReadoutPulse
@@ -43,12 +45,24 @@ from quam.core.quam_classes import QuamDict
 from quam_builder.architecture.superconducting.components.mixer import StandaloneMixer
 from quam_builder.architecture.superconducting.qpu import AnyQuam
 from quam_builder.architecture.superconducting.qubit import AnyTransmon
+from quam_builder.architecture.superconducting.qubit_pair import AnyTransmonPair
 from quam_builder.builder.qop_connectivity.channel_ports import (
     iq_in_out_channel_ports,
     iq_out_channel_ports,
     mw_in_out_channel_ports,
     mw_out_channel_ports,
 )
+from quam_builder.builder.qop_connectivity.reference_index import (
+    WiringLine,
+    get_reference_index,
+    port_references,
+)
+from quam_builder.builder.qop_connectivity.wiring_diff import (
+    WiringDiff,
+    apply_wiring_diff,
+    remove_unreferenced_ports,
+)
+from quam_builder.builder.superconducting.add_default_pulses import DEFAULT_SATURATION_LENGTH
 from quam_builder.builder.superconducting.add_transmon_drive_component import (
     add_transmon_drive_component,
 )
@@ -59,9 +73,17 @@ from quam_builder.builder.superconducting.add_transmon_resonator_component impor
     add_transmon_resonator_component,
 )
 
-__all__ = ["add_qubit", "remove_qubit", "add_channel", "remove_channel"]
-
-_u = unit(coerce_to_integer=True)
+__all__ = [
+    "add_qubit",
+    "remove_qubit",
+    "add_qubits",
+    "remove_qubits",
+    "add_qubit_pair",
+    "remove_qubit_pair",
+    "add_channel",
+    "remove_channel",
+    "apply_qubit_wiring_diff",
+]
 
 _LINE_TYPE_TO_ADDER = {
     WiringLineType.DRIVE.value: add_transmon_drive_component,
@@ -96,6 +118,17 @@ def _port_reference_values(ports: dict[str, str]):
         yield ref
 
 
+def _raw_ports(ports: dict[str, str]) -> dict[str, str]:
+    return dict(zip(ports, _port_reference_values(ports)))
+
+
+def _raw_wiring_line(machine: AnyQuam, line: WiringLine) -> dict[str, str] | None:
+    """The raw port dict of a wiring line of the machine, or None if it is not wired."""
+    element_type, element_id, line_type = line
+    ports = machine.wiring.get(element_type, {}).get(element_id, {}).get(line_type)
+    return None if ports is None else _raw_ports(ports)
+
+
 def _calibration_db_path(machine: AnyQuam, calibration_db_path: Path | str | None) -> Path:
     if calibration_db_path is None:
         calibration_db_path = machine.get_serialiser()._get_state_path().parent
@@ -187,7 +220,7 @@ def _seed_default_pulses_for_line(transmon: AnyTransmon, line_type: str) -> None
     if field_name == "xy":
         if "saturation" not in channel.operations:
             channel.operations["saturation"] = SquarePulse(
-                amplitude=0.25, length=20 * _u.us, axis_angle=0
+                amplitude=0.25, length=DEFAULT_SATURATION_LENGTH, axis_angle=0
             )
     elif field_name == "z":
         if "const" not in channel.operations:
@@ -216,29 +249,29 @@ def _wire_qubit_channels(
         _LINE_TYPE_TO_ADDER[line_type](transmon, wiring_path, ports)
 
 
+def _has_channel(transmon: AnyTransmon, line_type: str) -> bool:
+    field_name = _LINE_TYPE_TO_FIELD.get(line_type)
+    return field_name is not None and getattr(transmon, field_name, None) is not None
+
+
 def _get_referencing_qubit_pair_ids(machine: AnyQuam, qubit_id: str) -> list[str]:
     """Pair ids that reference ``qubit_id`` in ``machine.qubit_pairs`` or wiring."""
-    found: set[str] = set()
+    return get_reference_index(machine).qubit_pair_ids(qubit_id)
 
-    for pair_id, pair in machine.qubit_pairs.items():
-        for ref in (pair.qubit_control, pair.qubit_target):
-            if ref is None:
-                continue
-            if isinstance(ref, str):
-                name = ref.rstrip("/").split("/")[-1]
-            else:
-                name = ref.name
-            if name == qubit_id:
-                found.add(pair_id)
-                break
 
-    for pair_id in machine.wiring.get("qubit_pairs", {}):
-        qc, qt = pair_id.split("-", 1)
-        qt = qt if str(qt).startswith("q") else f"q{qt}"
-        if qubit_id in (qc, qt):
-            found.add(pair_id)
+def _set_qubit_wiring(machine: AnyQuam, qubit_id: str, qubit_wiring) -> None:
+    """Replace the wiring of a qubit, or remove it if ``qubit_wiring`` is None."""
+    wiring_by_qubit = machine.wiring.get("qubits")
+    old = wiring_by_qubit.get(qubit_id) if wiring_by_qubit is not None else None
+    get_reference_index(machine).update_wiring_element("qubits", qubit_id, old, qubit_wiring)
 
-    return sorted(found)
+    if qubit_wiring is None:
+        if old is not None:
+            del wiring_by_qubit[qubit_id]
+        return
+    if wiring_by_qubit is None:
+        machine.wiring["qubits"] = {}
+    machine.wiring["qubits"][qubit_id] = qubit_wiring
 
 
 def add_qubit(
@@ -275,38 +308,89 @@ def add_qubit(
         KeyError: If a qubit with ``qubit_id`` already exists.
         ValueError: If wiring is invalid.
     """
-    if qubit_id in machine.qubits:
-        raise KeyError(f"Qubit '{qubit_id}' already exists")
+    return add_qubits(
+        machine,
+        [qubit_id],
+        wirings=None if wiring is None else [wiring],
+        add_default_pulses=add_default_pulses,
+        calibration_db_path=calibration_db_path,
+    )[0]
 
-    qubit_wiring = (
-        wiring if wiring is not None else machine.wiring.get("qubits", {}).get(qubit_id, {})
-    )
-    _validate_qubit_wiring(qubit_wiring)
 
-    try:
-        transmon = machine.qubit_type(id=qubit_id)
-    except AttributeError as e:
+def add_qubits(
+    machine: AnyQuam,
+    qubit_ids: list[str],
+    wirings: list[dict[str, dict[str, str]] | None] | None = None,
+    add_default_pulses: bool = True,
+    calibration_db_path: Path | str | None = None,
+) -> list[AnyTransmon]:
+    """Add several qubits to an existing machine in one pass.
+
+    Equivalent to calling ``add_qubit`` for each qubit, except that all qubits are
+    validated before the machine is changed, so that invalid input raises without
+    adding any of them.
+
+    Args:
+        machine: The QUAM machine instance.
+        qubit_ids: Names of the new qubits.
+        wirings: The wiring of each qubit, see ``add_qubit``. If ``None``, or for
+            ``None`` entries, the wiring must already exist in
+            ``machine.wiring["qubits"]``.
+        add_default_pulses: Seed default pulse operations on the new channels only.
+        calibration_db_path: Path to the Octave calibration database. Defaults to
+            the machine state directory.
+
+    Returns:
+        The newly created qubits, in the order of ``qubit_ids``.
+
+    Raises:
+        KeyError: If a qubit already exists or is given twice.
+        ValueError: If a wiring is invalid or ``wirings`` does not match ``qubit_ids``.
+    """
+    if wirings is None:
+        wirings = [None] * len(qubit_ids)
+    if len(wirings) != len(qubit_ids):
+        raise ValueError("wirings must contain one entry per qubit id")
+    if len(set(qubit_ids)) != len(qubit_ids):
+        raise KeyError(f"Duplicate qubit ids: {qubit_ids}")
+
+    existing_wiring = machine.wiring.get("qubits", {})
+    qubit_wirings = []
+    for qubit_id, wiring in zip(qubit_ids, wirings):
+        if qubit_id in machine.qubits:
+            raise KeyError(f"Qubit '{qubit_id}' already exists")
+        qubit_wiring = wiring if wiring is not None else existing_wiring.get(qubit_id, {})
+        _validate_qubit_wiring(qubit_wiring)
+        qubit_wirings.append(qubit_wiring)
+
+    if not hasattr(machine, "qubit_type"):
         raise TypeError(
             f"{type(machine).__name__} does not define qubit_type. "
             "Use FixedFrequencyQuam or FluxTunableQuam."
-        ) from e
+        )
 
-    if wiring is not None:
-        machine.wiring.setdefault("qubits", {})
-        machine.wiring["qubits"][qubit_id] = wiring
+    active_qubit_names = set(machine.active_qubit_names)
+    transmons = []
+    for qubit_id, wiring, qubit_wiring in zip(qubit_ids, wirings, qubit_wirings):
+        transmon = machine.qubit_type(id=qubit_id)
 
-    machine.qubits[qubit_id] = transmon
+        if wiring is not None:
+            _set_qubit_wiring(machine, qubit_id, wiring)
 
-    _wire_qubit_channels(machine, transmon, qubit_id, qubit_wiring, calibration_db_path)
+        machine.qubits[qubit_id] = transmon
 
-    if add_default_pulses:
-        for line_type in qubit_wiring:
-            _seed_default_pulses_for_line(transmon, line_type)
+        _wire_qubit_channels(machine, transmon, qubit_id, qubit_wiring, calibration_db_path)
+
+        if add_default_pulses:
+            for line_type in qubit_wiring:
+                _seed_default_pulses_for_line(transmon, line_type)
 
-    if qubit_id not in machine.active_qubit_names:
-        machine.active_qubit_names.append(transmon.name)
+        if transmon.name not in active_qubit_names:
+            machine.active_qubit_names.append(transmon.name)
+            active_qubit_names.add(transmon.name)
+        transmons.append(transmon)
 
-    return transmon
+    return transmons
 
 
 def remove_qubit(machine: AnyQuam, qubit_id: str) -> AnyTransmon:
@@ -327,27 +411,123 @@ def remove_qubit(machine: AnyQuam, qubit_id: str) -> AnyTransmon:
         KeyError: If no qubit with ``qubit_id`` exists.
         ValueError: If the qubit participates in one or more qubit pairs.
     """
-    if qubit_id not in machine.qubits:
-        raise KeyError(f"Qubit '{qubit_id}' not found")
+    return remove_qubits(machine, [qubit_id])[0]
 
-    pairs = _get_referencing_qubit_pair_ids(machine, qubit_id)
-    if pairs:
-        pair_list = ", ".join(pairs)
-        raise ValueError(
-            f"Cannot remove qubit '{qubit_id}': referenced by qubit pair(s): {pair_list}. "
-            "Remove the qubit pair(s) first."
-        )
 
-    transmon = machine.qubits.pop(qubit_id)
-    transmon.parent = None
+def remove_qubits(machine: AnyQuam, qubit_ids: list[str]) -> list[AnyTransmon]:
+    """Remove several qubits and their channels from the machine in one pass.
+
+    Equivalent to calling ``remove_qubit`` for each qubit, except that all qubits
+    are checked before the machine is changed, and ``active_qubit_names`` is
+    rewritten once.
+
+    Args:
+        machine: The QUAM machine instance.
+        qubit_ids: The ids of the qubits to remove.
+
+    Returns:
+        The detached qubit objects, in the order of ``qubit_ids``.
+
+    Raises:
+        KeyError: If a qubit does not exist.
+        ValueError: If a qubit participates in one or more qubit pairs.
+    """
+    if len(set(qubit_ids)) != len(qubit_ids):
+        raise KeyError(f"Duplicate qubit ids: {qubit_ids}")
+    for qubit_id in qubit_ids:
+        if qubit_id not in machine.qubits:
+            raise KeyError(f"Qubit '{qubit_id}' not found")
+
+        pairs = _get_referencing_qubit_pair_ids(machine, qubit_id)
+        if pairs:
+            pair_list = ", ".join(pairs)
+            raise ValueError(
+                f"Cannot remove qubit '{qubit_id}': referenced by qubit pair(s): {pair_list}. "
+                "Remove the qubit pair(s) first."
+            )
+
+    transmons = []
+    for qubit_id in qubit_ids:
+        transmon = machine.qubits.pop(qubit_id)
+        transmon.parent = None
+        _set_qubit_wiring(machine, qubit_id, None)
+        transmons.append(transmon)
+
+    removed_names = {transmon.name for transmon in transmons}
+    if removed_names.intersection(machine.active_qubit_names):
+        machine.active_qubit_names = [
+            name for name in machine.active_qubit_names if name not in removed_names
+        ]
+
+    return transmons
+
 
-    if transmon.name in machine.active_qubit_names:
-        machine.active_qubit_names.remove(transmon.name)
+def add_qubit_pair(
+    machine: AnyQuam,
+    qubit_control: str,
+    qubit_target: str,
+    qubit_pair_id: str | None = None,
+) -> AnyTransmonPair:
+    """Add a qubit pair of two existing qubits to the machine.
+
+    Args:
+        machine: The QUAM machine instance.
+        qubit_control: The id of the control qubit.
+        qubit_target: The id of the target qubit.
+        qubit_pair_id: Name for the qubit pair. Defaults to
+            ``"<qubit_control>-<qubit_target>"``.
+
+    Returns:
+        The new qubit pair, also added to ``active_qubit_pair_names``.
+
+    Raises:
+        KeyError: If a qubit does not exist or the qubit pair already exists.
+    """
+    if qubit_pair_id is None:
+        qubit_pair_id = f"{qubit_control}-{qubit_target}"
+    for qubit_id in (qubit_control, qubit_target):
+        if qubit_id not in machine.qubits:
+            raise KeyError(f"Qubit '{qubit_id}' not found")
+    if qubit_pair_id in machine.qubit_pairs:
+        raise KeyError(f"Qubit pair '{qubit_pair_id}' already exists")
+
+    qubit_pair = machine.qubit_pair_type(
+        id=qubit_pair_id,
+        qubit_control=f"#/qubits/{qubit_control}",
+        qubit_target=f"#/qubits/{qubit_target}",
+    )
+    machine.qubit_pairs[qubit_pair_id] = qubit_pair
+    get_reference_index(machine).add_qubit_pair(qubit_pair_id, [qubit_control, qubit_target])
+    if qubit_pair.name not in machine.active_qubit_pair_names:
+        machine.active_qubit_pair_names.append(qubit_pair.name)
+    return qubit_pair
+
+
+def remove_qubit_pair(machine: AnyQuam, qubit_pair_id: str) -> AnyTransmonPair:
+    """Remove a qubit pair from the machine.
+
+    The pair is removed from ``machine.qubit_pairs`` and ``active_qubit_pair_names``.
+    Its wiring, if any, is left as is.
 
-    if "qubits" in machine.wiring and qubit_id in machine.wiring["qubits"]:
-        del machine.wiring["qubits"][qubit_id]
+    Args:
+        machine: The QUAM machine instance.
+        qubit_pair_id: The id of the qubit pair to remove.
+
+    Returns:
+        The detached qubit pair.
+
+    Raises:
+        KeyError: If no qubit pair with ``qubit_pair_id`` exists.
+    """
+    if qubit_pair_id not in machine.qubit_pairs:
+        raise KeyError(f"Qubit pair '{qubit_pair_id}' not found")
 
-    return transmon
+    qubit_pair = machine.qubit_pairs.pop(qubit_pair_id)
+    qubit_pair.parent = None
+    get_reference_index(machine).remove_qubit_pair(qubit_pair_id)
+    if qubit_pair.name in machine.active_qubit_pair_names:
+        machine.active_qubit_pair_names.remove(qubit_pair.name)
+    return qubit_pair
 
 
 def add_channel(
@@ -391,7 +571,14 @@ def add_channel(
 
     machine.wiring.setdefault("qubits", {})
     machine.wiring["qubits"].setdefault(qubit_id, {})
-    machine.wiring["qubits"][qubit_id][line_type] = ports
+    qubit_wiring = machine.wiring["qubits"][qubit_id]
+    index = get_reference_index(machine)
+    if line_type in qubit_wiring:
+        index.remove_wiring_line(
+            ("qubits", qubit_id, line_type), _raw_ports(qubit_wiring[line_type])
+        )
+    qubit_wiring[line_type] = ports
+    index.add_wiring_line(("qubits", qubit_id, line_type), ports)
 
     wiring_path = f"#/wiring/qubits/{qubit_id}/{line_type}"
     _create_line_refs(machine, ports, qubit_id, line_type, calibration_db_path)
@@ -433,4 +620,101 @@ def remove_channel(machine: AnyQuam, qubit_id: str, line_type: str) -> None:
     if "qubits" in machine.wiring:
         qubit_wiring = machine.wiring["qubits"].get(qubit_id, {})
         if line_type in qubit_wiring:
+            get_reference_index(machine).remove_wiring_line(
+                ("qubits", qubit_id, line_type), _raw_ports(qubit_wiring[line_type])
+            )
             del qubit_wiring[line_type]
+
+
+def apply_qubit_wiring_diff(
+    machine: AnyQuam,
+    diff: WiringDiff,
+    add_default_pulses: bool = True,
+    calibration_db_path: Path | str | None = None,
+) -> None:
+    """Apply a wiring diff to an already built machine, updating only the affected qubits.
+
+    Qubit lines are updated through ``remove_channel`` and ``add_channel``, so that
+    the channels of all other qubits are left untouched. Qubits that only appear in
+    the new wiring are added with ``add_qubit``, and qubits whose lines were all
+    removed are removed with ``remove_qubit``. The remaining wiring lines (e.g. of
+    qubit pairs) are then updated with ``wiring_diff.apply_wiring_diff``, and ports
+    that are no longer wired are removed.
+
+    Example::
+
+        diff = diff_wiring(machine.wiring, create_wiring(connectivity))
+        apply_qubit_wiring_diff(machine, diff)
+
+    Args:
+        machine: The QUAM machine instance.
+        diff: The differences, as returned by ``wiring_diff.diff_wiring``.
+        add_default_pulses: Seed default pulse operations on new channels.
+        calibration_db_path: Path to the Octave calibration database. Defaults to
+            the machine state directory.
+
+    Raises:
+        ValueError: If a removed qubit participates in a qubit pair.
+    """
+    new_qubits: dict[str, dict[str, dict[str, str]]] = {}
+
+    for element_type, qubit_id, line_type in diff.removed:
+        if element_type != "qubits" or qubit_id not in machine.qubits:
+            continue
+        if _has_channel(machine.qubits[qubit_id], line_type):
+            remove_channel(machine, qubit_id, line_type)
+        if not machine.wiring.get("qubits", {}).get(qubit_id):
+            remove_qubit(machine, qubit_id)
+
+    for (element_type, qubit_id, line_type), ports in diff.new_lines().items():
+        if element_type != "qubits":
+            continue
+        if qubit_id not in machine.qubits:
+            new_qubits.setdefault(qubit_id, {})[line_type] = ports
+            continue
+        if _has_channel(machine.qubits[qubit_id], line_type):
+            remove_channel(machine, qubit_id, line_type)
+        add_channel(
+            machine,
+            qubit_id,
+            line_type,
+            ports,
+            add_default_pulses=add_default_pulses,
+            calibration_db_path=calibration_db_path,
+        )
+
+    for qubit_id, qubit_wiring in new_qubits.items():
+        add_qubit(
+            machine,
+            qubit_id,
+            qubit_wiring,
+            add_default_pulses=add_default_pulses,
+            calibration_db_path=calibration_db_path,
+        )
+
+    # Only apply the lines that the qubit updates above did not already bring in line
+    remaining = WiringDiff(
+        added={
+            line: ports
+            for line, ports in diff.added.items()
+            if _raw_wiring_line(machine, line) != ports
+        },
+        removed={
+            line: ports
+            for line, ports in diff.removed.items()
+            if _raw_wiring_line(machine, line) is not None
+        },
+        changed={
+            line: (old_ports, new_ports)
+            for line, (old_ports, new_ports) in diff.changed.items()
+            if _raw_wiring_line(machine, line) != new_ports
+        },
+    )
+    apply_wiring_diff(machine, remaining)
+
+    stale_references = [
+        reference
+        for ports in [*diff.removed.values(), *(old for old, _ in diff.changed.values())]
+        for reference in port_references(ports)
+    ]
+    remove_unreferenced_ports(machine, stale_references)
@@ -1,9 +1,16 @@
+from abc import abstractmethod
+from typing import Any, Dict
+
 import numpy as np
 
 from quam.core import quam_dataclass
 from quam.components.pulses import Pulse, ReadoutPulse
+from quam.utils import string_reference as str_ref
+
+from quam_builder.tools.waveform_cache import cached_waveform
 
 __all__ = [
+    "FlatTopPulse",
     "GaussianPulse",
     "FlatTopGaussianPulse",
     "FlatTopCosinePulse",
@@ -12,6 +19,219 @@ __all__ = [
 ]
 
 
+# Gaussian filters whose kernel has at least this many samples, and whose direct
+# convolution takes at least FFT_FILTER_MIN_WORK multiply-adds, use an FFT convolution
+FFT_FILTER_MIN_KERNEL_SAMPLES = 192
+FFT_FILTER_MIN_WORK = 1_000_000
+
+
+def gaussian_filter_envelope(envelope: np.ndarray, sigma: float) -> np.ndarray:
+    """Apply ``scipy.ndimage.gaussian_filter1d(envelope, sigma)`` to a pulse envelope.
+
+    Small kernels are convolved directly by scipy. For long envelopes with a wide
+    kernel (small filter frequencies), the same truncated Gaussian kernel and
+    ``"reflect"`` boundary handling are applied with an FFT convolution, which scales
+    with ``N log N`` instead of ``N * sigma``. Both paths compute the same convolution;
+    the FFT path only adds floating-point round-off, below ``1e-12 * max(abs(envelope))``.
+
+    Measured crossover (1 GS/s, ``benchmarks/gaussian_filter_crossover.py``): the FFT
+    path is ~9x faster for 10k samples at 1 MHz (sigma = 159 samples), ~2x faster at
+    5 MHz (sigma = 32), on par at 7 MHz (sigma = 23), and slower for smaller sigma.
+    """
+    from scipy.ndimage import gaussian_filter1d
+
+    radius = int(4.0 * sigma + 0.5)  # Same truncation as gaussian_filter1d
+    kernel_size = 2 * radius + 1
+    if kernel_size < FFT_FILTER_MIN_KERNEL_SAMPLES or (
+        len(envelope) * kernel_size < FFT_FILTER_MIN_WORK
+    ):
+        return gaussian_filter1d(envelope, sigma=sigma)
+
+    from scipy.signal import fftconvolve
+
+    x = np.arange(-radius, radius + 1) / sigma
+    kernel = np.exp(-0.5 * x**2)
+    kernel /= kernel.sum()
+    # np.pad "symmetric" mirrors like the "reflect" mode of scipy.ndimage
+    padded = np.pad(envelope, radius, mode="symmetric")
+    return fftconvolve(padded, kernel, mode="valid")
+
+
+@quam_dataclass
+class FlatTopPulse(Pulse):
+    """Base class for pulses made of a rise, a constant plateau and a fall.
+
+    Subclasses implement ``flat_top_envelope``, which returns the real envelope of either
+    the full waveform or only its rise or fall.
+
+    With ``split_flat_top=True`` the pulse is compiled into three operations instead of
+    a single arbitrary waveform: ``<name>.rise`` and ``<name>.fall`` hold the rise and
+    fall samples, and ``<name>`` itself becomes a constant pulse of ``flat_length``
+    samples. The waveform memory of the pulse then no longer depends on the plateau
+    length, and ``play(duration=...)`` sets the plateau duration in real time, so that
+    sweeping it does not require a new config. A split pulse must be played through
+    ``pulse.play()``; ``channel.play(name)`` only plays the plateau.
+
+    Args:
+        split_flat_top (bool): Whether to compile the pulse into rise, plateau and fall
+            operations. Requires the rise/fall length and ``flat_length`` to be
+            multiples of 4 and at least 16 samples. Default is False.
+    """
+
+    split_flat_top: bool = False
+
+    @property
+    def rise_fall_length(self) -> int:
+        return (self.length - self.flat_length) // 2
+
+    @abstractmethod
+    def flat_top_envelope(self, rise_fall_length: int, return_part: str = "all"):
+        """Return the real envelope, or only its ``"rise"`` or ``"fall"`` part.
+
+        Must be implemented by subclasses.
+        """
+
+    def flat_top_waveform(self, return_part: str = "all") -> np.ndarray:
+        """Return the waveform, or only its ``"rise"`` or ``"fall"`` part.
+
+        Raises:
+            ValueError: If ``length`` is not ``flat_length + 2 * rise_fall_length``, i.e.
+                if ``length - flat_length`` is odd or negative.
+        """
+        rise_fall_length = self.rise_fall_length
+        if rise_fall_length < 0 or self.flat_length + 2 * rise_fall_length != self.length:
+            raise ValueError(
+                f"{type(self).__name__} requires (length - flat_length) to be even and "
+                f"non-negative ({self.length=} {self.flat_length=})"
+            )
+
+        waveform = np.array(self.flat_top_envelope(rise_fall_length, return_part))
+        if self.axis_angle is not None:
+            waveform = waveform * np.exp(1j * self.axis_angle)
+        return waveform
+
+    def waveform_function(self):
+        if not self.split_flat_top:
+            return self.flat_top_waveform("all")
+        if self.axis_angle is not None:
+            return complex(self.amplitude * np.exp(1j * self.axis_angle))
+        return float(self.amplitude)
+
+    @property
+    def _operation_name(self) -> str:
+        if self.id is not None:
+            return self.id
+        if self.parent is not None:
+            return self.parent.get_attr_name(self)
+        raise ValueError(f"Cannot determine name of pulse '{self}'")
+
+    def _validate_split(self) -> None:
+        for label, length in (
+            ("rise/fall length", self.rise_fall_length),
+            ("flat_length", self.flat_length),
+        ):
+            if length < 16 or length % 4 != 0:
+                raise ValueError(
+                    f"{type(self).__name__} with split_flat_top=True requires the {label} "
+                    f"to be a multiple of 4 and at least 16 samples, got {length}"
+                )
+
+    def _config_add_pulse(self, config: Dict[str, Any]):
+        super()._config_add_pulse(config)
+        if self.split_flat_top:
+            self._validate_split()
+            config["pulses"][self.pulse_name]["length"] = self.flat_length
+
+    def apply_to_config(self, config: Dict[str, Any]) -> None:
+        super().apply_to_config(config)
+        if self.channel is None or not self.split_flat_top:
+            return
+
+        from quam.components.channels import IQChannel, MWChannel
+
+        main_pulse_config = config["pulses"][self.pulse_name]
+        element_operations = config["elements"][self.channel.name]["operations"]
+        for part in ("rise", "fall"):
+            waveform = np.asarray(self.flat_top_waveform(part))
+            waveform_name = f"{self.name}{str_ref.DELIMITER}{part}{str_ref.DELIMITER}wf"
+            if np.iscomplexobj(waveform):
+                samples = {"I": waveform.real, "Q": waveform.imag}
+            elif isinstance(self.channel, (IQChannel, MWChannel)):
+                samples = {"I": waveform, "Q": 0.0}
+            else:
+                samples = {"single": waveform}
+
+            pulse_config = {"operation": self.operation, "length": len(waveform), "waveforms": {}}
+            if "digital_marker" in main_pulse_config:
+                pulse_config["digital_marker"] = main_pulse_config["digital_marker"]
+            for suffix, value in samples.items():
+                name = waveform_name if suffix == "single" else f"{waveform_name}.{suffix}"
+                if isinstance(value, float):
+                    config["waveforms"][name] = {"type": "constant", "sample": value}
+                else:
+                    config["waveforms"][name] = {"type": "arbitrary", "samples": value.tolist()}
+                pulse_config["waveforms"][suffix] = name
+
+            pulse_name = f"{self.name}{str_ref.DELIMITER}{part}{str_ref.DELIMITER}pulse"
+            config["pulses"][pulse_name] = pulse_config
+            element_operations[f"{self._operation_name}{str_ref.DELIMITER}{part}"] = pulse_name
+
+    def play(
+        self,
+        amplitude_scale=None,
+        duration=None,
+        condition=None,
+        chirp=None,
+        truncate=None,
+        timestamp_stream=None,
+        continue_chirp: bool = False,
+        target: str = "",
+        validate: bool = True,
+    ) -> None:
+        """Play the pulse on its channel, see ``Pulse.play``.
+
+        If ``split_flat_top`` is set, the rise, plateau and fall operations are played
+        back to back and ``duration`` sets the plateau duration in clock cycles (4ns)
+        instead of stretching the whole pulse.
+        """
+        if not self.split_flat_top:
+            return super().play(
+                amplitude_scale=amplitude_scale,
+                duration=duration,
+                condition=condition,
+                chirp=chirp,
+                truncate=truncate,
+                timestamp_stream=timestamp_stream,
+                continue_chirp=continue_chirp,
+                target=target,
+                validate=validate,
+            )
+
+        if chirp is not None or truncate is not None:
+            raise ValueError(
+                f"{type(self).__name__} does not support chirp or truncate with split_flat_top=True"
+            )
+        name = self._operation_name
+        if self.channel is None:
+            raise ValueError(f"Pulse '{name}' is not attached to a channel")
+
+        for operation, operation_duration in (
+            (f"{name}{str_ref.DELIMITER}rise", None),
+            (name, duration),
+            (f"{name}{str_ref.DELIMITER}fall", None),
+        ):
+            self.channel.play(
+                pulse_name=operation,
+                amplitude_scale=amplitude_scale,
+                duration=operation_duration,
+                condition=condition,
+                timestamp_stream=timestamp_stream,
+                target=target,
+                validate=validate and operation == name,
+            )
+            timestamp_stream = None  # Only timestamp the start of the pulse
+
+
 @quam_dataclass
 class GaussianPulse(Pulse):
     """Gaussian pulse QUAM component.
@@ -51,7 +271,7 @@ class GaussianPulse(Pulse):
 
 
 @quam_dataclass
-class FlatTopGaussianPulse(Pulse):
+class FlatTopGaussianPulse(FlatTopPulse):
     """Gaussian pulse with flat top QUAM component.
 
     Args:
@@ -64,39 +284,27 @@ class FlatTopGaussianPulse(Pulse):
         flat_length (int): The length of the pulse's flat top in samples.
             The rise and fall lengths are calculated from the total length and the
             flat length.
+        split_flat_top (bool): Whether to compile the pulse into rise, plateau and
+            fall operations, see ``FlatTopPulse``.
     """
 
     amplitude: float
     axis_angle: float = None
     flat_length: int
 
-    def waveform_function(self):
+    def flat_top_envelope(self, rise_fall_length: int, return_part: str = "all"):
         from qualang_tools.config.waveform_tools import flattop_gaussian_waveform
 
-        rise_fall_length = (self.length - self.flat_length) // 2
-        if not self.flat_length + 2 * rise_fall_length == self.length:
-            raise ValueError(
-                "FlatTopGaussianPulse rise_fall_length (=length-flat_length) must be"
-                f" a multiple of 2 ({self.length} - {self.flat_length} ="
-                f" {self.length - self.flat_length})"
-            )
-
-        waveform = flattop_gaussian_waveform(
+        return flattop_gaussian_waveform(
             amplitude=self.amplitude,
             flat_length=self.flat_length,
             rise_fall_length=rise_fall_length,
-            return_part="all",
+            return_part=return_part,
         )
-        waveform = np.array(waveform)
-
-        if self.axis_angle is not None:
-            waveform = waveform * np.exp(1j * self.axis_angle)
-
-        return waveform
 
 
 @quam_dataclass
-class FlatTopCosinePulse(Pulse):
+class FlatTopCosinePulse(FlatTopPulse):
     """Cosine rise/fall, flat-top pulse.
 
     Args:
@@ -107,32 +315,23 @@ class FlatTopCosinePulse(Pulse):
             If None (default), the pulse is meant for a single channel or the I port
                 of an IQ channel.
             If not None, the pulse is meant for an IQ channel (0 is X, pi/2 is Y).
+        split_flat_top (bool): Whether to compile the pulse into rise, plateau and
+            fall operations, see ``FlatTopPulse``.
     """
 
     amplitude: float
     axis_angle: float = None
     flat_length: int = 0
 
-    def waveform_function(self):
+    def flat_top_envelope(self, rise_fall_length: int, return_part: str = "all"):
         from qualang_tools.config.waveform_tools import flattop_cosine_waveform
 
-        rise_fall_length = (self.length - self.flat_length) // 2
-        if self.flat_length + 2 * rise_fall_length != self.length:
-            raise ValueError(
-                "FlatTopCosinePulse requires (length - flat_length) to be even "
-                f"({self.length=} {self.flat_length=})"
-            )
-
-        wf = flattop_cosine_waveform(
+        return flattop_cosine_waveform(
             amplitude=self.amplitude,
             flat_length=self.flat_length,
             rise_fall_length=rise_fall_length,
-            return_part="all",
+            return_part=return_part,
         )
-        wf = np.array(wf)
-        if self.axis_angle is not None:
-            wf = wf * np.exp(1j * self.axis_angle)
-        return wf
 
 
 @quam_dataclass
@@ -192,6 +391,7 @@ class GaussianFilteredSquarePulse(Pulse):
     def inferred_length(self) -> int:
         return int(np.ceil((self.pulse_length + self.padding_length) / 4) * 4)
 
+    @cached_waveform
     def waveform_function(self):
         if self.pulse_length <= 0:
             raise ValueError("GaussianFilteredSquarePulse.pulse_length must be positive")
@@ -209,8 +409,6 @@ class GaussianFilteredSquarePulse(Pulse):
         if self.amplitude == 0:
             return np.zeros(self.length, dtype=np.float64)
 
-        from scipy.ndimage import gaussian_filter1d
-
         zero_pad_len = self.length - self.pulse_length
         left_pad = zero_pad_len // 2
         right_pad = zero_pad_len - left_pad
@@ -223,7 +421,7 @@ class GaussianFilteredSquarePulse(Pulse):
         )
         f_hz = self.gaussian_filter_frequency_mhz * 1e6
         sigma = self.sample_rate / (2.0 * np.pi * f_hz)
-        env = gaussian_filter1d(env, sigma=sigma)
+        env = gaussian_filter_envelope(env, sigma)
         peak = float(np.max(np.abs(env)))
         if peak > 0:
             env = env * (abs(self.amplitude) / peak)
@@ -306,6 +504,7 @@ class DrachmaReadoutPulse(ReadoutPulse):
             derivatives.append(current)
         return derivatives
 
+    @cached_waveform
     def waveform_function(self):
         """Constructs a_in(t) per Eq. (7), applied as a direct time-domain
         differential operator on a_T(t) = sin^3(pi t / Tp)."""
@@ -0,0 +1,157 @@
+"""Track the DC offsets emitted in a QUA program, so that unchanged offsets can be skipped.
+
+Flux lines and tunable couplers keep their DC offset until it is changed. Nodes that
+switch flux points often, e.g. once per qubit in a Python loop, therefore emit many
+``set_dc_offset`` statements that do not change anything, each followed by a wait for
+the flux to settle.
+
+The offsets are tracked per QUA scope, i.e. per ``program()``, loop or conditional body.
+An offset counts as set if it was recorded in the current scope and no statement
+appended to this scope since then may have changed it. Statements that may change it
+are ``set_dc_offset`` statements on the same element that were not recorded, e.g. raw
+``qua.set_dc_offset`` calls, also inside nested loops and conditionals, as well as
+``pause`` statements and arbitrary statements. The first offset in a new scope, such as
+a loop body, is always emitted, since the previous loop iteration may have changed it.
+
+The tracking inspects the statements of the QUA scopes through the scope internals of
+``qm-qua``, as the voltage sequences do.
+
+Example:
+    >>> if not is_dc_offset_set(channel.name, offset):
+    ...     channel.set_dc_offset(offset)
+    ...     record_dc_offset(channel.name, offset)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set
+from weakref import WeakKeyDictionary
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message
+
+from qm.grpc.qm.pb import inc_qua_pb2
+from qm.qua._scope_management.scopes_manager import scopes_manager
+
+from quam_builder.tools.qua_tools import is_qua_type
+
+__all__ = ["is_dc_offset_set", "record_dc_offset", "forget_dc_offsets"]
+
+# Statements after which no DC offset can be assumed, e.g. since the host may change it
+_INVALIDATING_STATEMENTS = frozenset({"pause", "arbitrary", "arbitraryContext"})
+_ALL_ELEMENTS = None
+_ANY_STATEMENT = inc_qua_pb2.QuaProgram.AnyStatement.DESCRIPTOR.full_name
+
+
+@dataclass
+class _ScopeOffsets:
+    """The offsets recorded in one scope and the number of statements checked so far."""
+
+    position: int = 0
+    offsets: Dict[str, float] = field(default_factory=dict)
+
+
+# Keyed by scope, so that the offsets are dropped together with their program
+_scope_offsets: "WeakKeyDictionary[object, _ScopeOffsets]" = WeakKeyDictionary()
+
+
+def _changed_elements(statements: Iterable) -> Optional[Set[str]]:
+    """The elements whose DC offset may be changed by the statements.
+
+    Returns:
+        The element names, or None if the offsets of all elements may have changed.
+    """
+    elements = set()
+    for statement in statements:
+        kind = statement.WhichOneof("statement_oneof")
+        if kind in _INVALIDATING_STATEMENTS:
+            return _ALL_ELEMENTS
+        if kind == "setDcOffset":
+            elements.add(statement.setDcOffset.qe.name)
+            continue
+        # Search the bodies of loops, conditionals and other compound statements
+        nested = _changed_elements(_nested_statements(getattr(statement, kind)))
+        if nested is _ALL_ELEMENTS:
+            return _ALL_ELEMENTS
+        elements |= nested
+    return elements
+
+
+def _nested_statements(message):
+    for descriptor, value in message.ListFields():
+        if descriptor.type != FieldDescriptor.TYPE_MESSAGE:
+            continue
+        values = [value] if isinstance(value, Message) else value
+        for nested in values:
+            if descriptor.message_type.full_name == _ANY_STATEMENT:
+                yield nested
+            else:
+                yield from _nested_statements(nested)
+
+
+def _current_offsets() -> _ScopeOffsets:
+    """The offsets of the current scope, without those changed by statements since."""
+    scope = scopes_manager.current_scope
+    scope_offsets = _scope_offsets.get(scope)
+    if scope_offsets is None:
+        scope_offsets = _scope_offsets[scope] = _ScopeOffsets()
+
+    statements = scope.statements
+    if scope_offsets.position < len(statements):
+        changed = _changed_elements(statements[scope_offsets.position :])
+        if changed is _ALL_ELEMENTS:
+            scope_offsets.offsets.clear()
+        else:
+            for element in changed:
+                scope_offsets.offsets.pop(element, None)
+        scope_offsets.position = len(statements)
+    return scope_offsets
+
+
+def is_dc_offset_set(element: str, offset) -> bool:
+    """Whether the DC offset of an element is known to equal ``offset`` in the current scope.
+
+    Args:
+        element: The element name.
+        offset: The offset. QUA expressions are never considered set.
+
+    Returns:
+        True if ``offset`` was recorded for the element in the current scope and has not
+        been changed since.
+
+    Raises:
+        NoScopeFoundException: If called outside a QUA program.
+    """
+    if is_qua_type(offset):
+        return False
+    recorded = _current_offsets().offsets.get(element)
+    return recorded is not None and recorded == offset
+
+
+def record_dc_offset(element: str, offset) -> None:
+    """Record the DC offset that was just set for an element in the current scope.
+
+    Must be called right after emitting the ``set_dc_offset`` statement.
+
+    Args:
+        element: The element name.
+        offset: The offset. For QUA expressions, the offset of the element becomes
+            unknown.
+    """
+    scope_offsets = _current_offsets()
+    if is_qua_type(offset):
+        scope_offsets.offsets.pop(element, None)
+    else:
+        scope_offsets.offsets[element] = offset
+
+
+def forget_dc_offsets(element: Optional[str] = None) -> None:
+    """Forget the recorded DC offsets of the current scope, so that they are emitted again.
+
+    Args:
+        element: The element name. If None, the offsets of all elements are forgotten.
+    """
+    scope_offsets = _current_offsets()
+    if element is None:
+        scope_offsets.offsets.clear()
+    else:
+        scope_offsets.offsets.pop(element, None)
@@ -0,0 +1,292 @@
+"""Apply a list of gates as soon as possible, aligning only the channels that need it.
+
+QUA plays the operations of every element on its own timeline, so gates on disjoint
+channels run in parallel unless an ``align`` ties them together. Gate sequences written
+with ``SequenceMacro`` or with ``align()`` between gates therefore serialize independent
+gates on different qubits.
+
+``schedule_gates`` builds a dependency graph over channels and qubits instead: every
+gate depends on the last gates that used any of its channels, and on the last gate on
+each of its qubits. The latter keeps the order of gates on the same qubit that use
+different channels, e.g. a pi pulse on the drive line followed by a readout on the
+resonator. Before a gate, it emits an ``align`` over the channels of that gate and of
+the previous gates on its qubits, and only if these channels are not already known to
+be in sync, e.g. since the previous gate on them ended with an align:
+
+    >>> from quam_builder.tools.gate_scheduler import schedule_gates
+    >>> schedule = schedule_gates(
+    ...     [
+    ...         (machine.qubits["q0"], "x"),
+    ...         (machine.qubits["q1"], "sx"),
+    ...         (machine.qubit_pairs["q0-q1"], "cz"),
+    ...         (machine.qubits["q2"], "rz", {"angle": 0.5}),
+    ...     ]
+    ... )
+    >>> print(schedule.duration)
+
+The channels of a gate are taken from the ``scheduled_channels`` attribute of its
+macro if it has one. Otherwise, pulse macros use the channel of their pulse, and other
+macros use all channels of the qubit or qubit pair they belong to, together with the
+channels of its voltage sequence for quantum dot components.
+
+Macros with a class attribute ``ends_aligned = True`` leave all their channels in sync.
+After any other gate on several channels, these channels are aligned again before the
+next gate that uses more than one of them. Gates with an ``inferred_duration`` of zero,
+such as virtual Z rotations, do not change the sync state of their channels.
+
+The schedule also contains the as-soon-as-possible start time of every gate, computed
+from the ``inferred_duration`` of the macros. It is an estimate: macros may take longer
+than their inferred duration, e.g. a measurement followed by a depletion wait.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from qm.qua import align
+from quam.components.macro import PulseMacro
+from quam.components.pulses import Pulse
+from quam.components.quantum_components import QubitPair
+from quam.core.macro.quam_macro import QuamMacro
+
+__all__ = ["Gate", "ScheduledGate", "GateSchedule", "gate_channels", "schedule_gates"]
+
+
+@dataclass
+class Gate:
+    """A gate invocation.
+
+    Attributes:
+        target: The qubit or qubit pair to which the gate is applied.
+        macro (Union[str, QuamMacro]): The macro, or its name in ``target.macros``.
+        kwargs (Dict[str, Any]): Keyword arguments passed to ``macro.apply``.
+    """
+
+    target: Any
+    macro: Union[str, QuamMacro]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    def resolve_macro(self) -> QuamMacro:
+        """Return the macro of this gate.
+
+        Raises:
+            KeyError: If the target has no macro with the given name.
+        """
+        if isinstance(self.macro, QuamMacro):
+            return self.macro
+        macros = getattr(self.target, "macros", None) or {}
+        if self.macro not in macros:
+            raise KeyError(f"Macro '{self.macro}' not found on {self.target.name}")
+        return macros[self.macro]
+
+
+@dataclass
+class ScheduledGate:
+    """A gate as applied by ``schedule_gates``.
+
+    Attributes:
+        gate (Gate): The gate invocation.
+        channels (Tuple[str, ...]): The names of the channels used by the gate.
+        depends_on (Tuple[int, ...]): The indices of the gates that last used one of
+            these channels or one of the qubits of the gate.
+        aligned (bool): Whether an ``align`` was emitted before the gate.
+        start (Optional[float]): The as-soon-as-possible start time in ns, or None if the
+            duration of a previous gate is unknown.
+        duration (Optional[float]): The inferred duration in ns, or None if unknown.
+        result (Any): The return value of the macro, e.g. a measured state.
+    """
+
+    gate: Gate
+    channels: Tuple[str, ...]
+    depends_on: Tuple[int, ...]
+    aligned: bool
+    start: Optional[float]
+    duration: Optional[float]
+    result: Any = None
+
+
+@dataclass
+class GateSchedule:
+    """The gates applied by ``schedule_gates``, in the order in which they were given.
+
+    Attributes:
+        gates (List[ScheduledGate]): The scheduled gates.
+    """
+
+    gates: List[ScheduledGate] = field(default_factory=list)
+
+    @property
+    def num_aligns(self) -> int:
+        """The number of ``align`` statements emitted."""
+        return sum(gate.aligned for gate in self.gates)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """The estimated duration of the schedule in ns, or None if unknown."""
+        end = 0.0
+        for gate in self.gates:
+            if gate.start is None or gate.duration is None:
+                return None
+            end = max(end, gate.start + gate.duration)
+        return end
+
+    @property
+    def results(self) -> List[Any]:
+        """The return values of the macros."""
+        return [gate.result for gate in self.gates]
+
+
+def _component_channels(component) -> List[str]:
+    """The names of all channels of a qubit or qubit pair."""
+    if isinstance(component, QubitPair):
+        channels = _component_channels(component.qubit_control)
+        channels += _component_channels(component.qubit_target)
+        coupler = getattr(component, "coupler", None)
+        if coupler is not None:
+            channels.append(coupler.name)
+    else:
+        channels = [channel.name for channel in component.channels.values()]
+
+    try:
+        voltage_sequence = getattr(component, "voltage_sequence", None)
+    except (AttributeError, ValueError):
+        voltage_sequence = None
+    if voltage_sequence is not None:
+        channels += [channel.name for channel in voltage_sequence.gate_set.channels.values()]
+    return channels
+
+
+def gate_channels(macro: QuamMacro) -> Tuple[str, ...]:
+    """Return the names of the channels used by a macro, without duplicates.
+
+    Args:
+        macro: The macro, attached to a qubit or qubit pair.
+
+    Returns:
+        The channel names, in order of first use.
+    """
+    channels = getattr(macro, "scheduled_channels", None)
+    if channels is None:
+        if isinstance(macro, PulseMacro):
+            pulse = macro.pulse if isinstance(macro.pulse, Pulse) else None
+            if pulse is None:
+                pulse = macro.qubit.get_pulse(macro.pulse)
+            channels = [pulse.channel.name]
+        else:
+            channels = _component_channels(macro.parent.parent)
+    return tuple(dict.fromkeys(channels))
+
+
+def _gate_qubits(target) -> Tuple[Any, ...]:
+    """The qubits of a gate target, i.e. both qubits of a qubit pair."""
+    if isinstance(target, QubitPair):
+        return (target.qubit_control, target.qubit_target)
+    return (target,)
+
+
+def _as_gate(gate: Union[Gate, Sequence]) -> Gate:
+    return gate if isinstance(gate, Gate) else Gate(*gate)
+
+
+def _inferred_duration_ns(macro: QuamMacro) -> Optional[float]:
+    try:
+        duration = getattr(macro, "inferred_duration", None)
+    except (AttributeError, KeyError, ValueError):
+        return None
+    return None if duration is None else duration * 1e9
+
+
+def schedule_gates(gates: Sequence[Union[Gate, Sequence]]) -> GateSchedule:
+    """Apply gates as soon as possible, with an ``align`` only where channels are out of sync.
+
+    Must be called inside a QUA program. The gates are applied in the given order. A
+    gate is preceded by an ``align`` over its own channels and the channels of the
+    previous gates on its qubits, if these are several channels that are not known to
+    be in sync. Gates on disjoint channels and qubits are never aligned with each other.
+
+    Args:
+        gates: The gates, either as ``Gate`` or as ``(target, macro)`` or
+            ``(target, macro, kwargs)`` tuples.
+
+    Returns:
+        GateSchedule: The scheduled gates with their channels, dependencies, estimated
+            start times and macro results.
+
+    Raises:
+        KeyError: If a gate refers to a macro that its target does not have.
+    """
+    schedule = GateSchedule()
+    sync_groups = itertools.count()
+    # Channels with the same sync group are known to be at the same point in time
+    sync_group: Dict[str, int] = {}
+    last_gate: Dict[str, int] = {}
+    free_at: Dict[str, Optional[float]] = {}
+    # The index of the last gate on each qubit, and the channels of the qubit it used
+    last_qubit_gate: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+    qubit_channels: Dict[str, frozenset] = {}
+
+    for index, gate in enumerate(_as_gate(gate) for gate in gates):
+        macro = gate.resolve_macro()
+        channels = gate_channels(macro)
+        duration = _inferred_duration_ns(macro)
+        qubits = []
+        for qubit in _gate_qubits(gate.target):
+            qubits.append(qubit.name)
+            if qubit.name not in qubit_channels:
+                qubit_channels[qubit.name] = frozenset(_component_channels(qubit))
+
+        # The gate must start after the previous gates on its qubits, also on other channels
+        previous_qubit_gates = [last_qubit_gate[q] for q in qubits if q in last_qubit_gate]
+        dependent_channels = tuple(
+            dict.fromkeys(channels + tuple(ch for _, chs in previous_qubit_gates for ch in chs))
+        )
+
+        groups = {sync_group.get(channel) for channel in dependent_channels}
+        aligned = len(dependent_channels) > 1 and (len(groups) > 1 or None in groups)
+        if aligned:
+            align(*dependent_channels)
+            group = next(sync_groups)
+            for channel in dependent_channels:
+                sync_group[channel] = group
+
+        result = macro.apply(**gate.kwargs)
+
+        if getattr(macro, "ends_aligned", False):
+            group = next(sync_groups)
+            for channel in channels:
+                sync_group[channel] = group
+        elif duration != 0:
+            # The channels advanced by different, unknown amounts
+            for channel in channels:
+                sync_group[channel] = next(sync_groups)
+
+        free_times = [free_at.get(channel, 0.0) for channel in dependent_channels]
+        start = None if None in free_times else max(free_times, default=0.0)
+        end = None if start is None or duration is None else start + duration
+        depends_on = {last_gate[ch] for ch in channels if ch in last_gate}
+        depends_on.update(previous_index for previous_index, _ in previous_qubit_gates)
+        for channel in channels:
+            free_at[channel] = end
+            last_gate[channel] = index
+        if aligned and start is not None:
+            for channel in dependent_channels:
+                if channel not in channels:
+                    free_at[channel] = max(free_at.get(channel, 0.0), start)
+        for qubit in qubits:
+            # Only the channels of the qubit itself, so that a gate on a qubit pair does not
+            # tie later gates on one of its qubits to the other qubit
+            own_channels = tuple(ch for ch in channels if ch in qubit_channels[qubit])
+            last_qubit_gate[qubit] = (index, own_channels or channels)
+
+        schedule.gates.append(
+            ScheduledGate(
+                gate=gate,
+                channels=channels,
+                depends_on=tuple(sorted(depends_on)),
+                aligned=aligned,
+                start=start,
+                duration=duration,
+                result=result,
+            )
+        )
+    return schedule
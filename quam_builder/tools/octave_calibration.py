@@ -0,0 +1,265 @@
+"""Skip Octave mixer calibrations whose settings have not changed since the last run.
+
+``QuantumMachine.calibrate_element`` takes several seconds per element, so calibrating
+all the resonators and drives of a chip takes minutes, even if their LO frequency,
+intermediate frequency and Octave gain are the same as in the previous calibration.
+
+An ``OctaveCalibrationLedger`` records the settings of every successful calibration,
+optionally in a JSON file. ``calibrate_elements`` skips the elements whose current
+settings were already calibrated, and calibrates the others one after the other:
+
+    >>> ledger = OctaveCalibrationLedger.load("octave_calibration_ledger.json")
+    >>> machine.calibrate_octave_ports(qm, ledger=ledger)
+
+A quantum machine runs one calibration job at a time, and raises
+``AnotherJobIsRunning`` if another one is started meanwhile. The Octaves can only be
+calibrated in parallel through separate quantum machines, by passing a mapping from
+Octave name to quantum machine together with ``max_workers``.
+
+Calibrations do not expire unless ``max_age`` is set, just like the entries of the
+Octave calibration database that the QM loads them from. Each entry records the path
+of that database, so that pointing an Octave to another database calibrates its
+elements again.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from qm.octave.octave_mixer_calibration import NoCalibrationElements
+
+__all__ = [
+    "OctaveCalibration",
+    "OctaveCalibrationLedger",
+    "octave_calibration",
+    "calibrate_elements",
+]
+
+logger = logging.getLogger(__name__)
+
+LEDGER_VERSION = 2
+
+
+@dataclass(frozen=True)
+class OctaveCalibration:
+    """The settings that determine the Octave mixer calibration of an element.
+
+    Attributes:
+        element (str): The element name.
+        octave (str): The name of the Octave of the element's up-converter.
+        LO_frequency (float): The LO frequency in Hz.
+        intermediate_frequency (float): The intermediate frequency in Hz.
+        gain (float): The Octave output gain in dB.
+        calibration_db_path (str): The resolved directory of the Octave calibration
+            database that the calibration is stored in.
+    """
+
+    element: str
+    octave: str
+    LO_frequency: float
+    intermediate_frequency: float
+    gain: float
+    calibration_db_path: str
+
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        """Whether a ledger entry was recorded with the same settings."""
+        return (
+            entry["LO_frequency"] == self.LO_frequency
+            and entry["intermediate_frequency"] == self.intermediate_frequency
+            and entry["gain"] == self.gain
+            and entry["calibration_db_path"] == self.calibration_db_path
+        )
+
+
+def octave_calibration(channel) -> OctaveCalibration:
+    """Return the calibration settings of a channel connected to an Octave.
+
+    Args:
+        channel: An IQ channel, e.g. a ``ReadoutResonatorIQ`` or ``XYDriveIQ``.
+
+    Raises:
+        RuntimeError: If the channel is not connected to an Octave.
+    """
+    frequency_converter = getattr(channel, "frequency_converter_up", None)
+    octave = getattr(frequency_converter, "octave", None)
+    if octave is None:
+        raise RuntimeError(
+            f"{channel.name} doesn't have a 'frequency_converter_up' attribute, it is thus most likely "
+            "not connected to an Octave."
+        )
+    return OctaveCalibration(
+        element=channel.name,
+        octave=octave.name,
+        LO_frequency=frequency_converter.LO_frequency,
+        intermediate_frequency=channel.intermediate_frequency,
+        gain=frequency_converter.gain,
+        # Like Octave.get_octave_config, which uses the working directory if no path is set
+        calibration_db_path=str(Path(octave.calibration_db_path or os.getcwd()).resolve()),
+    )
+
+
+class OctaveCalibrationLedger:
+    """The settings and times of the successful Octave calibrations of each element.
+
+    Args:
+        path: The JSON file to which the ledger is saved after every recorded
+            calibration. If None, the ledger is only kept in memory.
+        max_age: The time in seconds after which a calibration is no longer fresh.
+            If None, calibrations do not expire.
+    """
+
+    def __init__(self, path: Optional[Union[Path, str]] = None, max_age: Optional[float] = None):
+        self.path = Path(path) if path is not None else None
+        self.max_age = max_age
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def load(
+        cls, path: Union[Path, str], max_age: Optional[float] = None
+    ) -> "OctaveCalibrationLedger":
+        """Load a ledger from a JSON file, or create an empty one if it does not exist."""
+        ledger = cls(path, max_age=max_age)
+        if ledger.path.exists():
+            contents = json.loads(ledger.path.read_text())
+            if contents.get("version") == LEDGER_VERSION:
+                ledger.entries = contents["entries"]
+            else:
+                logger.warning(f"Ignoring Octave calibration ledger {path} of another version")
+        return ledger
+
+    def save(self) -> None:
+        """Save the ledger to its path, if it has one."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        contents = {"version": LEDGER_VERSION, "entries": self.entries}
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(contents, indent=2))
+        tmp_path.replace(self.path)
+
+    def is_fresh(self, calibration: OctaveCalibration, now: Optional[float] = None) -> bool:
+        """Whether the element was calibrated with the same settings and has not expired."""
+        now = time.time() if now is None else now
+        for entry in self.entries.get(calibration.element, []):
+            if calibration.matches(entry):
+                return self.max_age is None or now - entry["timestamp"] <= self.max_age
+        return False
+
+    def record(self, calibration: OctaveCalibration, timestamp: Optional[float] = None) -> None:
+        """Record a successful calibration, replacing the entry with the same settings."""
+        entries = [
+            entry
+            for entry in self.entries.get(calibration.element, [])
+            if not calibration.matches(entry)
+        ]
+        entries.append(
+            {
+                "LO_frequency": calibration.LO_frequency,
+                "intermediate_frequency": calibration.intermediate_frequency,
+                "gain": calibration.gain,
+                "calibration_db_path": calibration.calibration_db_path,
+                "timestamp": time.time() if timestamp is None else timestamp,
+            }
+        )
+        self.entries[calibration.element] = entries
+
+    def invalidate(self, element: Optional[str] = None) -> None:
+        """Forget the calibrations of an element, or of all elements if None."""
+        if element is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(element, None)
+
+
+def _calibrate_sequentially(
+    QM, calibrations: List[OctaveCalibration], results: Dict[str, Any]
+) -> None:
+    """Calibrate elements with one quantum machine one after the other, adding to ``results``."""
+    for calibration in calibrations:
+        logger.info(f"Calibrating {calibration.element}")
+        try:
+            results[calibration.element] = QM.calibrate_element(
+                calibration.element,
+                {calibration.LO_frequency: (calibration.intermediate_frequency,)},
+            )
+        except NoCalibrationElements:
+            logger.warning(
+                f"No calibration elements found for {calibration.element}. Skipping calibration."
+            )
+
+
+def calibrate_elements(
+    QM: Union[Any, Mapping[str, Any]],
+    calibrations: Sequence[OctaveCalibration],
+    ledger: Optional[OctaveCalibrationLedger] = None,
+    max_workers: int = 1,
+) -> Dict[str, Any]:
+    """Calibrate the Octave mixers of several elements, skipping those that are fresh.
+
+    Args:
+        QM: The running quantum machine, or a mapping from Octave name to the quantum
+            machine that calibrates the elements of that Octave.
+        calibrations: The settings of the elements to calibrate.
+        ledger: The ledger of previous calibrations. If given, elements with a fresh
+            calibration are skipped and successful calibrations are recorded and saved.
+        max_workers: The number of quantum machines that calibrate in parallel. The
+            elements of one quantum machine are always calibrated one after the other,
+            since it runs one calibration job at a time.
+
+    Returns:
+        The calibration results by element name. Skipped elements are left out.
+
+    Raises:
+        KeyError: If ``QM`` is a mapping without an entry for the Octave of an element.
+    """
+    if ledger is not None:
+        skipped = [c.element for c in calibrations if ledger.is_fresh(c)]
+        if skipped:
+            logger.info(f"Skipping fresh Octave calibrations of {', '.join(skipped)}")
+        calibrations = [c for c in calibrations if c.element not in skipped]
+
+    # Group the elements by quantum machine, keeping the order of the calibrations
+    by_qm: Dict[int, List[OctaveCalibration]] = {}
+    qms: Dict[int, Any] = {}
+    for calibration in calibrations:
+        if isinstance(QM, Mapping):
+            if calibration.octave not in QM:
+                raise KeyError(f"No quantum machine given for Octave {calibration.octave}")
+            qm = QM[calibration.octave]
+        else:
+            qm = QM
+        qms[id(qm)] = qm
+        by_qm.setdefault(id(qm), []).append(calibration)
+
+    results = {}
+    try:
+        if max_workers <= 1 or len(by_qm) <= 1:
+            for qm_id, qm_calibrations in by_qm.items():
+                _calibrate_sequentially(qms[qm_id], qm_calibrations, results)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_calibrate_sequentially, qms[qm_id], qm_calibrations, results)
+                    for qm_id, qm_calibrations in by_qm.items()
+                ]
+                errors = []
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        errors.append(e)
+                if errors:
+                    raise errors[0]
+    finally:
+        # Keep the calibrations that succeeded, also if another one failed
+        if ledger is not None and results:
+            for calibration in calibrations:
+                if calibration.element in results:
+                    ledger.record(calibration)
+            ledger.save()
+    return results
@@ -0,0 +1,195 @@
+"""Store repeated pulse definitions once in the saved QUAM state.
+
+The default pulses of a large machine are mostly identical across qubits, e.g. every
+qubit has the same saturation pulse. Saved naively, ``state.json`` repeats each of
+these definitions for every channel.
+
+Machines with ``use_pulse_templates = True`` are saved with a template library in a
+root ``pulse_templates`` entry instead, through ``save_with_pulse_templates``. Pulses with the same operation name and class
+refer to a shared template and only store the fields in which they differ from it:
+
+    "operations": {"saturation": {"__template__": "saturation", "amplitude": 0.3}}
+
+Templates only exist in the saved state. They are expanded into full pulse entries
+by ``read_expanded_state`` when the state is loaded, so that every channel still owns
+its pulse objects and ``generate_config`` output is unchanged. This shrinks the state
+files, but does not make loading faster: instantiating the components dominates the
+load time, not parsing the JSON.
+
+Machines without ``use_pulse_templates`` are saved with their plain ``JSONSerialiser``.
+
+Example:
+    >>> machine.use_pulse_templates = True
+    >>> machine.save()
+"""
+
+import copy
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+__all__ = [
+    "collapse_pulse_templates",
+    "expand_pulse_templates",
+    "save_with_pulse_templates",
+    "read_expanded_state",
+]
+
+PULSE_TEMPLATES_KEY = "pulse_templates"
+TEMPLATE_KEY = "__template__"
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _iter_pulse_entries(contents: Any):
+    """Yield (operations, operation name, pulse dict) for all pulses in a state dict."""
+    if isinstance(contents, dict):
+        for key, value in contents.items():
+            if key == "operations" and isinstance(value, dict):
+                for name, pulse in value.items():
+                    if isinstance(pulse, dict) and "__class__" in pulse:
+                        yield value, name, pulse
+            else:
+                yield from _iter_pulse_entries(value)
+    elif isinstance(contents, list):
+        for value in contents:
+            yield from _iter_pulse_entries(value)
+
+
+def _build_template(pulses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The most common value of each field that all pulses define."""
+    common_keys = set(pulses[0]).intersection(*pulses[1:])
+    template = {}
+    for key in pulses[0]:
+        if key not in common_keys:
+            continue
+        counts = Counter(_canonical(pulse[key]) for pulse in pulses)
+        most_common = counts.most_common(1)[0][0]
+        template[key] = next(p[key] for p in pulses if _canonical(p[key]) == most_common)
+    return template
+
+
+def collapse_pulse_templates(contents: Dict[str, Any]) -> Dict[str, Any]:
+    """Move pulse definitions that occur more than once into a template library.
+
+    Pulses are grouped by operation name and class. Groups with at least two pulses
+    get a template with the most common value of each field, and each pulse is
+    replaced by a reference to it plus the fields that differ.
+
+    Args:
+        contents: The state dict, as returned by ``QuamRoot.to_dict``. It is not
+            modified.
+
+    Returns:
+        A new state dict with a root ``pulse_templates`` entry.
+    """
+    contents = copy.deepcopy(contents)
+
+    groups: Dict[Tuple[str, str], List[Tuple[dict, str, dict]]] = {}
+    for operations, name, pulse in _iter_pulse_entries(contents):
+        groups.setdefault((name, pulse["__class__"]), []).append((operations, name, pulse))
+
+    templates: Dict[str, Dict[str, Any]] = {}
+    for (name, _), entries in groups.items():
+        if len(entries) < 2:
+            continue
+        template_name = name
+        suffix = 1
+        while template_name in templates:
+            template_name = f"{name}_{suffix}"
+            suffix += 1
+        template = _build_template([pulse for _, _, pulse in entries])
+        templates[template_name] = template
+
+        for operations, operation_name, pulse in entries:
+            overrides = {
+                key: value
+                for key, value in pulse.items()
+                if key not in template or _canonical(value) != _canonical(template[key])
+            }
+            operations[operation_name] = {TEMPLATE_KEY: template_name, **overrides}
+
+    if templates:
+        contents[PULSE_TEMPLATES_KEY] = templates
+    return contents
+
+
+def expand_pulse_templates(contents: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace template references by full pulse entries and drop the template library.
+
+    States without a ``pulse_templates`` entry are returned unchanged.
+
+    Raises:
+        KeyError: If a pulse refers to a template that does not exist.
+    """
+    if PULSE_TEMPLATES_KEY not in contents:
+        return contents
+    contents = dict(contents)
+    templates = contents.pop(PULSE_TEMPLATES_KEY)
+
+    def expand(value: Any) -> Any:
+        if isinstance(value, dict):
+            if TEMPLATE_KEY in value:
+                template_name = value[TEMPLATE_KEY]
+                if template_name not in templates:
+                    raise KeyError(f"Unknown pulse template '{template_name}'")
+                overrides = {k: v for k, v in value.items() if k != TEMPLATE_KEY}
+                return copy.deepcopy({**templates[template_name], **overrides})
+            return {key: expand(val) for key, val in value.items()}
+        if isinstance(value, list):
+            return [expand(val) for val in value]
+        return value
+
+    return expand(contents)
+
+
+class _CollapsedState:
+    """Stands in for a QuamRoot when saving, returning its state with templates."""
+
+    def __init__(self, quam_obj):
+        self.quam_obj = quam_obj
+
+    def to_dict(self, *args, **kwargs) -> Dict[str, Any]:
+        return collapse_pulse_templates(self.quam_obj.to_dict(*args, **kwargs))
+
+
+def save_with_pulse_templates(
+    machine,
+    path: Optional[Union[Path, str]] = None,
+    content_mapping: Optional[Dict] = None,
+    include_defaults: Optional[bool] = None,
+    ignore: Optional[Sequence[str]] = None,
+) -> None:
+    """Save a machine with its serialiser, storing repeated pulse definitions as templates.
+
+    Takes the same arguments as ``QuamRoot.save``.
+    """
+    machine.serialiser.save(
+        quam_obj=_CollapsedState(machine),
+        path=path,
+        content_mapping=content_mapping,
+        include_defaults=include_defaults,
+        ignore=ignore,
+    )
+
+
+def read_expanded_state(
+    quam_class, filepath_or_dict: Optional[Union[Path, str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Read a saved state with the serialiser of ``quam_class`` and expand its pulse templates.
+
+    Args:
+        quam_class: The ``QuamRoot`` class to read the state for.
+        filepath_or_dict: The path to read, see ``QuamRoot.load``, or an already read state.
+
+    Returns:
+        The state dict without pulse templates.
+    """
+    if isinstance(filepath_or_dict, dict):
+        contents = filepath_or_dict
+    else:
+        contents, _ = quam_class.get_serialiser().load(filepath_or_dict)
+    return expand_pulse_templates(contents)
@@ -0,0 +1,391 @@
+"""Reuse Quantum Machines Manager connections and open quantum machines within a process.
+
+Creating a ``QuantumMachinesManager`` performs a handshake with the server, and opening
+a quantum machine sends and compiles the full config. Calibration graphs that connect
+and open a QM in every node pay both costs again and again, even though the server,
+and often the config, are unchanged.
+
+``QmmPool`` keeps one connection per host, port, cluster name, Octave configuration
+and QMM class, and checks that a pooled connection still responds before handing it
+out. It also remembers the quantum machines opened through each connection, keyed on
+a structural hash of their config, and returns one again if it is still open:
+
+    >>> pool = get_qmm_pool()
+    >>> qmm = pool.connect(QuantumMachinesManager, {"host": "127.0.0.1", "cluster_name": "Cluster_1"})
+    >>> qm = pool.open_qm(qmm, machine.generate_config())
+    >>> pool.close_all()
+
+The structural hash leaves out the values that can be changed on an open quantum
+machine: element intermediate frequencies, mixer correction matrices and the samples
+of overridable waveforms. If only these changed, ``open_qm`` applies the new
+frequencies and corrections with ``set_intermediate_frequency`` and
+``set_mixer_correction`` instead of opening a new quantum machine. Overridable
+waveforms cannot be changed on the quantum machine itself, their new samples are
+returned by ``execution_overrides`` for ``qm.queue.add_compiled``.
+
+The machine roots use the process-wide pool of ``get_qmm_pool`` in ``connect`` and
+``open_qm``.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Set, Tuple
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+__all__ = [
+    "QmmPool",
+    "RuntimeUpdate",
+    "config_hash",
+    "structural_config_hash",
+    "plan_runtime_update",
+    "get_qmm_pool",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _serialise(config: Dict[str, Any]) -> str:
+    return json.dumps(config, sort_keys=True, default=_json_default)
+
+
+def _digest(serialised: str) -> str:
+    return hashlib.sha256(serialised.encode()).hexdigest()
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Return a hash of a QUA config that is stable across Python sessions.
+
+    Args:
+        config: The QUA config, e.g. from ``machine.generate_config()``.
+
+    Returns:
+        A hex digest.
+    """
+    return _digest(_serialise(config))
+
+
+def _structure(config: Dict[str, Any]) -> Dict[str, Any]:
+    """A shallow copy of the config without the values that can be updated at runtime."""
+    structure = dict(config)
+    structure["elements"] = {
+        name: {
+            key: (value is not None if key == "intermediate_frequency" else value)
+            for key, value in element.items()
+        }
+        for name, element in config.get("elements", {}).items()
+    }
+    # Mixer entries are identified by their LO frequency, their IF follows the element
+    structure["mixers"] = {
+        name: [entry.get("lo_frequency") for entry in entries]
+        for name, entries in config.get("mixers", {}).items()
+    }
+    waveforms = {}
+    for name, waveform in config.get("waveforms", {}).items():
+        if waveform.get("is_overridable", False):
+            waveform = dict(waveform)
+            if "samples" in waveform:
+                waveform["samples"] = len(waveform["samples"])
+            waveform.pop("sample", None)
+        waveforms[name] = waveform
+    structure["waveforms"] = waveforms
+    return structure
+
+
+def structural_config_hash(config: Dict[str, Any]) -> str:
+    """Return a hash of the parts of a QUA config that cannot be changed on an open QM.
+
+    Configs that differ only in element intermediate frequencies, mixer correction
+    entries with the same LO frequencies, or the samples of overridable waveforms of the
+    same length have the same structural hash.
+
+    Args:
+        config: The QUA config, e.g. from ``machine.generate_config()``.
+
+    Returns:
+        A hex digest.
+    """
+    return config_hash(_structure(config))
+
+
+@dataclass
+class RuntimeUpdate:
+    """The changes between two QUA configs with the same structural hash.
+
+    Attributes:
+        intermediate_frequencies (Dict[str, float]): The new intermediate frequency of each
+            changed element.
+        mixer_corrections (List[Tuple[str, float, float, Tuple[float, ...]]]): The changed
+            mixer entries as ``(mixer, intermediate_frequency, lo_frequency, correction)``.
+        waveforms (Dict[str, Any]): The new samples of each changed overridable waveform.
+    """
+
+    intermediate_frequencies: Dict[str, float] = field(default_factory=dict)
+    mixer_corrections: List[Tuple[str, float, float, Tuple[float, ...]]] = field(
+        default_factory=list
+    )
+    waveforms: Dict[str, Any] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.intermediate_frequencies or self.mixer_corrections or self.waveforms)
+
+    def apply(self, qm) -> None:
+        """Set the new intermediate frequencies and mixer corrections on an open QM.
+
+        The waveforms cannot be set on the quantum machine, they are passed as execution
+        overrides instead, see ``QmmPool.execution_overrides``.
+        """
+        for element, frequency in self.intermediate_frequencies.items():
+            # The QM only accepts floats, also for the integer frequencies of a config
+            qm.set_intermediate_frequency(element, float(frequency))
+        for mixer, intermediate_frequency, lo_frequency, correction in self.mixer_corrections:
+            qm.set_mixer_correction(mixer, intermediate_frequency, lo_frequency, correction)
+
+
+def plan_runtime_update(old_config: Dict[str, Any], new_config: Dict[str, Any]) -> RuntimeUpdate:
+    """Return the runtime updates that turn an open QM with ``old_config`` into ``new_config``.
+
+    Only the values left out of ``structural_config_hash`` are compared, the two configs
+    must have the same structural hash.
+
+    Args:
+        old_config: The config with which the quantum machine was opened or last updated.
+        new_config: The new config.
+
+    Returns:
+        The changed intermediate frequencies, mixer entries and overridable waveforms.
+    """
+    update = RuntimeUpdate()
+
+    old_elements = old_config.get("elements", {})
+    for name, element in new_config.get("elements", {}).items():
+        frequency = element.get("intermediate_frequency")
+        if frequency != old_elements[name].get("intermediate_frequency"):
+            update.intermediate_frequencies[name] = frequency
+
+    old_mixers = old_config.get("mixers", {})
+    for name, entries in new_config.get("mixers", {}).items():
+        for old_entry, entry in zip(old_mixers[name], entries):
+            if entry != old_entry:
+                update.mixer_corrections.append(
+                    (
+                        name,
+                        entry["intermediate_frequency"],
+                        entry["lo_frequency"],
+                        tuple(entry["correction"]),
+                    )
+                )
+
+    old_waveforms = old_config.get("waveforms", {})
+    for name, waveform in new_config.get("waveforms", {}).items():
+        if waveform.get("is_overridable", False) and waveform != old_waveforms[name]:
+            update.waveforms[name] = waveform.get("samples", waveform.get("sample"))
+    return update
+
+
+def _octave_fingerprint(octave_config) -> str:
+    """A string that identifies the contents of a ``QmOctaveConfig``."""
+    if octave_config is None:
+        return "None"
+    contents = {}
+    for name, value in sorted(vars(octave_config).items()):
+        if name == "_calibration_db":
+            # The database object itself differs on every call, its file does not
+            value = getattr(value, "_file_path", value)
+        contents[name] = value
+    return json.dumps(contents, sort_keys=True, default=str)
+
+
+def _settings_key(qmm_class: type, settings: Dict[str, Any]) -> Tuple[Hashable, ...]:
+    """The pool key of a QMM class and its connection settings."""
+    settings = dict(settings)
+    octave = _octave_fingerprint(settings.pop("octave", None))
+    key = [
+        f"{qmm_class.__module__}.{qmm_class.__qualname__}",
+        settings.pop("host", None),
+        settings.pop("port", None),
+        settings.pop("cluster_name", None),
+        octave,
+    ]
+    # Any other settings, e.g. those of a custom QMM class
+    key.append(json.dumps(settings, sort_keys=True, default=str))
+    return tuple(key)
+
+
+@dataclass
+class _OpenQm:
+    qm: Any
+    config_hash: str
+    serialised_config: str
+    waveform_overrides: Dict[str, Any] = field(default_factory=dict)
+
+
+class QmmPool:
+    """A pool of Quantum Machines Manager connections and the quantum machines they opened.
+
+    Args:
+        check_health: If True, a pooled connection is only reused if its
+            ``list_open_qms`` call succeeds, otherwise a new connection is made.
+    """
+
+    def __init__(self, check_health: bool = True):
+        self.check_health = check_health
+        self._connections: Dict[Tuple[Hashable, ...], Any] = {}
+        # The open quantum machines of each connection by structural config hash
+        self._open_qms: "WeakKeyDictionary[Any, Dict[str, _OpenQm]]" = WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def _is_healthy(self, qmm) -> bool:
+        try:
+            qmm.list_open_qms()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.info(f"Discarding pooled {type(qmm).__name__}: {e}")
+            return False
+        return True
+
+    def connect(self, qmm_class: type, settings: Dict[str, Any]):
+        """Return a pooled connection with these settings, creating it if needed.
+
+        Args:
+            qmm_class: The QMM class, e.g. ``QuantumMachinesManager``.
+            settings: The keyword arguments of ``qmm_class``.
+
+        Returns:
+            The QMM instance.
+        """
+        key = _settings_key(qmm_class, settings)
+        with self._lock:
+            qmm = self._connections.get(key)
+            if qmm is not None and (not self.check_health or self._is_healthy(qmm)):
+                logger.debug(f"Reusing pooled {qmm_class.__name__} at {settings.get('host')}")
+                return qmm
+            if qmm is not None:
+                self._discard(key)
+
+            logger.info(f"Connecting to {qmm_class.__name__} at {settings.get('host')}")
+            qmm = qmm_class(**settings)
+            self._connections[key] = qmm
+            return qmm
+
+    def open_qm(self, qmm, config: Dict[str, Any], runtime_updates: bool = True, **kwargs):
+        """Open a quantum machine, reusing one opened through ``qmm`` if possible.
+
+        A quantum machine that is still open is reused if its config has the same hash
+        as ``config``. If only the values left out of ``structural_config_hash`` changed
+        and ``runtime_updates`` is True, the new intermediate frequencies and mixer
+        corrections are set on it and it is reused as well. Changed overridable waveforms
+        are then available from ``execution_overrides``.
+
+        Args:
+            qmm: A QMM, usually from ``connect``.
+            config: The QUA config.
+            runtime_updates: Whether to update a quantum machine with the same structural
+                config hash instead of opening a new one.
+            **kwargs: Additional keyword arguments of ``qmm.open_qm``.
+
+        Returns:
+            The quantum machine.
+        """
+        serialised = _serialise(config)
+        digest = _digest(serialised)
+        structure = structural_config_hash(config)
+        with self._lock:
+            open_ids = self._open_qm_ids(qmm)
+            open_qms = {
+                key: entry
+                for key, entry in self._open_qms.get(qmm, {}).items()
+                if entry.qm.id in open_ids
+            }
+            self._open_qms[qmm] = open_qms
+
+            open_qm = open_qms.get(structure)
+            if open_qm is not None and open_qm.config_hash == digest:
+                logger.debug(f"Reusing quantum machine {open_qm.qm.id} with unchanged config")
+                return open_qm.qm
+            if open_qm is not None and runtime_updates:
+                update = plan_runtime_update(
+                    json.loads(open_qm.serialised_config), json.loads(serialised)
+                )
+                logger.info(
+                    f"Updating quantum machine {open_qm.qm.id} at runtime: "
+                    f"{len(update.intermediate_frequencies)} intermediate frequencies, "
+                    f"{len(update.mixer_corrections)} mixer corrections, "
+                    f"{len(update.waveforms)} waveforms"
+                )
+                update.apply(open_qm.qm)
+                open_qm.waveform_overrides.update(update.waveforms)
+                open_qm.config_hash = digest
+                open_qm.serialised_config = serialised
+                return open_qm.qm
+
+            qm = qmm.open_qm(config, **kwargs)
+            open_qms[structure] = _OpenQm(qm=qm, config_hash=digest, serialised_config=serialised)
+            return qm
+
+    def execution_overrides(self, qm) -> Dict[str, Any]:
+        """Return the overrides of the waveforms changed since ``qm`` was opened.
+
+        Pass them to ``qm.queue.add_compiled(program_id, overrides=...)``.
+
+        Args:
+            qm: A quantum machine returned by ``open_qm``.
+
+        Returns:
+            ``{"waveforms": {name: samples}}``, or an empty dict if no waveform changed.
+        """
+        with self._lock:
+            for open_qms in self._open_qms.values():
+                for entry in open_qms.values():
+                    if entry.qm is qm and entry.waveform_overrides:
+                        return {"waveforms": dict(entry.waveform_overrides)}
+        return {}
+
+    def _open_qm_ids(self, qmm) -> Set[str]:
+        try:
+            return set(qmm.list_open_qms())
+        except Exception:  # pylint: disable=broad-exception-caught
+            return set()
+
+    def _discard(self, key: Tuple[Hashable, ...]) -> None:
+        qmm = self._connections.pop(key)
+        self._open_qms.pop(qmm, None)
+        try:
+            qmm.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+
+    def close(self, qmm) -> None:
+        """Close a pooled connection and remove it from the pool."""
+        with self._lock:
+            for key, pooled in list(self._connections.items()):
+                if pooled is qmm:
+                    self._discard(key)
+
+    def close_all(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            for key in list(self._connections):
+                self._discard(key)
+
+
+_pool = QmmPool()
+
+
+def get_qmm_pool() -> QmmPool:
+    """Return the process-wide ``QmmPool``."""
+    return _pool
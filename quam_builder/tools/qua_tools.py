@@ -1,8 +1,11 @@
 from typing import Optional
-from qm.qua.type_hints import QuaVariable, QuaScalarExpression, Scalar
-from qm.qua import declare, assign
+from weakref import WeakKeyDictionary
+from qm.qua.type_hints import QuaVariable, QuaScalarExpression, Scalar, StreamType
+from qm.qua._expressions import QuaArrayVariable
+from qm.qua import declare, assign, save
+from qm.qua._scope_management.scopes_manager import scopes_manager
 
-from typing import Any
+from typing import Any, Dict, Hashable, Tuple
 
 # --- Type Aliases ---
 VoltageLevelType = Scalar[float]
@@ -59,3 +62,45 @@ def integer_abs(qua_int: QuaVariable):
     assign(qua_int, qua_int ^ temp)
     assign(qua_int, qua_int + (temp & 1))
     return qua_int
+
+
+def save_qua_array(array: QuaArrayVariable, stream: StreamType, size: int):
+    """
+    Saves every element of a QUA array to a single stream.
+
+    The elements are saved in order, so ``stream.buffer(size)`` in the stream
+    processing recovers one vector per shot, indexed like the array.
+
+    Args:
+        array: The QUA array to save.
+        stream: The stream to save the elements to.
+        size: The number of elements to save, starting from index 0.
+    """
+    for i in range(size):
+        save(array[i], stream)
+
+
+# The pooled variables of each program, dropped together with the program
+_pooled_variables: "WeakKeyDictionary[object, Dict[Tuple[Hashable, type], QuaVariable]]" = (
+    WeakKeyDictionary()
+)
+
+
+def declare_pooled(t: type, key: Hashable) -> QuaVariable:
+    """
+    Returns the variable of type ``t`` declared under ``key`` in the current program.
+
+    The variable is declared on first use and returned again by later calls with the
+    same key in the same program, also from within loops and conditionals. Macros whose
+    variables only hold intermediate values, such as the I/Q values of a readout that
+    are discarded once the state is assigned, can share them between calls and qubits
+    instead of declaring new ones every time.
+
+    Args:
+        t: The type of the variable, i.e. ``int``, ``fixed`` or ``bool``.
+        key: The name under which the variable is shared.
+    """
+    variables = _pooled_variables.setdefault(scopes_manager.program_scope, {})
+    if (key, t) not in variables:
+        variables[key, t] = declare(t)
+    return variables[key, t]
@@ -0,0 +1,154 @@
+"""Assign the state of a multi-state readout with linear comparisons of I and Q.
+
+A measured point ``(I, Q)`` belongs to the state with the closest center. Computing the
+distance to every center on the pulse processor takes a few operations per center, an
+array to hold the distances and an ``argmin`` over it. The centers are known when the
+program is generated though, so the boundary between any two states can be folded into
+one linear comparison: ``(I, Q)`` is closer to center ``j`` than to center ``i`` if
+
+    2 (I, Q) . (c_j - c_i) > |c_j|^2 - |c_i|^2
+
+``NearestCenterDiscriminator`` precomputes these boundaries, normalised so that each
+comparison needs a single multiplication, and assigns the state through a tree of
+``if_`` statements. For ``N`` states, ``N - 1`` comparisons are evaluated per shot, e.g.
+two for a GEF readout, without any array or extra variable:
+
+    >>> discriminator = nearest_center_discriminator(((0.0, 0.0), (1e-3, 0.0), (0.0, 1e-3)))
+    >>> discriminator.assign_state(state, I, Q)
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+from qm.qua import assign, else_, if_
+from qm.qua.type_hints import QuaVariable
+
+__all__ = ["LinearBoundary", "NearestCenterDiscriminator", "nearest_center_discriminator"]
+
+
+@dataclass(frozen=True)
+class LinearBoundary:
+    """The boundary between two states as a single comparison.
+
+    A point is on the side of the second state if ``x + coefficient * y`` is greater
+    than ``threshold`` (less than, if ``greater`` is False), where ``x`` is I and ``y``
+    is Q if ``x_is_I``, and the other way around otherwise. ``|coefficient| <= 1``, so
+    that the comparison keeps the resolution of the ``fixed`` I and Q values.
+
+    Attributes:
+        x_is_I (bool): Whether the unscaled variable is I.
+        coefficient (float): The weight of the other variable.
+        threshold (float): The threshold of the comparison.
+        greater (bool): Whether the second state is above the threshold.
+    """
+
+    x_is_I: bool
+    coefficient: float
+    threshold: float
+    greater: bool
+
+    @classmethod
+    def between(cls, center: Sequence[float], other: Sequence[float]) -> "LinearBoundary":
+        """The boundary of the points closer to ``other`` than to ``center``.
+
+        Raises:
+            ValueError: If the two centers are equal.
+        """
+        d_I, d_Q = other[0] - center[0], other[1] - center[1]
+        if d_I == 0 and d_Q == 0:
+            raise ValueError(f"The state centers {center} and {other} are equal")
+        threshold = (other[0] ** 2 + other[1] ** 2 - center[0] ** 2 - center[1] ** 2) / 2
+        # Divide by the larger weight, flipping the comparison if it is negative
+        x_is_I = abs(d_I) >= abs(d_Q)
+        scale = d_I if x_is_I else d_Q
+        other_weight = d_Q if x_is_I else d_I
+        return cls(
+            x_is_I=x_is_I,
+            coefficient=other_weight / scale,
+            threshold=threshold / scale,
+            greater=scale > 0,
+        )
+
+    def _combine(self, I, Q):
+        x, y = (I, Q) if self.x_is_I else (Q, I)
+        if self.coefficient == 0:
+            return x
+        return x + self.coefficient * y
+
+    def condition(self, I: QuaVariable, Q: QuaVariable):
+        """The QUA condition that ``(I, Q)`` is on the side of the second state."""
+        value = self._combine(I, Q)
+        return value > self.threshold if self.greater else value < self.threshold
+
+    def evaluate(self, I: float, Q: float) -> bool:
+        """Whether the point ``(I, Q)`` is on the side of the second state."""
+        value = self._combine(I, Q)
+        return value > self.threshold if self.greater else value < self.threshold
+
+
+class NearestCenterDiscriminator:
+    """Assigns the index of the closest state center with linear comparisons.
+
+    Ties are resolved in favour of the state with the lower index, like ``Math.argmin``.
+
+    Args:
+        centers: The ``(I, Q)`` center of each state, e.g. ``resonator.gef_centers``.
+
+    Raises:
+        ValueError: If there are fewer than two centers, or two centers are equal.
+    """
+
+    def __init__(self, centers: Sequence[Sequence[float]]):
+        if len(centers) < 2:
+            raise ValueError(f"At least two state centers are required, got {len(centers)}")
+        self.centers = tuple((float(I), float(Q)) for I, Q in centers)
+        self.boundaries = {
+            (i, j): LinearBoundary.between(self.centers[i], self.centers[j])
+            for i in range(len(self.centers))
+            for j in range(i + 1, len(self.centers))
+        }
+
+    @property
+    def num_states(self) -> int:
+        return len(self.centers)
+
+    def assign_state(self, state: QuaVariable, I: QuaVariable, Q: QuaVariable) -> None:
+        """Assign the index of the center closest to ``(I, Q)`` to ``state``.
+
+        Must be called inside a QUA program.
+        """
+        self._assign_state(state, I, Q, best=0, candidate=1)
+
+    def _assign_state(self, state, I, Q, best: int, candidate: int) -> None:
+        if candidate == self.num_states:
+            assign(state, best)
+            return
+        with if_(self.boundaries[best, candidate].condition(I, Q)):
+            self._assign_state(state, I, Q, best=candidate, candidate=candidate + 1)
+        with else_():
+            self._assign_state(state, I, Q, best=best, candidate=candidate + 1)
+
+    def classify(self, I: float, Q: float) -> int:
+        """Return the state that ``assign_state`` assigns for the point ``(I, Q)``."""
+        best = 0
+        for candidate in range(1, self.num_states):
+            if self.boundaries[best, candidate].evaluate(I, Q):
+                best = candidate
+        return best
+
+
+@lru_cache(maxsize=256)
+def _cached_discriminator(centers: Tuple[Tuple[float, float], ...]) -> NearestCenterDiscriminator:
+    return NearestCenterDiscriminator(centers)
+
+
+def nearest_center_discriminator(
+    centers: Sequence[Sequence[float]],
+) -> NearestCenterDiscriminator:
+    """Return a ``NearestCenterDiscriminator``, reusing the one of equal centers.
+
+    Args:
+        centers: The ``(I, Q)`` center of each state.
+    """
+    return _cached_discriminator(tuple((float(I), float(Q)) for I, Q in centers))
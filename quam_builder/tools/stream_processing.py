@@ -0,0 +1,157 @@
+"""Stream-processing templates that reduce the results of all qubits on the controller.
+
+Saving every shot and averaging on the host transfers ``n_avg`` times more data than
+needed. These helpers build the usual reductions in the ``stream_processing`` block,
+for the stream layouts of the machine roots:
+
+- a list of streams with one stream per qubit, as returned by ``declare_qua_variables``,
+  is saved to one result per qubit, ``"<name>1"``, ``"<name>2"``, ...;
+- a single stream holding the values of ``num_qubits`` qubits per shot, as saved by
+  ``save_qua_array`` with the arrays of ``declare_qua_array_variables``, is saved to one
+  result ``"<name>"`` whose last axis is the qubit.
+
+The sweep ``shape`` is the shape of the loops inside the averaging loop, outermost
+first, so that a 2D map of ``len(amplitudes)`` by ``len(frequencies)`` points is saved
+with ``shape=(len(amplitudes), len(frequencies))``:
+
+    >>> with program() as prog:
+    ...     I, I_st, Q, Q_st, n, n_st = machine.declare_qua_variables()
+    ...     ...
+    ...     with stream_processing():
+    ...         n_st.save("n")
+    ...         save_averaged_iq(I_st, Q_st, shape=(len(amplitudes), len(frequencies)))
+
+All functions must be called inside ``with stream_processing():``.
+"""
+
+from typing import List, Optional, Sequence, Tuple, Union
+
+from qm.qua.type_hints import StreamType
+
+__all__ = [
+    "save_averaged",
+    "save_averaged_iq",
+    "save_state_populations",
+    "save_state_histograms",
+]
+
+StreamsType = Union[StreamType, Sequence[StreamType]]
+ShapeType = Union[int, Sequence[int]]
+
+
+def _as_shape(shape: ShapeType) -> Tuple[int, ...]:
+    return (shape,) if isinstance(shape, int) else tuple(shape)
+
+
+def _named_streams(
+    streams: StreamsType, name: str, num_qubits: Optional[int]
+) -> Tuple[List[Tuple[str, StreamType]], Tuple[int, ...]]:
+    """The streams with their result names, and the per-shot shape of each stream.
+
+    Raises:
+        ValueError: If ``num_qubits`` is given together with a list of streams.
+    """
+    if isinstance(streams, (list, tuple)):
+        if num_qubits is not None:
+            raise ValueError("num_qubits only applies to a single stream of several qubits")
+        return [(f"{name}{i + 1}", stream) for i, stream in enumerate(streams)], ()
+    shot_shape = () if num_qubits is None else (num_qubits,)
+    return [(name, streams)], shot_shape
+
+
+def save_averaged(
+    streams: StreamsType,
+    shape: ShapeType,
+    name: str,
+    num_qubits: Optional[int] = None,
+    boolean: bool = False,
+) -> None:
+    """Save the average over all shots of every point of the sweep.
+
+    Args:
+        streams: One stream per qubit, or a single stream with ``num_qubits`` values per
+            shot.
+        shape: The shape of the sweep within one shot, e.g. ``len(frequencies)`` or
+            ``(len(amplitudes), len(frequencies))``. Use ``()`` if there is no sweep.
+        name: The result name, suffixed with the qubit number for a list of streams.
+        num_qubits: The number of values per shot of a single stream, i.e. the qubit
+            axis of the result. Leave None for one stream per qubit or a single qubit.
+        boolean: Whether the streams hold booleans, which are converted to 0 and 1
+            before averaging.
+    """
+    named_streams, shot_shape = _named_streams(streams, name, num_qubits)
+    buffer_shape = _as_shape(shape) + shot_shape
+    for result_name, stream in named_streams:
+        if boolean:
+            stream = stream.boolean_to_int()
+        if buffer_shape:
+            stream = stream.buffer(*buffer_shape)
+        stream.average().save(result_name)
+
+
+def save_averaged_iq(
+    I_st: StreamsType,
+    Q_st: StreamsType,
+    shape: ShapeType,
+    num_qubits: Optional[int] = None,
+) -> None:
+    """Save the averaged I and Q of every point of the sweep as ``I``/``Q`` results.
+
+    Args:
+        I_st: The I streams, one per qubit or a single one with ``num_qubits`` values
+            per shot.
+        Q_st: The Q streams, in the same layout as ``I_st``.
+        shape: The shape of the sweep within one shot, see ``save_averaged``.
+        num_qubits: The number of values per shot of a single stream.
+    """
+    save_averaged(I_st, shape, "I", num_qubits=num_qubits)
+    save_averaged(Q_st, shape, "Q", num_qubits=num_qubits)
+
+
+def save_state_populations(
+    state_st: StreamsType,
+    shape: ShapeType,
+    num_qubits: Optional[int] = None,
+    boolean: bool = False,
+    name: str = "state",
+) -> None:
+    """Save the excited-state population of every point of the sweep.
+
+    The population is the average of the 0/1 states over all shots, e.g. of the states
+    assigned by ``readout_state`` or ``readout_states``.
+
+    Args:
+        state_st: The state streams, one per qubit or a single one with ``num_qubits``
+            values per shot.
+        shape: The shape of the sweep within one shot, see ``save_averaged``.
+        num_qubits: The number of values per shot of a single stream.
+        boolean: Whether the states are saved as booleans instead of integers.
+        name: The result name, suffixed with the qubit number for a list of streams.
+    """
+    save_averaged(state_st, shape, name, num_qubits=num_qubits, boolean=boolean)
+
+
+def save_state_histograms(
+    state_st: Sequence[StreamType],
+    num_states: int = 2,
+    name: str = "state_histogram",
+) -> None:
+    """Save the number of shots in each state, e.g. for the GEF states of a qutrit readout.
+
+    The histogram is taken over all shots and sweep points, with one bin per state
+    ``0, ..., num_states - 1``.
+
+    Args:
+        state_st: One integer state stream per qubit.
+        num_states: The number of states.
+        name: The result name, suffixed with the qubit number.
+
+    Raises:
+        ValueError: If ``state_st`` is a single stream, since the histogram cannot
+            separate the values of several qubits.
+    """
+    if not isinstance(state_st, (list, tuple)):
+        raise ValueError("State histograms require one stream per qubit")
+    bins = [[state, state] for state in range(num_states)]
+    for result_name, stream in _named_streams(state_st, name, None)[0]:
+        stream.histogram(bins).save(result_name)
@@ -853,6 +853,20 @@ class VoltageSequence:
         for tracker in self.state_trackers.values():
             tracker.reset_integrated_voltage()
 
+    def seed_levels(self, voltages: Dict[str, float]):
+        """
+        Sets the kept levels of gates without playing anything, e.g. to resume
+        from the voltages stored on the QUAM components. Gates that are not
+        specified in subsequent calls are then held at these levels.
+        Has no effect if the sequence was created with keep_levels=False.
+
+        Args:
+            voltages: A dictionary mapping gate names (physical or virtual) to
+                their current voltage level.
+        """
+        if self._keep_levels:
+            self._keep_levels_tracker.update_tracking(voltages_dict=voltages)
+
     def apply_to_config(self, config: dict):
         """
         Placeholder for ensuring QUA config has necessary definitions.
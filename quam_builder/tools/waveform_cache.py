@@ -0,0 +1,350 @@
+"""Opt-in memoization of expensive pulse waveforms.
+
+Some pulses (e.g. Gaussian-filtered flux pulses or DRAG pulses) are comparatively
+expensive to compute, and their samples are recomputed every time a configuration is
+generated. Pulses whose ``waveform_function`` is decorated with ``cached_waveform``
+look up their samples in the active ``WaveformCache`` instead, keyed on the pulse class
+and its parameter values.
+
+The cache is disabled by default. Enable it with ``enable_waveform_cache``:
+
+    >>> from quam_builder.tools.waveform_cache import enable_waveform_cache
+    >>> enable_waveform_cache(cache_dir="~/.cache/quam_builder/waveforms")
+    >>> config = machine.generate_config()  # computes and stores the waveforms
+    >>> config = machine.generate_config()  # reuses them
+
+Waveforms are kept in an in-memory LRU and, if a ``cache_dir`` is given, as ``.npy``
+files that are memory-mapped when read back. The on-disk store is trimmed to
+``max_disk_bytes`` by evicting the least recently used files.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "WaveformCache",
+    "enable_waveform_cache",
+    "disable_waveform_cache",
+    "get_waveform_cache",
+    "waveform_cache_key",
+    "cached_waveform",
+    "prefill_waveform_cache",
+]
+
+# Pulse fields that do not affect the waveform samples
+NON_WAVEFORM_FIELDS = {
+    "id",
+    "operation",
+    "digital_marker",
+    "threshold",
+    "rus_exit_threshold",
+    "integration_weights",
+    "integration_weights_angle",
+}
+
+# Part of every cache key. Bump it whenever the samples of a cached waveform function
+# change, so that waveforms stored on disk by older code are no longer used.
+WAVEFORM_CACHE_VERSION = 1
+
+_active_cache: Optional["WaveformCache"] = None
+
+
+class WaveformCache:
+    """In-memory LRU of waveforms, optionally backed by a memory-mapped store on disk.
+
+    Args:
+        cache_dir: Directory of the on-disk store. If None, waveforms are only kept
+            in memory.
+        max_memory_entries: Maximum number of waveforms kept in memory.
+        max_disk_bytes: Maximum total size of the on-disk store in bytes. The least
+            recently used files are removed once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_memory_entries: int = 512,
+        max_disk_bytes: int = 512 * 1024**2,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_dir = None
+        if cache_dir is not None:
+            self.cache_dir = Path(cache_dir).expanduser()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached waveform for a key, or None if it is not cached."""
+        waveform = self._memory.get(key)
+        if waveform is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return waveform
+
+        if self.cache_dir is not None:
+            path = self._path(key)
+            try:
+                waveform = np.load(path, mmap_mode="r")
+            except (OSError, ValueError):
+                waveform = None
+            if waveform is not None:
+                os.utime(path)  # Mark as recently used for the disk eviction
+                self._remember(key, waveform)
+                self.hits += 1
+                return waveform
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, waveform: np.ndarray) -> np.ndarray:
+        """Store a waveform and return the read-only array that is shared by all users."""
+        waveform = np.array(waveform)
+        waveform.flags.writeable = False
+        self._remember(key, waveform)
+        if self.cache_dir is not None:
+            self._write(key, waveform)
+        return waveform
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._memory:
+            return True
+        return self.cache_dir is not None and self._path(key).exists()
+
+    def clear(self, disk: bool = False) -> None:
+        """Remove all waveforms from memory, and from disk if ``disk`` is True."""
+        self._memory.clear()
+        if disk and self.cache_dir is not None:
+            for path in self.cache_dir.glob("*.npy"):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, waveform: np.ndarray) -> None:
+        self._memory[key] = waveform
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write(self, key: str, waveform: np.ndarray) -> None:
+        # Write to a temporary file first so that concurrent readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, waveform)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write waveform {key} to the cache: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+        self._evict_disk(keep=self._path(key))
+
+    def _evict_disk(self, keep: Path) -> None:
+        files = []
+        total_bytes = 0
+        for path in self.cache_dir.glob("*.npy"):
+            if path == keep:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+        total_bytes += keep.stat().st_size
+
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+
+def enable_waveform_cache(
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_memory_entries: int = 512,
+    max_disk_bytes: int = 512 * 1024**2,
+) -> WaveformCache:
+    """Enable waveform memoization for all pulses using ``cached_waveform``.
+
+    Args:
+        cache_dir: Directory of the on-disk store. If None, waveforms are only kept
+            in memory.
+        max_memory_entries: Maximum number of waveforms kept in memory.
+        max_disk_bytes: Maximum total size of the on-disk store in bytes.
+
+    Returns:
+        WaveformCache: The now active cache.
+    """
+    global _active_cache  # pylint: disable=global-statement
+    _active_cache = WaveformCache(
+        cache_dir=cache_dir,
+        max_memory_entries=max_memory_entries,
+        max_disk_bytes=max_disk_bytes,
+    )
+    return _active_cache
+
+
+def disable_waveform_cache() -> None:
+    """Disable waveform memoization. Files in the on-disk store are kept."""
+    global _active_cache  # pylint: disable=global-statement
+    _active_cache = None
+
+
+def get_waveform_cache() -> Optional[WaveformCache]:
+    """Return the active waveform cache, or None if memoization is disabled."""
+    return _active_cache
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(v) for v in value)
+    if value is None or isinstance(value, (bool, int, float, complex, str)):
+        return value
+    raise TypeError(f"Cannot use value of type {type(value).__name__} in a waveform cache key")
+
+
+def _waveform_parameters(pulse) -> Optional[Dict[str, Any]]:
+    """The resolved values of the pulse fields that affect its waveform.
+
+    Returns None if a value cannot be part of a key (e.g. a nested component).
+    """
+    parameters = {}
+    for field in dataclasses.fields(pulse):
+        if field.name in NON_WAVEFORM_FIELDS or field.name == "parent":
+            continue
+        try:
+            parameters[field.name] = _normalize_value(getattr(pulse, field.name))
+        except (TypeError, AttributeError, ValueError):
+            return None
+    return parameters
+
+
+def _parameters_key(cls: type, parameters: Dict[str, Any]) -> str:
+    items = [WAVEFORM_CACHE_VERSION, f"{cls.__module__}.{cls.__qualname__}"]
+    items.extend(parameters.items())
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+def waveform_cache_key(pulse) -> Optional[str]:
+    """Return the cache key of a pulse, based on its class and parameter values.
+
+    The key also includes ``WAVEFORM_CACHE_VERSION``.
+
+    Returns None if a parameter cannot be part of a key (e.g. a nested component),
+    in which case the waveform is not cached.
+    """
+    parameters = _waveform_parameters(pulse)
+    if parameters is None:
+        return None
+    return _parameters_key(type(pulse), parameters)
+
+
+def cached_waveform(waveform_function: Callable) -> Callable:
+    """Decorator for ``Pulse.waveform_function`` that memoizes its result.
+
+    Has no effect unless a cache is enabled with ``enable_waveform_cache``. Only
+    array results are cached; cached waveforms are returned as read-only arrays.
+    """
+
+    @functools.wraps(waveform_function)
+    def wrapper(self):
+        cache = _active_cache
+        if cache is None:
+            return waveform_function(self)
+
+        key = waveform_cache_key(self)
+        if key is None:
+            return waveform_function(self)
+
+        waveform = cache.get(key)
+        if waveform is not None:
+            return waveform
+
+        waveform = waveform_function(self)
+        if not isinstance(waveform, np.ndarray):
+            return waveform
+        return cache.put(key, waveform)
+
+    return wrapper
+
+
+def prefill_waveform_cache(components: Iterable[Any], cache: Optional[WaveformCache] = None) -> int:
+    """Compute the waveforms of many pulses in batches and store them in the cache.
+
+    Pulses of the same class and length whose class provides a
+    ``batch_waveform_function`` classmethod (e.g. the DRAG pulses) are computed together
+    as one array operation, with each distinct set of parameters computed once. A
+    subsequent ``generate_config`` then finds all of these waveforms in the cache.
+
+    The parameters of each pulse are resolved once. For short pulses such as the DRAG
+    gates, resolving their references costs far more than computing the samples, and
+    ``generate_config`` resolves them again to look up the cache keys, so prefilling
+    does not make it faster; see ``benchmarks/drag_batch_synthesis.py``.
+
+    Example:
+        >>> enable_waveform_cache()
+        >>> prefill_waveform_cache(machine.iterate_components())
+        >>> config = machine.generate_config()
+
+    Args:
+        components: The components to consider, e.g. ``machine.iterate_components()``.
+            Components without a ``batch_waveform_function`` are ignored.
+        cache: The cache to fill. Defaults to the active cache.
+
+    Returns:
+        int: The number of waveforms that were computed.
+
+    Raises:
+        ValueError: If no cache is given and no cache is enabled.
+    """
+    cache = cache if cache is not None else _active_cache
+    if cache is None:
+        raise ValueError("No waveform cache is enabled, call enable_waveform_cache() first")
+
+    # The batches are computed from the resolved parameters, since resolving the
+    # references of the pulse fields costs far more than the waveforms themselves
+    groups: Dict[Tuple[type, int], Dict[str, SimpleNamespace]] = {}
+    for component in components:
+        if not hasattr(type(component), "batch_waveform_function"):
+            continue
+        parameters = _waveform_parameters(component)
+        if parameters is None or "length" not in parameters:
+            continue
+        key = _parameters_key(type(component), parameters)
+        if key in cache:
+            continue
+        group = groups.setdefault((type(component), parameters["length"]), {})
+        group.setdefault(key, SimpleNamespace(**parameters))
+
+    num_computed = 0
+    for (cls, _), pulses in groups.items():
+        keys: List[str] = list(pulses)
+        waveforms = cls.batch_waveform_function(list(pulses.values()))
+        for key, waveform in zip(keys, waveforms):
+            if waveform is not None:
+                cache.put(key, waveform)
+                num_computed += 1
+    logger.debug(f"Prefilled the waveform cache with {num_computed} waveforms")
+    return num_computed
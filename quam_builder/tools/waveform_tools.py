@@ -0,0 +1,328 @@
+"""Tools for the waveform memory of QUA configurations.
+
+Pulses that are defined independently on every qubit or channel, e.g. the default
+pulses added by the builders, often produce identical samples. Each of them becomes
+its own entry in ``config["waveforms"]``, which costs upload time and waveform memory.
+``deduplicate_waveforms`` collapses such entries into a single shared waveform.
+
+``analyze_waveform_memory`` estimates the waveform memory of a machine per controller
+and FEM without generating its config, to find the heaviest pulses before uploading.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from quam.components.channels import Channel, IQChannel, MWChannel
+from quam.components.pulses import Pulse
+from quam.core import QuamRoot
+
+from quam_builder.common.pulses import FlatTopPulse
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "BYTES_PER_SAMPLE",
+    "WaveformDeduplicationReport",
+    "waveform_fingerprint",
+    "waveform_num_samples",
+    "deduplicate_waveforms",
+    "WaveformMemoryEntry",
+    "WaveformMemoryReport",
+    "analyze_waveform_memory",
+]
+
+# Waveform samples are uploaded as double-precision floats
+BYTES_PER_SAMPLE = 8
+
+
+@dataclass
+class WaveformDeduplicationReport:
+    """Summary of a ``deduplicate_waveforms`` pass.
+
+    Attributes:
+        num_waveforms_before: Number of waveforms in the config before deduplication.
+        num_waveforms_after: Number of waveforms in the config after deduplication.
+        samples_saved: Number of samples that no longer need to be uploaded.
+        bytes_saved: Size of the removed samples, see ``BYTES_PER_SAMPLE``.
+        merged: Map from each removed waveform name to the waveform that replaces it.
+    """
+
+    num_waveforms_before: int = 0
+    num_waveforms_after: int = 0
+    samples_saved: int = 0
+    bytes_saved: int = 0
+    merged: Dict[str, str] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return (
+            f"Merged {len(self.merged)} duplicate waveforms "
+            f"({self.num_waveforms_before} -> {self.num_waveforms_after}), "
+            f"saving {self.samples_saved} samples ({self.bytes_saved} bytes)"
+        )
+
+
+def waveform_num_samples(waveform: Dict[str, Any]) -> int:
+    """Return the number of samples stored for a waveform entry of a QUA config."""
+    if waveform.get("type") == "arbitrary":
+        return len(waveform["samples"])
+    return 1
+
+
+def waveform_fingerprint(waveform: Dict[str, Any]) -> Tuple[Hashable, ...]:
+    """Return a hashable key that is equal for waveform entries with identical content.
+
+    Arbitrary waveforms are keyed by a digest of their samples, constant waveforms by
+    their sample value. All other fields (e.g. ``max_allowed_error``) are part of the key.
+
+    Args:
+        waveform: A waveform entry of ``config["waveforms"]``.
+    """
+    key = []
+    for name, value in sorted(waveform.items()):
+        if name == "samples":
+            samples = np.ascontiguousarray(value, dtype=np.float64)
+            value = (len(samples), hashlib.sha1(samples.tobytes()).hexdigest())
+        elif name == "sample":
+            value = float(value)
+        elif isinstance(value, (list, dict)):
+            value = repr(value)
+        key.append((name, value))
+    return tuple(key)
+
+
+def deduplicate_waveforms(config: Dict[str, Any]) -> WaveformDeduplicationReport:
+    """Collapse waveforms with identical content into shared waveform entries.
+
+    The config is modified in place: duplicate entries are removed from
+    ``config["waveforms"]`` and every pulse that used them is pointed to the first
+    waveform with the same content. Overridable waveforms are never merged, since they
+    can be updated individually at runtime.
+
+    Args:
+        config: A QUA configuration, e.g. from ``machine.generate_config()``.
+
+    Returns:
+        WaveformDeduplicationReport: The merged waveforms and the bytes saved.
+    """
+    waveforms = config.get("waveforms", {})
+    report = WaveformDeduplicationReport(num_waveforms_before=len(waveforms))
+
+    canonical_names: Dict[Tuple[Hashable, ...], str] = {}
+    for name, waveform in waveforms.items():
+        if waveform.get("is_overridable", False):
+            continue
+        key = waveform_fingerprint(waveform)
+        if key in canonical_names:
+            report.merged[name] = canonical_names[key]
+            report.samples_saved += waveform_num_samples(waveform)
+        else:
+            canonical_names[key] = name
+
+    if report.merged:
+        for pulse in config.get("pulses", {}).values():
+            pulse_waveforms = pulse.get("waveforms", {})
+            for label, waveform_name in pulse_waveforms.items():
+                if waveform_name in report.merged:
+                    pulse_waveforms[label] = report.merged[waveform_name]
+        for name in report.merged:
+            del waveforms[name]
+
+    report.num_waveforms_after = len(waveforms)
+    report.bytes_saved = report.samples_saved * BYTES_PER_SAMPLE
+    logger.debug(str(report))
+    return report
+
+
+@dataclass
+class WaveformMemoryEntry:
+    """Waveform memory used by a single pulse.
+
+    Attributes:
+        channel: Name of the channel (element) that plays the pulse.
+        pulse: Name of the pulse in ``channel.operations``.
+        controller: Controller of the channel's output port.
+        fem: FEM slot of the channel's output port, None for an OPX+.
+        num_samples: Number of arbitrary waveform samples, summed over the I and Q
+            waveforms. Constant waveforms are not counted.
+        splittable_samples: Samples that ``FlatTopPulse.split_flat_top`` would save.
+    """
+
+    channel: str
+    pulse: str
+    controller: Optional[str]
+    fem: Optional[int]
+    num_samples: int
+    splittable_samples: int = 0
+
+
+@dataclass
+class WaveformMemoryReport:
+    """Waveform memory estimate of a machine, see ``analyze_waveform_memory``.
+
+    Attributes:
+        entries: The waveform memory of each pulse, largest first.
+        samples_per_controller: Number of samples per controller.
+        samples_per_fem: Number of samples per ``(controller, fem)``.
+        duplicate_samples: Samples that ``deduplicate_waveforms`` would remove.
+        splittable_samples: Samples that splitting all flat-top pulses would remove.
+    """
+
+    entries: List[WaveformMemoryEntry] = field(default_factory=list)
+    samples_per_controller: Dict[Optional[str], int] = field(default_factory=dict)
+    samples_per_fem: Dict[Tuple[Optional[str], Optional[int]], int] = field(default_factory=dict)
+    duplicate_samples: int = 0
+    splittable_samples: int = 0
+
+    @property
+    def total_samples(self) -> int:
+        return sum(entry.num_samples for entry in self.entries)
+
+    def largest(self, num: int = 10) -> List[WaveformMemoryEntry]:
+        """Return the ``num`` pulses that use the most waveform memory."""
+        return self.entries[:num]
+
+    def __str__(self) -> str:
+        lines = [
+            f"Waveform memory: {self.total_samples} samples "
+            f"({self.total_samples * BYTES_PER_SAMPLE} bytes)"
+        ]
+        for (controller, fem), num_samples in sorted(self.samples_per_fem.items(), key=str):
+            location = controller if fem is None else f"{controller}/{fem}"
+            lines.append(f"  {location}: {num_samples} samples")
+        lines.append("Largest pulses:")
+        for entry in self.largest(5):
+            lines.append(f"  {entry.channel}.{entry.pulse}: {entry.num_samples} samples")
+        lines.append(
+            f"Estimated savings: {self.duplicate_samples} samples from deduplication, "
+            f"{self.splittable_samples} samples from splitting flat-top pulses"
+        )
+        return "\n".join(lines)
+
+
+def _channel_location(channel: Channel) -> Tuple[Optional[str], Optional[int]]:
+    """Return the controller and FEM of the first output port of a channel."""
+    for attr in ("opx_output", "opx_output_I", "opx_output_Q"):
+        port = getattr(channel, attr, None)
+        if port is None or isinstance(port, str):
+            continue
+        if hasattr(port, "controller_id"):
+            return port.controller_id, getattr(port, "fem_id", None)
+        if isinstance(port, (list, tuple)):
+            return port[0], port[1] if len(port) == 3 else None
+    return None, None
+
+
+def _pulse_name(pulse: Pulse) -> str:
+    if pulse.id is not None:
+        return str(pulse.id)
+    return pulse.parent.get_attr_name(pulse)
+
+
+def _uploaded_waveforms(pulse: Pulse) -> List[np.ndarray]:
+    """Return the arbitrary waveforms that config generation creates for a pulse."""
+    if isinstance(pulse, FlatTopPulse) and pulse.split_flat_top:
+        waveforms = [np.asarray(pulse.flat_top_waveform(part)) for part in ("rise", "fall")]
+    else:
+        waveform = pulse.calculate_waveform()
+        if not isinstance(waveform, (list, np.ndarray)):
+            return []  # Constant waveform
+        waveforms = [np.asarray(waveform)]
+
+    uploaded = []
+    for waveform in waveforms:
+        if np.iscomplexobj(waveform):
+            uploaded.extend([waveform.real, waveform.imag])
+        elif isinstance(pulse.channel, (IQChannel, MWChannel)) and not (
+            isinstance(pulse, FlatTopPulse) and pulse.split_flat_top
+        ):
+            uploaded.extend([waveform, np.zeros_like(waveform)])
+        else:
+            uploaded.append(waveform)
+    return uploaded
+
+
+def _splittable_samples(pulse: Pulse, num_quadratures: int) -> int:
+    if not isinstance(pulse, FlatTopPulse) or pulse.split_flat_top:
+        return 0
+    try:
+        pulse._validate_split()  # pylint: disable=protected-access
+    except ValueError:
+        return 0
+    return pulse.flat_length * num_quadratures
+
+
+def analyze_waveform_memory(
+    machine: QuamRoot, max_samples_per_fem: Optional[int] = None
+) -> WaveformMemoryReport:
+    """Estimate the waveform memory of a machine without generating its config.
+
+    The arbitrary waveform samples of every pulse attached to a channel are attributed
+    to the controller and FEM of the channel's output port. Waveforms that are
+    memoized with ``quam_builder.tools.waveform_cache`` are not recomputed.
+
+    Args:
+        machine: The machine, e.g. a ``BaseQuam``, ``BaseQuamQD`` or ``BaseQuamNV``.
+        max_samples_per_fem: If given, raise a ValueError when a controller or FEM
+            exceeds this number of samples.
+
+    Returns:
+        WaveformMemoryReport: Sample totals, the largest pulses and estimated savings.
+
+    Raises:
+        ValueError: If ``max_samples_per_fem`` is exceeded.
+    """
+    report = WaveformMemoryReport()
+    samples_per_controller = defaultdict(int)
+    samples_per_fem = defaultdict(int)
+    seen_fingerprints = set()
+
+    for component in machine.iterate_components():
+        if not isinstance(component, Pulse) or component.channel is None:
+            continue
+        waveforms = _uploaded_waveforms(component)
+        if not waveforms:
+            continue
+
+        controller, fem = _channel_location(component.channel)
+        entry = WaveformMemoryEntry(
+            channel=component.channel.name,
+            pulse=_pulse_name(component),
+            controller=controller,
+            fem=fem,
+            num_samples=sum(len(waveform) for waveform in waveforms),
+            splittable_samples=_splittable_samples(component, len(waveforms)),
+        )
+        report.entries.append(entry)
+        samples_per_controller[controller] += entry.num_samples
+        samples_per_fem[(controller, fem)] += entry.num_samples
+        report.splittable_samples += entry.splittable_samples
+
+        for waveform in waveforms:
+            key = waveform_fingerprint({"type": "arbitrary", "samples": waveform})
+            if key in seen_fingerprints:
+                report.duplicate_samples += len(waveform)
+            seen_fingerprints.add(key)
+
+    report.entries.sort(key=lambda entry: entry.num_samples, reverse=True)
+    report.samples_per_controller = dict(samples_per_controller)
+    report.samples_per_fem = dict(samples_per_fem)
+    logger.debug(str(report))
+
+    if max_samples_per_fem is not None:
+        exceeded = {
+            location: num_samples
+            for location, num_samples in report.samples_per_fem.items()
+            if num_samples > max_samples_per_fem
+        }
+        if exceeded:
+            heaviest = [e for e in report.entries if (e.controller, e.fem) in exceeded][:5]
+            largest = ", ".join(f"{e.channel}.{e.pulse} ({e.num_samples})" for e in heaviest)
+            raise ValueError(
+                f"Waveform memory exceeds {max_samples_per_fem} samples on {exceeded}. "
+                f"Largest pulses: {largest}"
+            )
+    return report
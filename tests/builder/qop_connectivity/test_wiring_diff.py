@@ -0,0 +1,169 @@
+"""Tests for the incremental wiring regeneration."""
+
+import importlib
+
+import pytest
+from quam.components.ports import FEMPortsContainer
+from quam.core.quam_classes import QuamDict
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.builder.qop_connectivity.reference_index import (
+    ReferenceIndex,
+    get_reference_index,
+)
+from quam_builder.builder.qop_connectivity.wiring_diff import apply_wiring_diff, diff_wiring
+from quam_builder.builder.superconducting.modify_quam import apply_qubit_wiring_diff
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+# The packages re-export the functions under the same names as the modules
+build_quam_module = importlib.import_module("quam_builder.builder.superconducting.build_quam")
+build_quam_wiring_module = importlib.import_module(
+    "quam_builder.builder.qop_connectivity.build_quam_wiring"
+)
+
+
+@pytest.fixture(autouse=True)
+def quam_state_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("QUAM_STATE_PATH", str(tmp_path / "quam_state"))
+
+
+def _wiring(qubits) -> dict:
+    """The wiring that ``create_wiring`` generates for qubits on an MW-FEM and an LF-FEM."""
+    return {
+        "qubits": {
+            f"q{i}": {
+                "rr": {
+                    "opx_input": "#/ports/mw_inputs/con1/1/1",
+                    "opx_output": "#/ports/mw_outputs/con1/1/1",
+                },
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/1/{i + 1}"},
+                "z": {"opx_output": f"#/ports/analog_outputs/con1/2/{i}"},
+            }
+            for i in qubits
+        }
+    }
+
+
+def _wired_machine(qubits) -> FluxTunableQuam:
+    machine = FluxTunableQuam(ports=FEMPortsContainer())
+    machine.wiring = _wiring(qubits)
+    return machine
+
+
+def test_diff_wiring_reports_line_changes():
+    old = {"qubits": {"q1": {"xy": {"opx_output": "#/ports/mw_outputs/con1/1/2"}, "z": {}}}}
+    new = {
+        "qubits": {
+            "q1": {"xy": {"opx_output": "#/ports/mw_outputs/con1/1/3"}},
+            "q2": {"xy": {"opx_output": "#/ports/mw_outputs/con1/1/4"}},
+        }
+    }
+    diff = diff_wiring(old, new)
+
+    assert list(diff.added) == [("qubits", "q2", "xy")]
+    assert list(diff.removed) == [("qubits", "q1", "z")]
+    assert diff.changed == {
+        ("qubits", "q1", "xy"): (
+            {"opx_output": "#/ports/mw_outputs/con1/1/2"},
+            {"opx_output": "#/ports/mw_outputs/con1/1/3"},
+        )
+    }
+    assert not diff_wiring(new, new)
+
+
+def test_incremental_build_only_touches_new_lines(monkeypatch):
+    machine = _wired_machine([1, 2])
+    build_quam_module.add_ports(machine)
+    shared_port = machine.ports.get_mw_output("con1", 1, 1)
+
+    # Stands in for a Connectivity, so that only the wiring diff is exercised
+    monkeypatch.setattr(build_quam_wiring_module, "create_wiring", lambda wiring: wiring)
+    build_quam_wiring_module.build_quam_wiring(
+        _wiring([1, 2, 3]), "127.0.0.1", "cluster", machine, incremental=True
+    )
+
+    assert machine.wiring == _wiring([1, 2, 3])
+    assert machine.ports.get_mw_output("con1", 1, 1) is shared_port
+    assert sorted(machine.ports.analog_outputs["con1"][2]) == [1, 2, 3]
+
+
+def test_apply_wiring_diff_removes_unused_ports():
+    machine = _wired_machine([1, 2])
+    build_quam_module.add_ports(machine)
+
+    apply_wiring_diff(machine, diff_wiring(machine.wiring, _wiring([1])))
+
+    assert list(machine.wiring["qubits"]) == ["q1"]
+    assert sorted(machine.ports.mw_outputs["con1"][1]) == [1, 2]
+    assert sorted(machine.ports.analog_outputs["con1"][2]) == [1]
+
+
+def test_apply_qubit_wiring_diff_updates_only_affected_qubits():
+    machine = _wired_machine([1, 2, 3])
+    build_quam_module.add_ports(machine)
+    build_quam_module.add_transmons(machine)
+    q1_xy = machine.qubits["q1"].xy
+
+    new_wiring = _wiring([1, 2, 3])
+    new_wiring["qubits"]["q2"]["xy"]["opx_output"] = "#/ports/mw_outputs/con1/1/8"
+    del new_wiring["qubits"]["q3"]
+    apply_qubit_wiring_diff(machine, diff_wiring(machine.wiring, new_wiring))
+
+    assert machine.qubits["q1"].xy is q1_xy
+    assert machine.qubits["q2"].xy.opx_output.port_id == 8
+    assert "saturation" in machine.qubits["q2"].xy.operations
+    assert "q3" not in machine.qubits
+    assert machine.wiring == new_wiring
+    assert sorted(machine.ports.mw_outputs["con1"][1]) == [1, 2, 8]
+    machine.generate_config()
+
+
+def test_apply_qubit_wiring_diff_applies_each_line_once(monkeypatch):
+    machine = _wired_machine([1, 2, 3])
+    build_quam_module.add_ports(machine)
+    build_quam_module.add_transmons(machine)
+    index = get_reference_index(machine)
+    index.wiring_lines_using_port("#/ports/mw_outputs/con1/1/1")  # Build the index
+
+    updates = []
+    for method in ("add_wiring_line", "remove_wiring_line"):
+        original = getattr(index, method)
+        monkeypatch.setattr(
+            index,
+            method,
+            lambda line, ports, method=method, original=original: (
+                updates.append((method, line)),
+                original(line, ports),
+            ),
+        )
+
+    new_wiring = _wiring([1, 2, 4])
+    new_wiring["qubits"]["q2"]["xy"]["opx_output"] = "#/ports/mw_outputs/con1/1/8"
+    new_wiring["qubit_pairs"] = {
+        "q1-2": {"coupler": {"opx_output": "#/ports/analog_outputs/con1/2/8"}}
+    }
+    apply_qubit_wiring_diff(machine, diff_wiring(machine.wiring, new_wiring))
+
+    assert machine.wiring == new_wiring
+    assert len(updates) == len(set(updates))
+    assert ("remove_wiring_line", ("qubits", "q2", "xy")) in updates
+    q2_xy_wiring = machine.wiring["qubits"]["q2"]["xy"]
+    assert isinstance(q2_xy_wiring, QuamDict)
+    assert isinstance(machine.wiring["qubit_pairs"]["q1-2"]["coupler"], QuamDict)
+    # The channel refers to the wiring line that add_channel stored
+    assert machine.qubits["q2"].xy.get_raw_value("opx_output") == "#/wiring/qubits/q2/xy/opx_output"
+    assert machine.qubits["q2"].xy.opx_output.port_id == 8
+    assert machine.qubits["q4"].z.opx_output.port_id == 4
+
+    rebuilt = ReferenceIndex(machine)
+    for port_id in range(1, 9):
+        for port_type in ("mw_outputs", "analog_outputs"):
+            reference = (
+                f"#/ports/{port_type}/con1/{1 if port_type == 'mw_outputs' else 2}/{port_id}"
+            )
+            assert index.wiring_lines_using_port(reference) == rebuilt.wiring_lines_using_port(
+                reference
+            )
+    assert sorted(machine.ports.mw_outputs["con1"][1]) == [1, 2, 5, 8]
+    assert sorted(machine.ports.analog_outputs["con1"][2]) == [1, 2, 4, 8]
@@ -0,0 +1,127 @@
+"""Tests for caching Stage 1 quantum dot builds."""
+
+import shutil
+
+from qualang_tools.wirer.connectivity.wiring_spec import WiringLineType
+from quam.components.ports import FEMPortsContainer
+
+import pytest
+from quam_builder.architecture.quantum_dots.qpu import BaseQuamQD, LossDiVincenzoQuam
+from quam_builder.builder.quantum_dots import stage1_cache
+from quam_builder.builder.quantum_dots.build_quam import (
+    build_base_quam,
+    build_loss_divincenzo_quam,
+)
+from quam_builder.builder.quantum_dots.stage1_cache import (
+    build_base_quam_cached,
+    stage1_fingerprint,
+    stage1_wiring,
+)
+
+
+@pytest.fixture(autouse=True)
+def _set_quam_state_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("QUAM_STATE_PATH", str(tmp_path / "quam_state"))
+
+
+def _wiring(drive_port_offset: int = 0) -> dict:
+    return {
+        "qubits": {
+            f"q{i}": {
+                WiringLineType.PLUNGER_GATE.value: {
+                    "opx_output": f"#/ports/analog_outputs/con1/1/{i}"
+                },
+                WiringLineType.DRIVE.value: {
+                    "opx_output": f"#/ports/mw_outputs/con1/2/{i + drive_port_offset}"
+                },
+            }
+            for i in (1, 2)
+        },
+        "qubit_pairs": {
+            "q1_q2": {
+                WiringLineType.BARRIER_GATE.value: {"opx_output": "#/ports/analog_outputs/con1/1/3"}
+            },
+        },
+        "readout": {
+            "s1": {
+                WiringLineType.SENSOR_GATE.value: {"opx_output": "#/ports/analog_outputs/con1/1/4"},
+                WiringLineType.RF_RESONATOR.value: {
+                    "opx_output": "#/ports/mw_outputs/con1/3/1",
+                    "opx_input": "#/ports/mw_inputs/con1/3/1",
+                },
+            },
+        },
+    }
+
+
+def _machine(wiring: dict) -> BaseQuamQD:
+    machine = BaseQuamQD()
+    machine.ports = FEMPortsContainer()
+    machine.wiring = wiring
+    return machine
+
+
+def test_stage1_wiring_drops_drive_lines():
+    wiring = {"qubits": {"q1": {WiringLineType.DRIVE.value: {"opx_output": "#/ports/x"}}}}
+    assert stage1_wiring(wiring) == {}
+    assert stage1_wiring(_wiring())["qubits"]["q1"] == {
+        WiringLineType.PLUNGER_GATE.value: {"opx_output": "#/ports/analog_outputs/con1/1/1"}
+    }
+
+
+def test_fingerprint_ignores_drive_wiring():
+    fingerprint = stage1_fingerprint(_machine(_wiring()))
+
+    assert stage1_fingerprint(_machine(_wiring(drive_port_offset=4))) == fingerprint
+    changed_wiring = _wiring()
+    changed_wiring["qubit_pairs"]["q1_q2"][WiringLineType.BARRIER_GATE.value][
+        "opx_output"
+    ] = "#/ports/analog_outputs/con1/1/8"
+    assert stage1_fingerprint(_machine(changed_wiring)) != fingerprint
+
+
+def test_cached_build_matches_full_build(tmp_path):
+    expected = build_loss_divincenzo_quam(
+        build_base_quam(_machine(_wiring()), save=False), save=False
+    )
+
+    base = build_base_quam_cached(_machine(_wiring()), cache_dir=tmp_path / "cache")
+    result = build_loss_divincenzo_quam(base, save=False)
+
+    assert isinstance(result, LossDiVincenzoQuam)
+    assert result.to_dict() == expected.to_dict()
+
+
+def test_cache_hit_skips_stage1_and_uses_new_drive_wiring(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    build_base_quam_cached(_machine(_wiring()), cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Stage 1 should have been loaded from the cache")
+
+    monkeypatch.setattr(stage1_cache, "build_base_quam", fail)
+    for _ in range(2):
+        base = build_base_quam_cached(_machine(_wiring(drive_port_offset=4)), cache_dir=cache_dir)
+        result = build_loss_divincenzo_quam(base, save=False)
+
+        assert len(list(cache_dir.iterdir())) == 1
+        assert result.qubits["q1"].xy.opx_output.port_id == 5
+        assert result.ports.get_mw_output("con1", 2, 5) is not None
+
+
+def test_concurrently_stored_build_is_loaded(tmp_path, monkeypatch):
+    build_base_quam_cached(_machine(_wiring()), cache_dir=tmp_path / "other")
+    (stored,) = (tmp_path / "other").iterdir()
+    cache_dir = tmp_path / "cache"
+    build = stage1_cache.build_base_quam
+
+    def build_while_another_process_stores(*args, **kwargs):
+        build(*args, **kwargs)
+        shutil.copytree(stored, cache_dir / stored.name)
+
+    monkeypatch.setattr(stage1_cache, "build_base_quam", build_while_another_process_stores)
+    base = build_base_quam_cached(_machine(_wiring()), cache_dir=cache_dir)
+
+    assert [path.name for path in cache_dir.iterdir()] == [stored.name]
+    expected = build_base_quam_cached(_machine(_wiring()), cache_dir=tmp_path / "other")
+    assert base.to_dict() == expected.to_dict()
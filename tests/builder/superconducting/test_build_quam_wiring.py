@@ -0,0 +1,108 @@
+"""Tests for the wiring-driven steps of the superconducting QuAM builder."""
+
+import importlib
+
+import pytest
+from quam.components import Octave
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+# The package re-exports the function under the same name as the module
+build_quam_module = importlib.import_module("quam_builder.builder.superconducting.build_quam")
+
+
+def _machine(num_qubits: int) -> FluxTunableQuam:
+    machine = FluxTunableQuam(ports=FEMPortsContainer())
+    machine.wiring = {
+        "qubits": {
+            f"q{i}": {
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/1/{i + 2}"},
+                "rr": {
+                    "opx_output": "#/ports/mw_outputs/con1/1/1",
+                    "opx_input": "#/ports/mw_inputs/con1/1/1",
+                },
+                "z": {"opx_output": f"#/ports/analog_outputs/con1/5/{i + 1}"},
+            }
+            for i in range(num_qubits)
+        }
+    }
+    return machine
+
+
+def test_resolve_wiring_references_is_flat():
+    table = build_quam_module.resolve_wiring_references(_machine(2))
+
+    assert len(table) == 2 * 4
+    assert table[0] == build_quam_module.WiringReference(
+        "qubits", "q0", "xy", "opx_output", "#/ports/mw_outputs/con1/1/2"
+    )
+
+
+def test_add_ports_creates_shared_ports_once(monkeypatch):
+    machine = _machine(3)
+    created = []
+    reference_to_port = type(machine.ports).reference_to_port
+
+    def counting_reference_to_port(self, port_reference, *args, **kwargs):
+        created.append(port_reference)
+        return reference_to_port(self, port_reference, *args, **kwargs)
+
+    monkeypatch.setattr(type(machine.ports), "reference_to_port", counting_reference_to_port)
+    build_quam_module.add_ports(machine)
+
+    assert len(created) == len(set(created)) == 2 + 3 + 3
+    assert sorted(machine.ports.mw_outputs["con1"][1]) == [1, 2, 3, 4]
+    assert sorted(machine.ports.analog_outputs["con1"][5]) == [1, 2, 3]
+
+
+def test_add_octaves_creates_each_octave_once(tmp_path, monkeypatch):
+    machine = FluxTunableQuam(ports=FEMPortsContainer())
+    machine.wiring = {
+        "qubits": {
+            qubit_id: {
+                "xy": {"frequency_converter_up": "#/octaves/oct1/RF_outputs/2"},
+                "rr": {"frequency_converter_up": "#/octaves/oct1/RF_outputs/1"},
+            }
+            for qubit_id in ("q0", "q1")
+        }
+    }
+    initialized = []
+    monkeypatch.setattr(
+        Octave,
+        "initialize_frequency_converters",
+        lambda self: initialized.append(self.name),
+    )
+
+    build_quam_module.add_octaves(machine, calibration_db_path=tmp_path)
+
+    assert initialized == ["oct1"]
+    assert list(machine.octaves) == ["oct1"]
+
+
+def test_build_steps_accept_precomputed_references():
+    machine = _machine(2)
+    wiring_references = build_quam_module.resolve_wiring_references(machine)
+
+    build_quam_module.add_ports(machine, wiring_references=wiring_references)
+    build_quam_module.add_transmons(machine)
+    build_quam_module.add_pulses(machine)
+
+    assert machine.active_qubit_names == ["q0", "q1"]
+    assert machine.qubits["q1"].xy.opx_output.port_id == 3
+    assert "saturation" in machine.qubits["q0"].xy.operations
+
+
+def test_mw_resonator_links_the_downconverter_to_its_output_port():
+    machine = _machine(2)
+    build_quam_module.add_ports(machine)
+    build_quam_module.add_transmons(machine)
+
+    resonator = machine.qubits["q1"].resonator
+    assert (
+        resonator.opx_input.get_raw_value("downconverter_frequency")
+        == "#/ports/mw_outputs/con1/1/1/upconverter_frequency"
+    )
+    assert resonator.opx_input.downconverter_frequency == resonator.opx_output.upconverter_frequency
@@ -0,0 +1,109 @@
+"""Tests for building several machines in a process pool."""
+
+import importlib
+import json
+
+import pytest
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.builder.batch_build import BatchBuildError, BuildSpec, build_quams
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+# The package re-exports the function under the same name as the module
+build_quam_wiring_module = importlib.import_module(
+    "quam_builder.builder.qop_connectivity.build_quam_wiring"
+)
+
+
+def _wiring(num_qubits: int) -> dict:
+    return {
+        "qubits": {
+            f"q{i}": {
+                "rr": {
+                    "opx_input": "#/ports/mw_inputs/con1/1/1",
+                    "opx_output": "#/ports/mw_outputs/con1/1/1",
+                },
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/1/{i + 1}"},
+                "z": {"opx_output": f"#/ports/analog_outputs/con1/2/{i}"},
+            }
+            for i in range(1, num_qubits + 1)
+        }
+    }
+
+
+def _create_wiring(connectivity):
+    if connectivity is None:
+        raise ValueError("Invalid connectivity")
+    return _wiring(connectivity)
+
+
+@pytest.fixture(autouse=True)
+def quam_state_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("QUAM_STATE_PATH", str(tmp_path / "global_state"))
+
+
+@pytest.fixture(autouse=True)
+def wiring_from_qubit_count(monkeypatch):
+    """Use the number of qubits as connectivity, so that only the batch logic is exercised.
+
+    Forked worker processes inherit the patched functions.
+    """
+    monkeypatch.setattr(build_quam_wiring_module, "create_wiring", _create_wiring)
+    monkeypatch.setattr(
+        build_quam_wiring_module,
+        "add_ports_container",
+        lambda connectivity, machine: setattr(machine, "ports", FEMPortsContainer()),
+    )
+
+
+def _specs(tmp_path, qubit_counts):
+    return [
+        BuildSpec(f"chip_{i}", num_qubits, FluxTunableQuam, tmp_path / f"chip_{i}")
+        for i, num_qubits in enumerate(qubit_counts)
+    ]
+
+
+def test_build_quams_saves_each_machine_to_its_folder(tmp_path):
+    report = build_quams(_specs(tmp_path, [2, 3]), max_workers=1)
+
+    report.raise_for_errors()
+    assert [result.name for result in report.results] == ["chip_0", "chip_1"]
+    assert set(report.results[0].timings) == {"wiring", "build"}
+    assert not (tmp_path / "global_state").exists()
+    for result, num_qubits in zip(report.results, [2, 3]):
+        state = json.loads((result.output_path / "state.json").read_text())
+        assert len(state["qubits"]) == num_qubits
+    assert "2/2 succeeded" in str(report)
+
+
+def test_build_quams_collects_errors(tmp_path):
+    report = build_quams(_specs(tmp_path, [2, None, 1]), max_workers=1)
+
+    assert [result.ok for result in report.results] == [True, False, True]
+    assert "Invalid connectivity" in report.results[1].error
+    assert "FAILED" in str(report)
+    with pytest.raises(BatchBuildError, match="1 of 3 builds failed"):
+        report.raise_for_errors()
+
+
+def test_build_quams_in_process_pool(tmp_path):
+    specs = _specs(tmp_path, [4, 1, 2])
+    report = build_quams(specs, max_workers=2, mp_context="fork")
+
+    report.raise_for_errors()
+    assert [result.name for result in report.results] == ["chip_0", "chip_1", "chip_2"]
+    serial_dir = tmp_path / "serial"
+    build_quams(_specs(serial_dir, [4, 1, 2]), max_workers=1)
+    for result in report.results:
+        parallel_state = (result.output_path / "state.json").read_text()
+        serial_state = (serial_dir / result.output_path.name / "state.json").read_text()
+        assert parallel_state == serial_state
+
+
+def test_build_quams_rejects_shared_output_folders(tmp_path):
+    specs = _specs(tmp_path, [1, 1])
+    specs[1].output_path = specs[0].output_path
+    with pytest.raises(ValueError, match="same folder"):
+        build_quams(specs)
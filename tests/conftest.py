@@ -2,7 +2,15 @@
 
 from enum import Enum
 
+import pytest
 from qualang_tools.wirer.connectivity import wiring_spec
+from quam.config.models.quam import QuamConfig
+from quam.config.resolvers import get_quam_config
+from quam.config.vars import CONFIG_PATH_ENV_NAME
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.builder.superconducting.modify_quam import add_qubits
 
 # Extend WiringLineType with quantum-dot specific entries when missing in the installed
 # qualang_tools version. This keeps the tests compatible with older releases.
@@ -31,3 +39,52 @@ if any(name not in _existing_members for name in _extra_members):
     sys.modules["qualang_tools.wirer.connectivity.wiring_spec"].WiringLineType = (
         ExtendedWiringLineType
     )
+
+
+@pytest.fixture
+def compatible_quam_config(tmp_path, monkeypatch):
+    """Use a qualibrate config that matches the installed quam package version.
+
+    Modules that build machines use it with
+    ``pytestmark = pytest.mark.usefixtures("compatible_quam_config")``.
+    """
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(f"[quam]\nversion = {QuamConfig.version}\n")
+    monkeypatch.setenv(CONFIG_PATH_ENV_NAME, str(config_file))
+    if hasattr(get_quam_config, "cache_clear"):
+        get_quam_config.cache_clear()
+
+
+@pytest.fixture
+def make_machine(compatible_quam_config):
+    """Build a superconducting machine whose qubit resonators share one feedline.
+
+    Qubit ``q{i}`` is driven from MW-FEM port ``con1/1/{i + 2}`` and read out on
+    ``con1/1/1``. Flux-tunable machines also get a z line on LF-FEM port ``con1/2/{i + 1}``.
+    Extra keyword arguments are passed on to ``add_qubits``.
+    """
+
+    def make(quam_class=FluxTunableQuam, num_qubits=3, **kwargs):
+        machine = quam_class(ports=FEMPortsContainer())
+        wirings = []
+        for i in range(num_qubits):
+            wiring = {
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/1/{i + 2}"},
+                "rr": {
+                    "opx_output": "#/ports/mw_outputs/con1/1/1",
+                    "opx_input": "#/ports/mw_inputs/con1/1/1",
+                },
+            }
+            if issubclass(quam_class, FluxTunableQuam):
+                wiring["z"] = {"opx_output": f"#/ports/analog_outputs/con1/2/{i + 1}"}
+            wirings.append(wiring)
+        add_qubits(machine, [f"q{i}" for i in range(num_qubits)], wirings, **kwargs)
+        return machine
+
+    return make
+
+
+@pytest.fixture
+def machine(make_machine):
+    """Three flux-tunable qubits, see ``make_machine``."""
+    return make_machine()
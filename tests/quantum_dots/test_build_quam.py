@@ -21,9 +21,9 @@ from quam_builder.builder.quantum_dots.build_quam import (
     add_qpu,
     add_ports,
     add_pulses,
-    _resolve_calibration_db_path,
     _set_default_grid_location,
 )
+from quam_builder.builder.quantum_dots.build_utils import resolve_calibration_db_path
 
 
 class TestSetDefaultGridLocation:
@@ -321,7 +321,7 @@ class TestCalibrationPathResolver:
         serializer._get_state_path.return_value = tmp_path / "state.json"
         machine.get_serialiser = lambda: serializer
 
-        resolved = _resolve_calibration_db_path(machine, None)
+        resolved = resolve_calibration_db_path(machine, None)
         assert resolved == tmp_path
 
     def test_resolves_string_to_path(self):
@@ -330,5 +330,5 @@ class TestCalibrationPathResolver:
         serializer._get_state_path.return_value = Path("/tmp/state.json")
         machine.get_serialiser = lambda: serializer
 
-        resolved = _resolve_calibration_db_path(machine, "/tmp/calibration")
+        resolved = resolve_calibration_db_path(machine, "/tmp/calibration")
         assert resolved == Path("/tmp/calibration")
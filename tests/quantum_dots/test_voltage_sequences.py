@@ -0,0 +1,57 @@
+"""Unit tests for the lazily created voltage sequences of the quantum dot QPU roots."""
+
+from quam_builder.architecture.quantum_dots.qpu import LossDiVincenzoQuam
+
+
+class TestLazyVoltageSequences:
+    """Tests for BaseQuamQD.get_voltage_sequence and load."""
+
+    def test_load_does_not_create_sequences(self, machine):
+        """Loading a machine leaves all sequences to be created on demand."""
+        loaded = LossDiVincenzoQuam.load(machine.to_dict())
+
+        assert loaded.voltage_sequences == {}
+
+    def test_sequence_created_on_first_access(self, machine):
+        """The sequence is created once and cached afterwards."""
+        loaded = LossDiVincenzoQuam.load(machine.to_dict())
+        seq = loaded.get_voltage_sequence("main_qpu")
+
+        assert loaded.voltage_sequences == {"main_qpu": seq}
+        assert loaded.get_voltage_sequence("main_qpu") is seq
+        assert loaded.quantum_dots["virtual_dot_1"].voltage_sequence is seq
+
+    def test_sequence_tracks_integrated_voltage(self, machine):
+        """Lazily created sequences support compensation pulses."""
+        seq = machine.get_voltage_sequence("main_qpu")
+        assert all(
+            tracker._track_integrated_voltage  # pylint: disable=protected-access
+            for tracker in seq.state_trackers.values()
+        )
+
+    def test_sequence_seeded_from_current_voltage(self, machine):
+        """Kept levels of the quantum dots start at their current_voltage."""
+        machine.quantum_dots["virtual_dot_2"].current_voltage = 0.1
+        loaded = LossDiVincenzoQuam.load(machine.to_dict())
+
+        seq = loaded.get_voltage_sequence("main_qpu")
+        kept_levels = seq._keep_levels_tracker.update_voltage_dict_with_current(
+            {}
+        )  # pylint: disable=protected-access
+
+        assert kept_levels["virtual_dot_2"] == 0.1
+        assert kept_levels["virtual_dot_1"] == 0.0
+
+    def test_reset_sequence_is_seeded(self, machine):
+        """A reset sequence is a new one, seeded like a lazily created sequence."""
+        seq = machine.get_voltage_sequence("main_qpu")
+        machine.quantum_dots["virtual_dot_2"].current_voltage = 0.1
+        machine.reset_voltage_sequence("main_qpu")
+
+        new_seq = machine.get_voltage_sequence("main_qpu")
+        kept_levels = new_seq._keep_levels_tracker.update_voltage_dict_with_current(
+            {}
+        )  # pylint: disable=protected-access
+
+        assert new_seq is not seq
+        assert kept_levels["virtual_dot_2"] == 0.1
@@ -1,7 +1,11 @@
 import numpy as np
 import pytest
 
-from quam_builder.common.pulses import DrachmaReadoutPulse
+from quam_builder.common.pulses import (
+    DrachmaReadoutPulse,
+    GaussianFilteredSquarePulse,
+    gaussian_filter_envelope,
+)
 
 
 def _make_pulse(**overrides):
@@ -68,3 +72,38 @@ def test_sample_rate_rescales_waveform():
     waveform_1ghz = _make_pulse(sample_rate=1e9).waveform_function()
     waveform_2ghz = _make_pulse(sample_rate=2e9).waveform_function()
     assert not np.allclose(waveform_1ghz, waveform_2ghz)
+
+
+@pytest.mark.parametrize(
+    "num_samples, sigma",
+    [(1000, 8.0), (1000, 159.2), (1000, 600.0), (20000, 31.8), (20000, 159.2)],
+)
+def test_gaussian_filter_envelope_matches_scipy(num_samples, sigma):
+    from scipy.ndimage import gaussian_filter1d
+
+    envelope = np.zeros(num_samples)
+    envelope[num_samples // 4 : num_samples // 2] = 0.3
+    envelope[num_samples // 2 : 3 * num_samples // 4] = -0.3
+
+    filtered = gaussian_filter_envelope(envelope, sigma)
+
+    assert filtered.shape == envelope.shape
+    np.testing.assert_allclose(
+        filtered, gaussian_filter1d(envelope, sigma=sigma), rtol=0, atol=1e-12 * 0.3
+    )
+
+
+def test_long_gaussian_filtered_square_pulse_uses_fft(monkeypatch):
+    import scipy.ndimage
+
+    pulse = GaussianFilteredSquarePulse(
+        pulse_length=16000, padding_length=4000, amplitude=0.2, gaussian_filter_frequency_mhz=1
+    )
+    expected = pulse.waveform_function()
+
+    def direct_filter(*args, **kwargs):
+        raise AssertionError("Expected the FFT path for a wide kernel")
+
+    monkeypatch.setattr(scipy.ndimage, "gaussian_filter1d", direct_filter)
+    np.testing.assert_allclose(pulse.waveform_function(), expected, rtol=0, atol=1e-12)
+    assert np.max(np.abs(expected)) == pytest.approx(0.2)
@@ -0,0 +1,93 @@
+"""Tests for the cached channel sets and pulse labels of the CZ gate."""
+
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import program
+
+from quam.components.pulses import SquarePulse
+
+from quam_builder.architecture.superconducting.custom_gates.flux_tunable_transmon_pair.two_qubit_gates import (
+    CZGate,
+)
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.architecture.superconducting.qubit_pair import FluxTunableTransmonPair
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(machine) -> FluxTunableQuam:
+    pair = FluxTunableTransmonPair(
+        id="q0-q1", qubit_control="#/qubits/q0", qubit_target="#/qubits/q1"
+    )
+    machine.qubit_pairs[pair.id] = pair
+    pair.macros["cz"] = CZGate(flux_pulse_qubit="const", phase_shift_control=0.1)
+    return machine
+
+
+def _apply_cz(machine, **kwargs) -> str:
+    with program() as prog:
+        machine.qubit_pairs["q0-q1"].apply("cz", **kwargs)
+    return generate_qua_script(prog)
+
+
+def test_structure_is_reused(machine):
+    cz = machine.qubit_pairs["q0-q1"].macros["cz"]
+    structure = cz._get_structure()
+    script = _apply_cz(machine)
+    assert cz._get_structure() is structure
+
+    assert structure.moving_qubit is machine.qubits["q0"]
+    assert cz.flux_pulse_qubit_label == "const"
+    assert set(cz.scheduled_channels) == {
+        f"{qubit}.{channel}" for qubit in ("q0", "q1") for channel in ("xy", "resonator", "z")
+    }
+    assert script.count("align(") == 3
+    assert "play('const', 'q0.z')" in script
+    assert "frame_rotation_2pi(0.1, 'q0.xy')" in script
+
+
+def test_structure_is_rebuilt_when_inputs_are_replaced(machine):
+    cz = machine.qubit_pairs["q0-q1"].macros["cz"]
+    structure = cz._get_structure()
+
+    cz.flux_pulse_qubit = "#/qubits/q0/z/operations/const"
+    assert cz._get_structure() is not structure
+    assert cz.flux_pulse_qubit_label == "const"
+
+    machine.qubits["q2"].z.operations["cz_spec"] = SquarePulse(length=48, amplitude=0.04)
+    cz.spectator_qubits = {"q2": "#/qubits/q2"}
+    cz.spectator_qubits_control = {"q2": "#/qubits/q2/z/operations/cz_spec"}
+    assert "q2.z" in cz.scheduled_channels
+    assert cz.inferred_duration == pytest.approx(100e-9)
+    assert "play('cz_spec', 'q2.z')" in _apply_cz(machine)
+
+    machine.qubit_pairs["q0-q1"].moving_qubit = "target"
+    assert cz._get_structure().moving_qubit is machine.qubits["q1"]
+
+
+def test_invalidate_cache(machine):
+    cz = machine.qubit_pairs["q0-q1"].macros["cz"]
+    structure = cz._get_structure()
+    cz.invalidate_cache()
+    assert cz._get_structure() is not structure
+
+
+def test_structure_is_not_serialised(machine):
+    cz = machine.qubit_pairs["q0-q1"].macros["cz"]
+    cz._get_structure()
+    assert "_structure" not in cz.to_dict()
+
+
+def test_structure_is_rebuilt_when_named_pulse_is_replaced(machine):
+    cz = machine.qubit_pairs["q0-q1"].macros["cz"]
+    assert cz.inferred_duration == pytest.approx(100e-9)
+
+    machine.qubits["q0"].z.operations["const"] = SquarePulse(length=200, amplitude=0.1)
+    assert cz.inferred_duration == pytest.approx(200e-9)
+
+    cz.flux_pulse_qubit = "#/qubits/q0/z/operations/const"
+    assert cz.inferred_duration == pytest.approx(200e-9)
+    machine.qubits["q0"].z.operations["const"] = SquarePulse(length=300, amplitude=0.1)
+    assert cz.inferred_duration == pytest.approx(300e-9)
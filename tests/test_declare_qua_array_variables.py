@@ -0,0 +1,67 @@
+"""Tests for the array-backed ``declare_qua_array_variables`` of the QPU roots."""
+
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import declare, program, stream_processing
+
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.builder.superconducting.modify_quam import add_qubit
+from quam_builder.tools.qua_tools import save_qua_array
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine() -> FixedFrequencyQuam:
+    """A machine with three qubits."""
+    machine = FixedFrequencyQuam(ports=FEMPortsContainer())
+    for qubit_id, base in (("q0", 1), ("q1", 3), ("q2", 5)):
+        add_qubit(
+            machine,
+            qubit_id,
+            {
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/{base}/1"},
+                "rr": {
+                    "opx_output": f"#/ports/mw_outputs/con1/{base + 1}/1",
+                    "opx_input": f"#/ports/mw_inputs/con1/{base + 1}/1",
+                },
+            },
+        )
+    for qubit in machine.qubits.values():
+        qubit.resonator.operations["readout"].threshold = 0.0
+    return machine
+
+
+def test_declares_one_array_per_quadrature(machine):
+    with program() as prog:
+        I, I_st, Q, Q_st, n, n_st = machine.declare_qua_array_variables()
+    script = generate_qua_script(prog)
+
+    assert script.count("declare(fixed, size=3)") == 2
+
+
+def test_num_IQ_pairs_overrides_size(machine):
+    with program() as prog:
+        machine.declare_qua_array_variables(num_IQ_pairs=5)
+    assert generate_qua_script(prog).count("declare(fixed, size=5)") == 2
+
+
+def test_readout_state_writes_into_array_slots(machine):
+    with program() as prog:
+        I, I_st, Q, Q_st, n, n_st = machine.declare_qua_array_variables()
+        state = declare(int)
+        for i, qubit in enumerate(machine.qubits.values()):
+            qubit.readout_state(state, qua_vars=(I[i], Q[i]))
+        save_qua_array(I, I_st, len(machine.qubits))
+        with stream_processing():
+            I_st.buffer(len(machine.qubits)).save("I")
+    script = generate_qua_script(prog)
+
+    # Only the two arrays are declared as fixed, no per-call scalars
+    assert "declare(fixed, )" not in script
+    for i in range(3):
+        assert f"[{i}]" in script
+    assert ".buffer(3)" in script
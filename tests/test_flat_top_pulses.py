@@ -0,0 +1,146 @@
+"""Tests for the rise/plateau/fall splitting of flat-top pulses."""
+
+import numpy as np
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import declare, for_, program
+
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.components.pulses import (
+    FlatTopBlackmanPulse,
+    FlatTopTanhPulse,
+)
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.builder.superconducting.modify_quam import add_qubit
+from quam_builder.common.pulses import FlatTopCosinePulse, FlatTopGaussianPulse
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+FLAT_TOP_CLASSES = [
+    FlatTopGaussianPulse,
+    FlatTopCosinePulse,
+    FlatTopBlackmanPulse,
+    FlatTopTanhPulse,
+]
+
+
+@pytest.fixture
+def machine() -> FixedFrequencyQuam:
+    machine = FixedFrequencyQuam(ports=FEMPortsContainer())
+    add_qubit(
+        machine,
+        "q0",
+        {
+            "xy": {"opx_output": "#/ports/mw_outputs/con1/1/1"},
+            "rr": {
+                "opx_output": "#/ports/mw_outputs/con1/2/1",
+                "opx_input": "#/ports/mw_inputs/con1/2/1",
+            },
+        },
+    )
+    return machine
+
+
+@pytest.mark.parametrize("cls", FLAT_TOP_CLASSES)
+def test_rise_and_fall_match_full_waveform(cls):
+    pulse = cls(length=1048, flat_length=1000, amplitude=0.2, axis_angle=0.3)
+    full = pulse.waveform_function()
+
+    rise = pulse.flat_top_waveform("rise")
+    fall = pulse.flat_top_waveform("fall")
+
+    assert len(rise) == len(fall) == pulse.rise_fall_length == 24
+    np.testing.assert_allclose(full[:24], rise)
+    np.testing.assert_allclose(full[-24:], fall)
+    np.testing.assert_allclose(full[24:-24], 0.2 * np.exp(0.3j))
+
+
+@pytest.mark.parametrize("cls", FLAT_TOP_CLASSES)
+@pytest.mark.parametrize("flat_length", [999, 1100])
+def test_inconsistent_lengths_raise(cls, flat_length):
+    pulse = cls(length=1048, flat_length=flat_length, amplitude=0.2, axis_angle=0.3)
+    for return_part in ("all", "rise", "fall"):
+        with pytest.raises(ValueError, match="length - flat_length"):
+            pulse.flat_top_waveform(return_part)
+
+
+@pytest.mark.parametrize("cls", FLAT_TOP_CLASSES)
+def test_split_pulse_config_is_independent_of_plateau(machine, cls):
+    xy = machine.qubits["q0"].xy
+    xy.operations["long"] = cls(
+        length=10048, flat_length=10000, amplitude=0.2, axis_angle=0.0, split_flat_top=True
+    )
+    config = machine.generate_config()
+
+    operations = config["elements"][xy.name]["operations"]
+    assert operations["long.rise"] == f"{xy.name}.long.rise.pulse"
+    assert operations["long.fall"] == f"{xy.name}.long.fall.pulse"
+
+    plateau = config["pulses"][operations["long"]]
+    assert plateau["length"] == 10000
+    for label in ("I", "Q"):
+        assert config["waveforms"][plateau["waveforms"][label]]["type"] == "constant"
+    rise = config["pulses"][operations["long.rise"]]
+    assert rise["length"] == 24
+    assert len(config["waveforms"][rise["waveforms"]["I"]]["samples"]) == 24
+    assert config["waveforms"][rise["waveforms"]["Q"]]["type"] == "arbitrary"
+
+
+def test_split_pulse_on_single_channel_uses_real_rise(machine):
+    xy = machine.qubits["q0"].xy
+    xy.operations["long"] = FlatTopCosinePulse(
+        length=1048, flat_length=1000, amplitude=0.2, split_flat_top=True
+    )
+    config = machine.generate_config()
+
+    rise = config["pulses"][f"{xy.name}.long.rise.pulse"]
+    assert config["waveforms"][rise["waveforms"]["Q"]] == {"type": "constant", "sample": 0.0}
+    plateau = config["pulses"][f"{xy.name}.long.pulse"]
+    assert config["waveforms"][plateau["waveforms"]["I"]]["sample"] == pytest.approx(0.2)
+
+
+def test_split_pulse_requires_valid_segment_lengths(machine):
+    machine.qubits["q0"].xy.operations["long"] = FlatTopGaussianPulse(
+        length=1020, flat_length=1000, amplitude=0.2, axis_angle=0.0, split_flat_top=True
+    )
+    with pytest.raises(ValueError, match="multiple of 4 and at least 16"):
+        machine.generate_config()
+
+
+def test_split_pulse_plays_rise_plateau_and_fall(machine):
+    pulse = machine.qubits["q0"].xy.operations["long"] = FlatTopGaussianPulse(
+        length=1048, flat_length=1000, amplitude=0.2, axis_angle=0.0, split_flat_top=True
+    )
+    with program() as prog:
+        t = declare(int)
+        with for_(t, 4, t < 100, t + 4):
+            pulse.play(duration=t)
+    script = generate_qua_script(prog)
+
+    channel = pulse.channel.name
+    rise = script.index(f"play('long.rise', '{channel}')")
+    plateau = script.index(f"play('long', '{channel}', duration=v1)")
+    fall = script.index(f"play('long.fall', '{channel}')")
+    assert rise < plateau < fall
+
+
+def test_split_pulse_rejects_truncate(machine):
+    pulse = machine.qubits["q0"].xy.operations["long"] = FlatTopGaussianPulse(
+        length=1048, flat_length=1000, amplitude=0.2, axis_angle=0.0, split_flat_top=True
+    )
+    with program():
+        with pytest.raises(ValueError):
+            pulse.play(truncate=10)
+
+
+def test_unsplit_pulse_is_unchanged(machine):
+    xy = machine.qubits["q0"].xy
+    xy.operations["long"] = FlatTopGaussianPulse(
+        length=1048, flat_length=1000, amplitude=0.2, axis_angle=0.0
+    )
+    config = machine.generate_config()
+
+    assert "long.rise" not in config["elements"][xy.name]["operations"]
+    assert len(config["waveforms"][f"{xy.name}.long.wf.I"]["samples"]) == 1048
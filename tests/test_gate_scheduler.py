@@ -0,0 +1,135 @@
+"""Tests for the as-soon-as-possible gate scheduler."""
+
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import program
+
+
+from quam_builder.architecture.superconducting.custom_gates.flux_tunable_transmon_pair.two_qubit_gates import (
+    CZGate,
+)
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.architecture.superconducting.qubit_pair import FluxTunableTransmonPair
+from quam_builder.builder.superconducting.add_default_macros import add_default_transmon_macros
+from quam_builder.builder.superconducting.add_default_pulses import add_DragCosine_pulses
+from quam_builder.tools.gate_scheduler import Gate, gate_channels, schedule_gates
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(make_machine) -> FluxTunableQuam:
+    machine = make_machine(num_qubits=4)
+    for qubit in machine.qubits.values():
+        add_DragCosine_pulses(qubit, 0.1, 40, alpha=0.0, detuning=0, anharmonicity=-200e6)
+        add_default_transmon_macros(qubit)
+    for control, target in [("q0", "q1"), ("q2", "q3")]:
+        pair = FluxTunableTransmonPair(
+            id=f"{control}-{target}",
+            qubit_control=f"#/qubits/{control}",
+            qubit_target=f"#/qubits/{target}",
+        )
+        machine.qubit_pairs[pair.id] = pair
+        pair.macros["cz"] = CZGate(flux_pulse_qubit="const")
+    return machine
+
+
+def test_gate_channels(machine):
+    q0 = machine.qubits["q0"]
+    assert gate_channels(q0.macros["x"]) == ("q0.xy",)
+    assert gate_channels(q0.macros["rz"]) == ("q0.xy",)
+    assert gate_channels(q0.macros["measure"]) == ("q0.resonator",)
+    assert set(gate_channels(q0.macros["id"])) == {"q0.xy", "q0.resonator", "q0.z"}
+    assert set(gate_channels(machine.qubit_pairs["q0-q1"].macros["cz"])) == {
+        f"{qubit}.{channel}" for qubit in ("q0", "q1") for channel in ("xy", "resonator", "z")
+    }
+
+
+def test_single_qubit_gates_are_not_aligned(machine):
+    q0, q1 = machine.qubits["q0"], machine.qubits["q1"]
+    with program() as prog:
+        schedule = schedule_gates(
+            [(q0, "x"), (q1, "sx"), (q0, "rz", {"angle": 0.5}), (q0, "sx"), (q1, "x")]
+        )
+    script = generate_qua_script(prog)
+
+    assert "align(" not in script
+    assert schedule.num_aligns == 0
+    assert [gate.depends_on for gate in schedule.gates] == [(), (), (0,), (2,), (1,)]
+    # q0: 40 ns x, 0 ns rz and 40 ns sx in parallel with the 80 ns of q1
+    assert schedule.duration == pytest.approx(80)
+
+
+def test_independent_pairs_run_in_parallel(machine):
+    q0, q2 = machine.qubits["q0"], machine.qubits["q2"]
+    cz_01, cz_23 = machine.qubit_pairs["q0-q1"], machine.qubit_pairs["q2-q3"]
+    with program() as prog:
+        schedule = schedule_gates(
+            [(q0, "x"), (q2, "x"), (cz_01, "cz"), (cz_23, "cz"), (cz_01, "cz")]
+        )
+    script = generate_qua_script(prog)
+
+    first_cz, second_cz, third_cz = schedule.gates[2:]
+    assert first_cz.aligned and second_cz.aligned
+    # The channels are still in sync after the previous CZ on the same pair
+    assert not third_cz.aligned
+    assert second_cz.depends_on == (1,)
+    assert first_cz.start == second_cz.start == pytest.approx(40)
+    assert schedule.duration == pytest.approx(40 + 2 * 100)
+    # No align spans both pairs
+    for line in script.splitlines():
+        if "align(" in line:
+            assert not ("q0." in line and "q2." in line)
+
+
+def test_gate_objects_and_results(machine):
+    q0 = machine.qubits["q0"]
+    with program() as prog:
+        schedule = schedule_gates([Gate(q0, q0.macros["measure"]), Gate(q0, "id")])
+    script = generate_qua_script(prog)
+
+    assert script.count("measure('readout', 'q0.resonator'") == 1
+    assert schedule.results[0] is not None
+    assert schedule.gates[1].aligned
+
+
+def test_unknown_macro(machine):
+    with program():
+        with pytest.raises(KeyError, match="not_a_gate"):
+            schedule_gates([(machine.qubits["q0"], "not_a_gate")])
+
+
+def test_gates_on_one_qubit_keep_their_order(machine):
+    q0, q1 = machine.qubits["q0"], machine.qubits["q1"]
+    with program() as prog:
+        schedule = schedule_gates([(q0, "x"), (q0, "measure"), (q0, "x"), (q1, "x")])
+    script = generate_qua_script(prog)
+
+    x, measure, second_x, other_x = schedule.gates
+    assert measure.aligned and second_x.aligned
+    assert measure.depends_on == (0,) and second_x.depends_on == (0, 1)
+    assert measure.start == pytest.approx(40)
+    assert not other_x.aligned and other_x.start == 0
+    lines = [line.strip() for line in script.splitlines()]
+    play_index = lines.index(next(line for line in lines if "play('x180" in line))
+    measure_index = lines.index(next(line for line in lines if "measure(" in line))
+    assert any(
+        "align(" in line and "'q0.xy'" in line and "'q0.resonator'" in line
+        for line in lines[play_index:measure_index]
+    )
+    # The readout of q0 is not aligned with q1
+    assert not any("align(" in line and "q1." in line for line in lines)
+
+
+def test_measure_then_drive_on_one_qubit(machine):
+    q0 = machine.qubits["q0"]
+    with program() as prog:
+        schedule = schedule_gates([(q0, "measure"), (q0, "x")])
+    script = generate_qua_script(prog)
+
+    assert schedule.gates[1].aligned
+    measure_index = script.index("measure(")
+    assert script.index("align('q0.xy', 'q0.resonator')", measure_index) < script.index(
+        "play('x180", measure_index
+    )
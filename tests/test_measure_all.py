@@ -0,0 +1,105 @@
+"""Tests for the simultaneous readout and active reset of several qubits on ``BaseQuam``."""
+
+import re
+
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import declare, declare_stream, fixed, program
+
+
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.builder.superconducting.add_default_pulses import add_DragCosine_pulses
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(make_machine) -> FixedFrequencyQuam:
+    """A machine with three qubits whose resonators share one feedline."""
+    machine = make_machine(FixedFrequencyQuam)
+    for i, qubit in enumerate(machine.qubits.values()):
+        qubit.resonator.operations["readout"].threshold = (0.1, 0.2, 0.3)[i]
+        qubit.resonator.operations["readout"].rus_exit_threshold = 0.0
+        qubit.resonator.depletion_time = 1000 * (i + 1)
+        add_DragCosine_pulses(qubit, 0.1, 40, alpha=0.0, detuning=0, anharmonicity=-200e6)
+    machine.active_qubit_names = list(machine.qubits)
+    return machine
+
+
+def test_readout_states_measures_simultaneously(machine):
+    with program() as prog:
+        states = declare(int, size=3)
+        machine.readout_states(states)
+    script = generate_qua_script(prog)
+
+    assert script.count("declare(fixed, size=3)") == 2
+    assert script.count("measure('readout'") == 3
+    # The resonators are aligned before the readout and wait once for the longest depletion
+    assert script.count("align(") == 2
+    assert script.count("wait(") == 1
+    assert "wait(750, " in script
+    for threshold in ("0.1", "0.2", "0.3"):
+        assert f">{threshold})" in script
+
+
+def test_measure_all_uses_given_arrays_and_qubits(machine):
+    with program() as prog:
+        I = declare(fixed, size=5)
+        Q = declare(fixed, size=5)
+        machine.measure_all(qubits=[machine.qubits["q2"]], qua_vars=(I, Q))
+    script = generate_qua_script(prog)
+
+    assert script.count("declare(fixed") == 2
+    assert script.count("measure('readout'") == 1
+    assert "'q2.resonator'" in script
+
+
+def test_readout_states_checks_thresholds(machine):
+    with program():
+        states = declare(int, size=3)
+        with pytest.raises(ValueError, match="2 thresholds for 3 qubits"):
+            machine.readout_states(states, thresholds=[0.0, 0.0])
+
+
+def test_reset_qubits_active_runs_one_collective_loop(machine):
+    with program() as prog:
+        attempts_st = declare_stream()
+        attempts = machine.reset_qubits_active(save_qua_var=attempts_st, max_attempts=5)
+    script = generate_qua_script(prog)
+
+    assert attempts is not None
+    assert script.count("with while_(") == 1
+    # One simultaneous measurement before and one inside the loop
+    assert script.count("measure('readout'") == 6
+    assert script.count("play('x180'") == 6
+    assert script.count("wait(1500, 'q0.resonator', 'q1.resonator', 'q2.resonator')") == 2
+    assert script.count("save(") == 3
+
+
+def test_reset_qubits_active_single_shot(machine):
+    with program() as prog:
+        attempts = machine.reset_qubits_active(max_attempts=1)
+    script = generate_qua_script(prog)
+
+    assert attempts is None
+    assert "while_" not in script
+    assert script.count("play('x180'") == 3
+
+
+def test_reset_qubits_active_skips_qubits_that_are_done(machine):
+    with program() as prog:
+        machine.reset_qubits_active(max_attempts=5)
+    script = generate_qua_script(prog)
+
+    # Every pi pulse is gated on the qubit not having passed its exit threshold yet
+    plays = [line.strip() for line in script.splitlines() if "play('x180'" in line]
+    assert len(plays) == 6
+    assert all(re.search(r"condition=\(a\d+\[\d\]&\(a\d+\[\d\]\^True\)\)\)$", p) for p in plays)
+    # done[i] latches once I[i] drops below the exit threshold
+    assert (
+        len(re.findall(r"assign\((a\d+)\[\d\], \(\1\[\d\]\|\(a\d+\[\d\]<0\.0\)\)\)", script)) == 6
+    )
+    # Attempts only count up for qubits that are not done
+    assert len(re.findall(r"Cast\.to_int\(\(a\d+\[\d\]\^True\)\)", script)) == 3
+    assert re.search(r"with while_\(\(v\d+&\(v\d+<5\)\)\):", script)
@@ -39,10 +39,19 @@ from quam_builder.architecture.superconducting.qubit_pair import FixedFrequencyT
 
 from quam_builder.builder.superconducting.modify_quam import (
     add_qubit,
+    add_qubits,
     remove_qubit,
+    remove_qubits,
+    add_qubit_pair,
+    remove_qubit_pair,
     add_channel,
     remove_channel,
 )
+from quam_builder.builder.qop_connectivity.reference_index import (
+    get_reference_index,
+    invalidate_reference_index,
+)
+from quam_builder.builder.qop_connectivity.wiring_diff import apply_wiring_diff, diff_wiring
 from quam_builder.builder.qop_connectivity.modify_ports import (
     add_port,
     remove_port,
@@ -772,3 +781,147 @@ def test_add_multiple_qubits():
     elements = set(config.get("elements", {}).keys())
     for i in range(3):
         assert any(f"q{i}" in name for name in elements)
+
+
+##############################################################################
+##############################################################################
+#                      bulk edits and reference index tests
+##############################################################################
+##############################################################################
+
+
+def _xy_wiring(i: int) -> dict[str, dict[str, str]]:
+    return {"xy": {"opx_output": f"#/ports/mw_outputs/con1/1/{i + 1}"}}
+
+
+def test_add_qubits_matches_add_qubit():
+    bulk = FixedFrequencyQuam(ports=FEMPortsContainer())
+    add_qubits(bulk, ["q0", "q1"], [_xy_wiring(0), _xy_wiring(1)])
+
+    single = FixedFrequencyQuam(ports=FEMPortsContainer())
+    add_qubit(single, "q0", _xy_wiring(0))
+    add_qubit(single, "q1", _xy_wiring(1))
+
+    assert bulk.to_dict() == single.to_dict()
+
+
+def test_add_qubits_validates_all_before_mutating(empty_ff_machine: FixedFrequencyQuam):
+    with pytest.raises(ValueError):
+        add_qubits(empty_ff_machine, ["q0", "q1"], [_xy_wiring(0), {"xy": {}}])
+    with pytest.raises(KeyError):
+        add_qubits(empty_ff_machine, ["q0", "q0"], [_xy_wiring(0), _xy_wiring(1)])
+
+    assert len(empty_ff_machine.qubits) == 0
+    assert not empty_ff_machine.wiring.get("qubits")
+
+
+def test_remove_qubits(empty_ff_machine: FixedFrequencyQuam):
+    add_qubits(empty_ff_machine, ["q0", "q1", "q2"], [_xy_wiring(i) for i in range(3)])
+
+    removed = remove_qubits(empty_ff_machine, ["q0", "q2"])
+
+    assert [transmon.id for transmon in removed] == ["q0", "q2"]
+    assert all(transmon.parent is None for transmon in removed)
+    assert list(empty_ff_machine.qubits) == ["q1"]
+    assert list(empty_ff_machine.active_qubit_names) == ["q1"]
+    assert list(empty_ff_machine.wiring["qubits"]) == ["q1"]
+
+
+def test_remove_qubits_rejects_pairs_before_mutating(empty_ff_machine: FixedFrequencyQuam):
+    add_qubits(empty_ff_machine, ["q0", "q1", "q2"], [_xy_wiring(i) for i in range(3)])
+    empty_ff_machine.qubit_pairs["q1-q2"] = FixedFrequencyTransmonPair(
+        id="q1-q2", qubit_control="#/qubits/q1", qubit_target="#/qubits/q2"
+    )
+
+    with pytest.raises(ValueError, match="q1-q2"):
+        remove_qubits(empty_ff_machine, ["q0", "q2"])
+    assert len(empty_ff_machine.qubits) == 3
+
+    # Removing the pair is picked up by the index
+    remove_qubit_pair(empty_ff_machine, "q1-q2")
+    remove_qubits(empty_ff_machine, ["q0", "q2"])
+    assert list(empty_ff_machine.qubits) == ["q1"]
+
+
+def test_reference_index_tracks_wiring_edits(flux_wiring):
+    machine = FluxTunableQuam(ports=FEMPortsContainer())
+    add_qubits(machine, ["q0", "q1"], [_xy_wiring(0), _xy_wiring(0)])
+    index = get_reference_index(machine)
+    shared_port = "#/ports/mw_outputs/con1/1/1"
+    assert index.wiring_lines_using_port(shared_port) == {
+        ("qubits", "q0", "xy"),
+        ("qubits", "q1", "xy"),
+    }
+
+    add_channel(machine, "q0", "z", flux_wiring)
+    remove_channel(machine, "q1", "xy")
+    assert index.wiring_lines_using_port(shared_port) == {("qubits", "q0", "xy")}
+    assert index.wiring_lines_using_port(flux_wiring["opx_output"]) == {("qubits", "q0", "z")}
+
+    remove_qubit(machine, "q0")
+    assert not index.wiring_lines_using_port(shared_port)
+
+
+def test_add_and_remove_qubit_pair(empty_ff_machine: FixedFrequencyQuam, mw_wiring) -> None:
+    for qubit_id in ("q0", "q1"):
+        add_qubit(empty_ff_machine, qubit_id, mw_wiring)
+
+    qubit_pair = add_qubit_pair(empty_ff_machine, "q0", "q1")
+    assert empty_ff_machine.qubit_pairs["q0-q1"] is qubit_pair
+    assert qubit_pair.qubit_target is empty_ff_machine.qubits["q1"]
+    assert empty_ff_machine.active_qubit_pair_names == ["q0-q1"]
+    with pytest.raises(KeyError, match="already exists"):
+        add_qubit_pair(empty_ff_machine, "q0", "q1")
+    with pytest.raises(KeyError, match="q2"):
+        add_qubit_pair(empty_ff_machine, "q0", "q2")
+
+    assert remove_qubit_pair(empty_ff_machine, "q0-q1") is qubit_pair
+    assert not empty_ff_machine.qubit_pairs
+    assert empty_ff_machine.active_qubit_pair_names == []
+    with pytest.raises(KeyError):
+        remove_qubit_pair(empty_ff_machine, "q0-q1")
+
+
+def test_reference_index_tracks_pair_edits(empty_ff_machine: FixedFrequencyQuam, mw_wiring) -> None:
+    for qubit_id in ("q0", "q1", "q2"):
+        add_qubit(empty_ff_machine, qubit_id, mw_wiring)
+    empty_ff_machine.qubit_pairs["cz"] = FixedFrequencyTransmonPair(
+        id="cz", qubit_control="#/qubits/q0", qubit_target="#/qubits/q1"
+    )
+    index = get_reference_index(empty_ff_machine)
+    assert index.qubit_pair_ids("q1") == ["cz"]
+
+    add_qubit_pair(empty_ff_machine, "q1", "q2")
+    assert index.qubit_pair_ids("q1") == ["cz", "q1-q2"]
+    assert index.qubit_pair_ids("q2") == ["q1-q2"]
+    remove_qubit_pair(empty_ff_machine, "q1-q2")
+    assert index.qubit_pair_ids("q2") == []
+
+    # Reassigning the qubits of a pair by hand requires invalidating the index
+    empty_ff_machine.qubit_pairs["cz"].qubit_target = "#/qubits/q2"
+    invalidate_reference_index(empty_ff_machine)
+    index = get_reference_index(empty_ff_machine)
+    assert index.qubit_pair_ids("q1") == []
+    assert index.qubit_pair_ids("q2") == ["cz"]
+    remove_qubit(empty_ff_machine, "q1")
+
+
+def test_reference_index_tracks_wired_pairs(
+    empty_ff_machine: FixedFrequencyQuam, mw_wiring
+) -> None:
+    for qubit_id in ("q1", "q2"):
+        add_qubit(empty_ff_machine, qubit_id, mw_wiring)
+    index = get_reference_index(empty_ff_machine)
+    assert index.qubit_pair_ids("q2") == []
+
+    coupler = {"opx_output": "#/ports/analog_outputs/con1/2/8"}
+    apply_wiring_diff(
+        empty_ff_machine,
+        diff_wiring(
+            empty_ff_machine.wiring,
+            {**empty_ff_machine.wiring.to_dict(), "qubit_pairs": {"q1-2": {"coupler": coupler}}},
+        ),
+    )
+    assert index.qubit_pair_ids("q2") == ["q1-2"]
+    with pytest.raises(ValueError, match="q1-2"):
+        remove_qubit(empty_ff_machine, "q2")
@@ -0,0 +1,182 @@
+"""Tests for skipping unchanged Octave calibrations."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from qm.exceptions import AnotherJobIsRunning
+from qm.octave.octave_mixer_calibration import NoCalibrationElements
+from quam.components.octave import Octave
+
+from quam_builder.architecture.superconducting.components.readout_resonator import (
+    ReadoutResonatorIQ,
+)
+from quam_builder.architecture.superconducting.components.xy_drive import XYDriveIQ
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.architecture.superconducting.qubit import FixedFrequencyTransmon
+from quam_builder.tools.octave_calibration import (
+    OctaveCalibrationLedger,
+    calibrate_elements,
+    octave_calibration,
+)
+
+
+class FakeQuantumMachine:
+    """Stands in for a QuantumMachine, recording the calibrated elements.
+
+    Like a real quantum machine, it runs one calibration job at a time.
+    """
+
+    def __init__(self, delay: float = 0.0, fail: tuple = ()):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def calibrate_element(self, qe, lo_if_dict=None, save_to_db=True, params=None):
+        with self._lock:
+            if self.active:
+                raise AnotherJobIsRunning()
+            self.calls.append((qe, lo_if_dict))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if qe in self.fail:
+                raise NoCalibrationElements(qe)
+            return f"result {qe}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def machine() -> FixedFrequencyQuam:
+    """Four qubits, two per Octave."""
+    machine = FixedFrequencyQuam()
+    for name in ("oct1", "oct2"):
+        octave = machine.octaves[name] = Octave(name=name)
+        octave.initialize_frequency_converters()
+        octave.RF_outputs[1].LO_frequency = 6e9
+        octave.RF_outputs[2].LO_frequency = 5e9
+        octave.RF_outputs[3].LO_frequency = 5e9
+    for i in range(4):
+        octave = f"#/octaves/oct{i // 2 + 1}"
+        qubit = machine.qubits[f"q{i}"] = FixedFrequencyTransmon(id=f"q{i}")
+        qubit.xy = XYDriveIQ(
+            opx_output_I=("con1", 1),
+            opx_output_Q=("con1", 2),
+            frequency_converter_up=f"{octave}/RF_outputs/{i % 2 + 2}",
+            intermediate_frequency=100e6,
+        )
+        qubit.resonator = ReadoutResonatorIQ(
+            opx_output_I=("con1", 3),
+            opx_output_Q=("con1", 4),
+            opx_input_I=("con1", 1),
+            opx_input_Q=("con1", 2),
+            frequency_converter_up=f"{octave}/RF_outputs/1",
+            frequency_converter_down=f"{octave}/RF_inputs/1",
+            intermediate_frequency=50e6 + i * 1e6,
+        )
+    machine.active_qubit_names = list(machine.qubits)
+    return machine
+
+
+def test_octave_calibration_settings(machine):
+    calibration = octave_calibration(machine.qubits["q3"].resonator)
+    assert calibration.element == "q3.resonator"
+    assert calibration.octave == "oct2"
+    assert calibration.LO_frequency == 6e9
+    assert calibration.intermediate_frequency == 53e6
+    assert calibration.gain == 0
+    assert calibration.calibration_db_path == str(Path.cwd().resolve())
+
+
+def test_unchanged_elements_are_skipped(machine, tmp_path):
+    ledger_path = tmp_path / "ledger.json"
+    QM = FakeQuantumMachine()
+    machine.calibrate_octave_ports(QM, ledger=OctaveCalibrationLedger.load(ledger_path))
+    assert len(QM.calls) == 8
+    assert ("q0.xy", {5e9: (100e6,)}) in QM.calls
+
+    machine.qubits["q1"].xy.intermediate_frequency = 120e6
+    machine.octaves["oct2"].RF_outputs[1].gain = 10
+
+    QM = FakeQuantumMachine()
+    machine.calibrate_octave_ports(QM, ledger=OctaveCalibrationLedger.load(ledger_path))
+    assert sorted(qe for qe, _ in QM.calls) == ["q1.xy", "q2.resonator", "q3.resonator"]
+
+    QM = FakeQuantumMachine()
+    machine.calibrate_octave_ports(QM, ledger=OctaveCalibrationLedger.load(ledger_path))
+    assert QM.calls == []
+
+
+def test_calibrations_expire(machine):
+    ledger = OctaveCalibrationLedger(max_age=60)
+    calibration = octave_calibration(machine.qubits["q0"].xy)
+    ledger.record(calibration, timestamp=1000)
+    assert ledger.is_fresh(calibration, now=1060)
+    assert not ledger.is_fresh(calibration, now=1061)
+
+    ledger.invalidate("q0.xy")
+    assert not ledger.is_fresh(calibration, now=1000)
+
+
+def test_one_quantum_machine_calibrates_sequentially(machine):
+    QM = FakeQuantumMachine(delay=0.01)
+    machine.calibrate_octave_ports(QM)
+    assert len(QM.calls) == 8
+    assert QM.max_active == 1
+
+    # Also with several workers, since there is only one quantum machine
+    QM = FakeQuantumMachine(delay=0.01)
+    machine.calibrate_octave_ports(QM, max_workers=4)
+    assert len(QM.calls) == 8
+
+
+def test_separate_quantum_machines_calibrate_in_parallel(machine):
+    QMs = {"oct1": FakeQuantumMachine(delay=0.05), "oct2": FakeQuantumMachine(delay=0.05)}
+    calibrations = [octave_calibration(q.xy) for q in machine.qubits.values()]
+    start = time.perf_counter()
+    results = calibrate_elements(QMs, calibrations, max_workers=2)
+    assert time.perf_counter() - start < 4 * 0.05
+    assert len(results) == 4
+    assert [qe for qe, _ in QMs["oct1"].calls] == ["q0.xy", "q1.xy"]
+    assert [qe for qe, _ in QMs["oct2"].calls] == ["q2.xy", "q3.xy"]
+
+    with pytest.raises(KeyError, match="oct2"):
+        calibrate_elements({"oct1": FakeQuantumMachine()}, calibrations)
+
+
+def test_failed_elements_are_not_recorded(machine):
+    ledger = OctaveCalibrationLedger()
+    calibrations = [octave_calibration(q.xy) for q in machine.qubits.values()]
+    results = calibrate_elements(FakeQuantumMachine(fail=("q2.xy",)), calibrations, ledger)
+
+    assert sorted(results) == ["q0.xy", "q1.xy", "q3.xy"]
+    assert sorted(ledger.entries) == ["q0.xy", "q1.xy", "q3.xy"]
+
+
+def test_transmon_calibrate_octave_with_ledger(machine):
+    qubit = machine.qubits["q0"]
+    ledger = OctaveCalibrationLedger()
+    QM = FakeQuantumMachine()
+    assert qubit.calibrate_octave(QM, ledger=ledger) == ("result q0.resonator", "result q0.xy")
+    assert qubit.calibrate_octave(QM, ledger=ledger) == (None, None)
+    assert len(QM.calls) == 2
+
+
+def test_calibrations_are_tied_to_the_calibration_database(machine, tmp_path):
+    ledger = OctaveCalibrationLedger()
+    machine.octaves["oct1"].calibration_db_path = str(tmp_path / "db1")
+    calibration = octave_calibration(machine.qubits["q0"].xy)
+    assert calibration.calibration_db_path == str((tmp_path / "db1").resolve())
+    ledger.record(calibration)
+    assert ledger.is_fresh(octave_calibration(machine.qubits["q0"].xy))
+
+    machine.octaves["oct1"].calibration_db_path = str(tmp_path / "db2")
+    assert not ledger.is_fresh(octave_calibration(machine.qubits["q0"].xy))
@@ -0,0 +1,67 @@
+"""Tests for saving repeated pulse definitions as templates."""
+
+import json
+
+import pytest
+from quam.serialisation import JSONSerialiser
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.builder.superconducting.add_default_pulses import (
+    add_DragCosine_pulses,
+    add_default_transmon_pulses,
+)
+from quam_builder.tools.pulse_templates import (
+    collapse_pulse_templates,
+    expand_pulse_templates,
+)
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(make_machine) -> FluxTunableQuam:
+    machine = make_machine(num_qubits=4, add_default_pulses=False)
+    for transmon in machine.qubits.values():
+        transmon.anharmonicity = -200e6
+        add_default_transmon_pulses(transmon)
+        add_DragCosine_pulses(transmon, amplitude=0.1, length=40, alpha=0.0, detuning=0)
+    machine.qubits["q1"].xy.operations["saturation"].amplitude = 0.3
+    return machine
+
+
+def test_collapse_and_expand_round_trip(machine):
+    contents = machine.to_dict()
+    collapsed = collapse_pulse_templates(contents)
+
+    saturation = collapsed["qubits"]["q1"]["xy"]["operations"]["saturation"]
+    assert saturation == {"__template__": "saturation", "amplitude": 0.3}
+    assert collapsed["pulse_templates"]["saturation"]["amplitude"] == 0.25
+    assert expand_pulse_templates(collapsed) == contents
+    assert "pulse_templates" not in contents
+
+
+def test_expand_without_templates_is_unchanged():
+    contents = {"qubits": {}}
+    assert expand_pulse_templates(contents) is contents
+
+
+def test_saved_state_uses_templates(machine, tmp_path):
+    machine.save(tmp_path / "full")
+    assert "pulse_templates" not in json.loads((tmp_path / "full" / "state.json").read_text())
+    machine.use_pulse_templates = True
+    machine.save(tmp_path / "templated")
+
+    full_size = (tmp_path / "full" / "state.json").stat().st_size
+    templated_state = tmp_path / "templated" / "state.json"
+    assert templated_state.stat().st_size < 0.75 * full_size
+    assert "pulse_templates" in json.loads(templated_state.read_text())
+
+    loaded = FluxTunableQuam.load(tmp_path / "templated")
+    assert loaded.use_pulse_templates
+    assert loaded.qubits["q1"].xy.operations["saturation"].amplitude == 0.3
+    assert loaded.generate_config() == machine.generate_config()
+
+
+def test_serialiser_is_the_plain_json_serialiser(machine):
+    assert type(FluxTunableQuam.get_serialiser()) is JSONSerialiser
+    assert type(machine.serialiser) is JSONSerialiser
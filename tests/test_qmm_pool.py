@@ -0,0 +1,234 @@
+"""Tests for reusing QMM connections and open quantum machines."""
+
+import copy
+import itertools
+
+import numpy as np
+import pytest
+
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.tools.qmm_pool import (
+    QmmPool,
+    config_hash,
+    get_qmm_pool,
+    plan_runtime_update,
+    structural_config_hash,
+)
+
+
+class FakeQuantumMachine:
+    def __init__(self, qm_id: str, config: dict):
+        self.id = qm_id
+        self.config = config
+        self.updates = []
+
+    def set_intermediate_frequency(self, element, freq):
+        # Like qm.elements.element.Element.set_intermediate_frequency
+        if not isinstance(freq, float):
+            raise TypeError("freq must be a float")
+        self.updates.append(("intermediate_frequency", element, freq))
+
+    def set_mixer_correction(self, mixer, intermediate_frequency, lo_frequency, values):
+        self.updates.append(("mixer", mixer, intermediate_frequency, lo_frequency, values))
+
+
+class FakeQmm:
+    """Stands in for a QuantumMachinesManager, counting connections and opened QMs."""
+
+    instances = []
+    _ids = itertools.count()
+
+    def __init__(self, host: str, cluster_name: str, port: int = None):
+        self.host = host
+        self.cluster_name = cluster_name
+        self.port = port
+        self.healthy = True
+        self.closed = False
+        self.open_qms = {}
+        self.instances.append(self)
+
+    def list_open_qms(self):
+        if not self.healthy:
+            raise ConnectionError("Server unreachable")
+        return list(self.open_qms)
+
+    def open_qm(self, config, close_other_machines=True):
+        if close_other_machines:
+            self.open_qms.clear()
+        qm = FakeQuantumMachine(f"qm-{next(self._ids)}", config)
+        self.open_qms[qm.id] = qm
+        return qm
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def clean_pool():
+    FakeQmm.instances.clear()
+    get_qmm_pool().close_all()
+    yield
+    get_qmm_pool().close_all()
+
+
+@pytest.fixture
+def machine() -> FixedFrequencyQuam:
+    machine = FixedFrequencyQuam()
+    machine.network = {
+        "qmm_class": f"{__name__}.FakeQmm",
+        "qmm_settings": {"host": "127.0.0.1", "cluster_name": "Cluster_1"},
+    }
+    return machine
+
+
+def test_connections_are_reused(machine):
+    qmm = machine.connect()
+    assert machine.connect() is qmm
+    assert len(FakeQmm.instances) == 1
+
+    # A new connection is made for other settings, or if reuse is disabled
+    machine.network["qmm_settings"]["cluster_name"] = "Cluster_2"
+    assert machine.connect() is not qmm
+    assert machine.connect(reuse=False) is not machine.connect()
+    assert len(FakeQmm.instances) == 3
+    assert len(get_qmm_pool()) == 2
+
+
+def test_unhealthy_connections_are_replaced():
+    pool = QmmPool()
+    settings = {"host": "127.0.0.1", "cluster_name": "Cluster_1"}
+    qmm = pool.connect(FakeQmm, settings)
+    qmm.healthy = False
+
+    new_qmm = pool.connect(FakeQmm, settings)
+    assert new_qmm is not qmm
+    assert qmm.closed
+    assert pool.connect(FakeQmm, settings) is new_qmm
+
+
+def test_open_qm_is_reused_for_unchanged_config(machine):
+    config = {"version": 1, "elements": {"q0.xy": {"intermediate_frequency": 100e6}}}
+    qm = machine.open_qm(config)
+    assert machine.open_qm(dict(config)) is qm
+
+    config["elements"]["q1.xy"] = {"intermediate_frequency": 80e6}
+    new_qm = machine.open_qm(config)
+    assert new_qm is not qm
+    assert new_qm.config == config
+
+    # A QM that was closed in the meantime is opened again
+    machine.qmm.open_qms.clear()
+    assert machine.open_qm(config) is not new_qm
+
+
+def test_open_qm_generates_config(machine):
+    qm = machine.open_qm()
+    assert qm.config == machine.generate_config()
+    assert machine.open_qm() is qm
+
+
+def test_close_all(machine):
+    qmm = machine.connect()
+    get_qmm_pool().close_all()
+    assert qmm.closed
+    assert len(get_qmm_pool()) == 0
+    assert machine.connect() is not qmm
+
+
+def test_config_hash_ignores_key_order():
+    assert config_hash({"a": 1, "b": {"c": 2, "d": 3}}) == config_hash(
+        {"b": {"d": 3, "c": 2}, "a": 1}
+    )
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+
+def _config() -> dict:
+    return {
+        "version": 1,
+        "elements": {
+            "q0.xy": {"intermediate_frequency": 100e6, "operations": {"x180": "q0.xy.x180"}},
+            "q1.xy": {"intermediate_frequency": 90e6},
+        },
+        "mixers": {
+            "q0.xy.mixer": [
+                {"intermediate_frequency": 100e6, "lo_frequency": 5e9, "correction": [1, 0, 0, 1]}
+            ]
+        },
+        "waveforms": {
+            "q0.xy.x180.wf.I": {"type": "arbitrary", "samples": [0.0, 0.1, 0.0]},
+            "q0.xy.custom.wf.I": {
+                "type": "arbitrary",
+                "is_overridable": True,
+                "samples": [0.0, 0.2, 0.0],
+            },
+        },
+    }
+
+
+def test_structural_config_hash():
+    config = _config()
+    new_config = copy.deepcopy(config)
+    new_config["elements"]["q0.xy"]["intermediate_frequency"] = 120e6
+    new_config["mixers"]["q0.xy.mixer"][0]["correction"] = [1.1, 0, 0, 0.9]
+    new_config["waveforms"]["q0.xy.custom.wf.I"]["samples"] = [0.0, 0.3, 0.0]
+    assert structural_config_hash(new_config) == structural_config_hash(config)
+    assert config_hash(new_config) != config_hash(config)
+
+    for change in (
+        lambda c: c["waveforms"]["q0.xy.x180.wf.I"]["samples"].append(0.0),
+        lambda c: c["waveforms"]["q0.xy.custom.wf.I"]["samples"].append(0.0),
+        lambda c: c["mixers"]["q0.xy.mixer"][0].update(lo_frequency=6e9),
+        lambda c: c["elements"]["q1.xy"].update(intermediate_frequency=None),
+    ):
+        changed = copy.deepcopy(config)
+        change(changed)
+        assert structural_config_hash(changed) != structural_config_hash(config)
+
+
+def test_plan_runtime_update():
+    config = _config()
+    new_config = copy.deepcopy(config)
+    new_config["elements"]["q0.xy"]["intermediate_frequency"] = 120e6
+    new_config["mixers"]["q0.xy.mixer"][0].update(intermediate_frequency=120e6)
+    new_config["waveforms"]["q0.xy.custom.wf.I"]["samples"] = [0.0, 0.3, 0.0]
+
+    update = plan_runtime_update(config, new_config)
+    assert update.intermediate_frequencies == {"q0.xy": 120e6}
+    assert update.mixer_corrections == [("q0.xy.mixer", 120e6, 5e9, (1, 0, 0, 1))]
+    assert update.waveforms == {"q0.xy.custom.wf.I": [0.0, 0.3, 0.0]}
+    assert not plan_runtime_update(config, copy.deepcopy(config))
+
+
+def test_open_qm_applies_runtime_updates(machine):
+    config = _config()
+    qm = machine.open_qm(config)
+
+    # An integer frequency, as for an integer RF and LO frequency in quam
+    config["elements"]["q0.xy"]["intermediate_frequency"] = 120_000_000
+    config["mixers"]["q0.xy.mixer"][0].update(intermediate_frequency=120e6)
+    assert machine.open_qm(config) is qm
+    assert qm.updates == [
+        ("intermediate_frequency", "q0.xy", 120e6),
+        ("mixer", "q0.xy.mixer", 120e6, 5e9, (1, 0, 0, 1)),
+    ]
+    assert get_qmm_pool().execution_overrides(qm) == {}
+
+    config["waveforms"]["q0.xy.custom.wf.I"]["samples"] = np.array([0.0, 0.3, 0.0])
+    assert machine.open_qm(config) is qm
+    assert len(qm.updates) == 2
+    assert get_qmm_pool().execution_overrides(qm) == {
+        "waveforms": {"q0.xy.custom.wf.I": [0.0, 0.3, 0.0]}
+    }
+
+    # Without runtime updates, a changed config opens a new quantum machine
+    config["elements"]["q1.xy"]["intermediate_frequency"] = 95e6
+    new_qm = machine.open_qm(config, runtime_updates=False)
+    assert new_qm is not qm
+    assert new_qm.updates == []
+
+
+def test_config_hash_of_numpy_arrays():
+    samples = np.zeros(2000)
+    changed = samples.copy()
+    changed[1000] = 0.1
+    assert config_hash({"samples": samples}) != config_hash({"samples": changed})
@@ -0,0 +1,130 @@
+"""Tests for the diff-based flux offsets of ``FluxTunableQuam.set_all_fluxes``."""
+
+import pytest
+
+from qm import generate_qua_script
+from qm.grpc.qm.pb import inc_qua_pb2
+from qm.qua import declare, for_, pause, program, set_dc_offset
+from qm.qua._scope_management.scopes_manager import scopes_manager
+
+
+from quam_builder.architecture.superconducting.qpu import FluxTunableQuam
+from quam_builder.tools.dc_offset_tracker import forget_dc_offsets, is_dc_offset_set
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(machine) -> FluxTunableQuam:
+    for i, qubit in enumerate(machine.qubits.values()):
+        qubit.z.min_offset = -0.1 * (i + 1)
+        qubit.z.independent_offset = 0.05 * (i + 1)
+        qubit.z.settle_time = 100
+    machine.active_qubit_names = list(machine.qubits)
+    return machine
+
+
+def count_offsets(script: str, element: str = "") -> int:
+    return script.count(f"set_dc_offset('{element}")
+
+
+def test_repeated_call_emits_nothing(machine):
+    q0 = machine.qubits["q0"]
+    with program() as prog:
+        machine.set_all_fluxes("independent", q0)
+        machine.set_all_fluxes("independent", q0)
+    script = generate_qua_script(prog)
+
+    assert count_offsets(script) == 3
+    assert script.count("wait(100,") == 3
+
+
+def test_switching_target_only_emits_changed_offsets(machine):
+    q0, q1 = machine.qubits["q0"], machine.qubits["q1"]
+    with program() as prog:
+        machine.set_all_fluxes("independent", q0)
+        machine.set_all_fluxes("independent", q1)
+    script = generate_qua_script(prog)
+
+    # The targets are set to their independent offset without passing through min
+    assert count_offsets(script, "q0.z") == 2
+    assert count_offsets(script, "q1.z") == 2
+    assert count_offsets(script, "q2.z") == 1
+    assert script.count("wait(100, 'q2.z')") == 1
+
+
+def test_skip_unchanged_false_emits_everything(machine):
+    q0 = machine.qubits["q0"]
+    with program() as prog:
+        machine.set_all_fluxes("independent", q0)
+        machine.set_all_fluxes("independent", q0, skip_unchanged=False)
+    script = generate_qua_script(prog)
+
+    assert count_offsets(script) == 3 + 4
+
+
+def test_scope_internals_are_supported(machine):
+    """The installed qm-qua exposes the scope statements that the tracker inspects."""
+    with program():
+        scope = scopes_manager.current_scope
+        machine.qubits["q0"].z.set_dc_offset(0.1)
+        statements = scope.statements
+        assert isinstance(statements[-1], inc_qua_pb2.QuaProgram.AnyStatement)
+        assert statements[-1].WhichOneof("statement_oneof") == "setDcOffset"
+
+
+def test_loop_body_emits_offsets_again(machine):
+    with program() as prog:
+        n = declare(int)
+        machine.set_all_fluxes("min")
+        with for_(n, 0, n < 2, n + 1):
+            machine.set_all_fluxes("min")
+            machine.set_all_fluxes("min")
+        # The loop body set the flux lines, so their offsets are emitted again
+        machine.set_all_fluxes("min")
+    script = generate_qua_script(prog)
+
+    assert count_offsets(script) == 9
+
+
+def test_loop_without_offsets_keeps_them(machine):
+    q0 = machine.qubits["q0"]
+    with program() as prog:
+        n = declare(int)
+        machine.set_all_fluxes("min")
+        with for_(n, 0, n < 2, n + 1):
+            q0.xy.wait(100)
+        machine.set_all_fluxes("min")
+    script = generate_qua_script(prog)
+
+    assert count_offsets(script) == 3
+
+
+def test_untracked_statements_invalidate_offsets(machine):
+    q0 = machine.qubits["q0"]
+    with program():
+        n = declare(int)
+        machine.set_all_fluxes("min")
+        with for_(n, 0, n < 2, n + 1):
+            set_dc_offset("q1.z", "single", 0.3)
+        assert is_dc_offset_set("q0.z", q0.z.min_offset)
+        assert not is_dc_offset_set("q1.z", machine.qubits["q1"].z.min_offset)
+
+        pause()
+        assert not is_dc_offset_set("q0.z", q0.z.min_offset)
+        machine.set_all_fluxes("min")
+
+        forget_dc_offsets("q2.z")
+        assert not is_dc_offset_set("q2.z", machine.qubits["q2"].z.min_offset)
+        assert is_dc_offset_set("q0.z", q0.z.min_offset)
+
+
+def test_qua_offsets_are_never_skipped(machine):
+    q0 = machine.qubits["q0"]
+    with program() as prog:
+        offset = declare(float)
+        assert q0.z.set_dc_offset(offset, skip_unchanged=True)
+        assert q0.z.set_dc_offset(offset, skip_unchanged=True)
+        assert q0.z.set_dc_offset(0.1, skip_unchanged=True)
+        assert not q0.z.set_dc_offset(0.1, skip_unchanged=True)
+    assert count_offsets(generate_qua_script(prog), "q0.z") == 3
@@ -0,0 +1,94 @@
+"""Tests for the linear nearest-center state discrimination."""
+
+import re
+
+import numpy as np
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import declare, fixed, for_, program
+
+
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.tools.qua_tools import declare_pooled
+from quam_builder.tools.state_discrimination import (
+    LinearBoundary,
+    NearestCenterDiscriminator,
+    nearest_center_discriminator,
+)
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(make_machine) -> FixedFrequencyQuam:
+    machine = make_machine(FixedFrequencyQuam, num_qubits=2)
+    for qubit in machine.qubits.values():
+        qubit.resonator.RF_frequency = 7.1e9
+        qubit.resonator.GEF_frequency_shift = -1e6
+        qubit.resonator.gef_centers = [[1e-4, 2e-4], [-3e-4, 1e-4], [-2e-4, -4e-4]]
+    return machine
+
+
+@pytest.mark.parametrize("num_states", [2, 3, 4])
+def test_discriminator_matches_nearest_center(num_states):
+    rng = np.random.default_rng(num_states)
+    centers = rng.normal(scale=1e-3, size=(num_states, 2))
+    discriminator = NearestCenterDiscriminator(centers)
+
+    for I, Q in rng.normal(scale=2e-3, size=(2000, 2)):
+        expected = np.argmin(np.sum((centers - (I, Q)) ** 2, axis=1))
+        assert discriminator.classify(I, Q) == expected
+
+
+def test_boundaries_are_normalised():
+    boundary = LinearBoundary.between((1e-4, 2e-4), (-3e-4, 1e-4))
+    assert boundary.x_is_I
+    assert not boundary.greater
+    assert abs(boundary.coefficient) <= 1
+    # Points just either side of the midpoint between the centers
+    assert not boundary.evaluate(-0.9e-4, 1.5e-4)
+    assert boundary.evaluate(-1.1e-4, 1.5e-4)
+
+    with pytest.raises(ValueError, match="equal"):
+        NearestCenterDiscriminator([(0, 0), (0, 0)])
+    with pytest.raises(ValueError, match="two state centers"):
+        NearestCenterDiscriminator([(0, 0)])
+
+
+def test_discriminators_are_cached():
+    centers = [[0, 0], [1e-3, 0], [0, 1e-3]]
+    assert nearest_center_discriminator(centers) is nearest_center_discriminator(
+        tuple(map(tuple, centers))
+    )
+
+
+def test_readout_state_gef_uses_linear_comparisons(machine):
+    with program() as prog:
+        state = declare(int)
+        n = declare(int)
+        with for_(n, 0, n < 10, n + 1):
+            for qubit in machine.qubits.values():
+                qubit.readout_state_gef(state, pulse_name="readout")
+    script = generate_qua_script(prog)
+
+    assert "argmin" not in script
+    assert "size=3" not in script
+    # n, state and one I/Q pair per resonator, reused in every iteration
+    assert script.count("declare(") == 2 + 2 * 2
+    q0_measure, q1_measure = [line for line in script.splitlines() if "measure(" in line]
+    assert not set(re.findall(r"v\d+", q0_measure)) & set(re.findall(r"v\d+", q1_measure))
+    # Three boundaries, two of which are evaluated per readout
+    assert script.count("if (") + script.count("if_(") == 2 * 3
+
+
+def test_declare_pooled():
+    with program() as prog:
+        first = declare_pooled(fixed, "I")
+        n = declare(int)
+        with for_(n, 0, n < 10, n + 1):
+            assert declare_pooled(fixed, "I") is first
+        assert declare_pooled(int, "I") is not first
+    with program():
+        assert declare_pooled(fixed, "I") is not first
+    assert generate_qua_script(prog).count("declare(") == 3
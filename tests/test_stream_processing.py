@@ -0,0 +1,84 @@
+"""Tests for the stream-processing templates."""
+
+import pytest
+
+from qm import generate_qua_script
+from qm.qua import declare, declare_stream, program, save, stream_processing
+
+
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.tools.stream_processing import (
+    save_averaged,
+    save_averaged_iq,
+    save_state_histograms,
+    save_state_populations,
+)
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+@pytest.fixture
+def machine(make_machine) -> FixedFrequencyQuam:
+    return make_machine(FixedFrequencyQuam)
+
+
+def _stream_processing(script: str) -> str:
+    return script.split("with stream_processing():")[1].split("config = ")[0]
+
+
+def test_averaged_iq_per_qubit(machine):
+    with program() as prog:
+        I, I_st, Q, Q_st, n, n_st = machine.declare_qua_variables()
+        for i in range(3):
+            save(I[i], I_st[i])
+            save(Q[i], Q_st[i])
+        with stream_processing():
+            save_averaged_iq(I_st, Q_st, shape=(5, 10))
+    sp = _stream_processing(generate_qua_script(prog))
+
+    for name in ("I1", "I2", "I3", "Q1", "Q2", "Q3"):
+        assert f'.buffer(5, 10).average().save("{name}")' in sp
+    assert "save_all" not in sp
+
+
+def test_averaged_iq_array_layout(machine):
+    with program() as prog:
+        I, I_st, Q, Q_st, n, n_st = machine.declare_qua_array_variables()
+        with stream_processing():
+            save_averaged_iq(I_st, Q_st, shape=20, num_qubits=3)
+    sp = _stream_processing(generate_qua_script(prog))
+
+    assert sp.count(".buffer(20, 3).average()") == 2
+    assert '.save("I")' in sp and '.save("Q")' in sp
+
+
+def test_state_populations_and_histograms():
+    with program() as prog:
+        state = declare(int)
+        flag = declare(bool)
+        state_st = [declare_stream() for _ in range(2)]
+        flag_st = declare_stream()
+        for stream in state_st:
+            save(state, stream)
+        save(flag, flag_st)
+        with stream_processing():
+            save_state_populations(state_st, shape=7)
+            save_state_populations(flag_st, shape=(), boolean=True, name="flag")
+            save_state_histograms(state_st, num_states=3)
+    sp = _stream_processing(generate_qua_script(prog))
+
+    assert '.buffer(7).average().save("state1")' in sp
+    assert '.buffer(7).average().save("state2")' in sp
+    assert "boolean_to_int" in sp and '.average().save("flag")' in sp
+    assert sp.count(".histogram([[0, 0], [1, 1], [2, 2]])") == 2
+    assert '.save("state_histogram2")' in sp
+
+
+def test_invalid_layouts():
+    with program():
+        I_st = [declare_stream() for _ in range(2)]
+        with stream_processing():
+            with pytest.raises(ValueError, match="num_qubits"):
+                save_averaged(I_st, 10, "I", num_qubits=2)
+            with pytest.raises(ValueError, match="one stream per qubit"):
+                save_state_histograms(I_st[0])
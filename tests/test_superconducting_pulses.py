@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from qualang_tools.config.waveform_tools import (
+    drag_cosine_pulse_waveforms,
+    drag_gaussian_pulse_waveforms,
+)
+
+from quam_builder.architecture.superconducting.components.pulses import (
+    CosineBipolarPulse,
+    DragCosinePulse,
+    DragGaussianPulse,
+    SNZPulse,
+)
+
+
+def _reference(I, Q, axis_angle):
+    I, Q = np.array(I), np.array(Q)
+    I_rot = I * np.cos(axis_angle) - Q * np.sin(axis_angle)
+    Q_rot = I * np.sin(axis_angle) + Q * np.cos(axis_angle)
+    return I_rot + 1.0j * Q_rot
+
+
+@pytest.mark.parametrize("axis_angle", [0.0, np.pi / 2, -np.pi / 2, np.pi])
+@pytest.mark.parametrize("detuning", [0.0, 3e6])
+@pytest.mark.parametrize("subtracted", [True, False])
+def test_drag_gaussian_matches_qualang_tools(axis_angle, detuning, subtracted):
+    params = dict(
+        amplitude=0.1, length=40, sigma=7, alpha=0.4, anharmonicity=-180e6, detuning=detuning
+    )
+    pulse = DragGaussianPulse(axis_angle=axis_angle, subtracted=subtracted, **params)
+    expected = _reference(
+        *drag_gaussian_pulse_waveforms(subtracted=subtracted, **params), axis_angle
+    )
+
+    waveform = pulse.waveform_function()
+
+    assert isinstance(waveform, np.ndarray)
+    assert waveform.dtype == np.complex128
+    np.testing.assert_allclose(waveform, expected, rtol=0, atol=1e-15)
+
+
+@pytest.mark.parametrize("axis_angle", [0.0, np.pi / 2])
+@pytest.mark.parametrize("detuning", [0.0, 3e6])
+def test_drag_cosine_matches_qualang_tools(axis_angle, detuning):
+    params = dict(amplitude=0.1, length=40, alpha=0.4, anharmonicity=-180e6, detuning=detuning)
+    pulse = DragCosinePulse(axis_angle=axis_angle, **params)
+    expected = _reference(*drag_cosine_pulse_waveforms(**params), axis_angle)
+
+    np.testing.assert_allclose(pulse.waveform_function(), expected, rtol=0, atol=1e-15)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [dict(anharmonicity=0.0), dict(anharmonicity=5e6, detuning=5e6), dict(axis_angle=None)],
+)
+def test_drag_invalid_parameters_raise(overrides):
+    params = dict(amplitude=0.1, length=40, sigma=7, alpha=0.4, anharmonicity=-180e6)
+    params["axis_angle"] = 0.0
+    params.update(overrides)
+    with pytest.raises(ValueError):
+        DragGaussianPulse(**params).waveform_function()
+
+
+def test_drag_without_correction_allows_equal_detuning():
+    pulse = DragGaussianPulse(
+        amplitude=0.1, length=40, sigma=7, alpha=0.0, anharmonicity=0.0, axis_angle=0.0
+    )
+    assert np.allclose(pulse.waveform_function().imag, 0)
+
+
+@pytest.mark.parametrize(
+    "pulse",
+    [
+        CosineBipolarPulse(length=40, amplitude=0.2, flat_length=20),
+        SNZPulse(amplitude=0.2, flat_length=20, t_phi_eff=3.0, padding=2),
+    ],
+)
+@pytest.mark.parametrize("axis_angle", [None, np.pi / 2])
+def test_flux_pulses_return_arrays(pulse, axis_angle):
+    pulse.axis_angle = axis_angle
+    waveform = pulse.waveform_function()
+
+    assert isinstance(waveform, np.ndarray)
+    assert waveform.flags.c_contiguous
+    assert len(waveform) == pulse.length
+    assert np.iscomplexobj(waveform) == (axis_angle is not None)
@@ -0,0 +1,211 @@
+"""Tests for the opt-in waveform memoization."""
+
+import numpy as np
+import pytest
+
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.components.pulses import (
+    DragCosinePulse,
+    DragGaussianPulse,
+)
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.builder.superconducting.add_default_pulses import add_DragGaussian_pulses
+from quam_builder.builder.superconducting.modify_quam import add_qubit
+from quam_builder.common.pulses import DrachmaReadoutPulse
+from quam_builder.tools import waveform_cache
+from quam_builder.tools.waveform_cache import (
+    WaveformCache,
+    disable_waveform_cache,
+    enable_waveform_cache,
+    get_waveform_cache,
+    prefill_waveform_cache,
+    waveform_cache_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_active_cache():
+    disable_waveform_cache()
+    yield
+    disable_waveform_cache()
+
+
+def _drachma(**overrides):
+    kwargs = dict(
+        length=100,
+        amplitude=0.5,
+        resonator_kappa_hz=564700.0,
+        detuning_ground_hz=299000.0,
+        detuning_excited_hz=-299000.0,
+    )
+    kwargs.update(overrides)
+    return DrachmaReadoutPulse(**kwargs)
+
+
+def _drag(**overrides):
+    kwargs = dict(
+        length=40,
+        amplitude=0.1,
+        sigma=8,
+        alpha=0.5,
+        anharmonicity=-200e6,
+        axis_angle=0.0,
+    )
+    kwargs.update(overrides)
+    return DragGaussianPulse(**kwargs)
+
+
+def test_disabled_by_default():
+    assert get_waveform_cache() is None
+    waveform = _drachma().waveform_function()
+    assert waveform.flags.writeable
+
+
+def test_key_depends_on_parameters_only():
+    assert waveform_cache_key(_drachma()) == waveform_cache_key(_drachma(id="other"))
+    assert waveform_cache_key(_drachma()) != waveform_cache_key(_drachma(amplitude=0.4))
+    assert waveform_cache_key(_drachma()) != waveform_cache_key(_drag())
+
+
+def test_key_depends_on_cache_version(monkeypatch):
+    key = waveform_cache_key(_drachma())
+    monkeypatch.setattr(
+        waveform_cache, "WAVEFORM_CACHE_VERSION", waveform_cache.WAVEFORM_CACHE_VERSION + 1
+    )
+    assert waveform_cache_key(_drachma()) != key
+
+
+def test_memory_cache_reuses_waveform():
+    cache = enable_waveform_cache()
+    first = _drag().waveform_function()
+    second = _drag().waveform_function()
+
+    assert second is first
+    assert not first.flags.writeable
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(first, _drag().waveform_function())
+
+
+def test_cached_waveform_matches_uncached():
+    expected = _drachma().waveform_function()
+    enable_waveform_cache()
+    _drachma().waveform_function()
+    np.testing.assert_array_equal(_drachma().waveform_function(), expected)
+
+
+def test_memory_lru_evicts_oldest():
+    cache = WaveformCache(max_memory_entries=2)
+    for key in "abc":
+        cache.put(key, np.zeros(4))
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+def test_disk_cache_is_memory_mapped(tmp_path):
+    enable_waveform_cache(cache_dir=tmp_path)
+    expected = _drachma().waveform_function()
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+    # A fresh cache, e.g. in a new session, only has the disk store
+    cache = enable_waveform_cache(cache_dir=tmp_path)
+    waveform = _drachma().waveform_function()
+
+    assert isinstance(waveform, np.memmap)
+    np.testing.assert_array_equal(waveform, expected)
+    assert cache.hits == 1
+
+
+def test_disk_cache_evicts_by_size(tmp_path):
+    cache = WaveformCache(cache_dir=tmp_path, max_disk_bytes=3000)
+    for i in range(5):
+        cache.put(f"key{i}", np.full(100, i, dtype=np.float64))
+
+    files = list(tmp_path.glob("*.npy"))
+    assert sum(f.stat().st_size for f in files) <= 3000
+    assert (tmp_path / "key4.npy").exists()
+
+
+def test_clear_removes_disk_store(tmp_path):
+    cache = WaveformCache(cache_dir=tmp_path)
+    cache.put("key", np.zeros(4))
+    cache.clear(disk=True)
+    assert len(cache) == 0
+    assert cache.get("key") is None
+    assert not list(tmp_path.glob("*.npy"))
+
+
+def _drag_cosine(**overrides):
+    kwargs = dict(length=40, amplitude=0.1, alpha=0.5, anharmonicity=-200e6, axis_angle=0.0)
+    kwargs.update(overrides)
+    return DragCosinePulse(**kwargs)
+
+
+@pytest.mark.parametrize("make_pulse", [_drag, _drag_cosine])
+def test_batch_waveform_function_matches_single_pulses(make_pulse):
+    pulses = [
+        make_pulse(),
+        make_pulse(amplitude=0.05, axis_angle=np.pi / 2),
+        make_pulse(alpha=0.0, anharmonicity=0.0, axis_angle=-np.pi / 2),
+        make_pulse(detuning=2e6, axis_angle=np.pi),
+    ]
+    waveforms = type(pulses[0]).batch_waveform_function(pulses)
+    for pulse, waveform in zip(pulses, waveforms):
+        np.testing.assert_allclose(waveform, pulse.waveform_function(), rtol=0, atol=1e-15)
+
+
+def test_batch_waveform_function_skips_invalid_pulses():
+    waveforms = DragGaussianPulse.batch_waveform_function([_drag(), _drag(anharmonicity=0.0)])
+    assert waveforms[0] is not None
+    assert waveforms[1] is None
+
+
+def test_prefill_requires_a_cache():
+    with pytest.raises(ValueError):
+        prefill_waveform_cache([_drag()])
+
+
+def test_prefill_computes_each_distinct_pulse_once():
+    cache = enable_waveform_cache()
+    pulses = [_drag(), _drag(id="y180", axis_angle=np.pi / 2), _drag(), _drag(length=20)]
+    pulses += [_drachma()]  # No batch implementation, left to waveform_function
+
+    assert prefill_waveform_cache(pulses) == 3
+    assert prefill_waveform_cache(pulses) == 0
+
+    waveform = pulses[1].waveform_function()
+    assert cache.hits == 1
+    np.testing.assert_allclose(waveform, _drag(axis_angle=np.pi / 2).waveform_function())
+
+
+def test_prefill_machine_gives_same_config(compatible_quam_config):
+    machine = FixedFrequencyQuam(ports=FEMPortsContainer())
+    for qubit_id, base in (("q0", 1), ("q1", 3)):
+        add_qubit(
+            machine,
+            qubit_id,
+            {
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/{base}/1"},
+                "rr": {
+                    "opx_output": f"#/ports/mw_outputs/con1/{base + 1}/1",
+                    "opx_input": f"#/ports/mw_inputs/con1/{base + 1}/1",
+                },
+            },
+        )
+        machine.qubits[qubit_id].anharmonicity = -200e6
+        add_DragGaussian_pulses(
+            machine.qubits[qubit_id], amplitude=0.1, length=40, sigma=8, alpha=0.5, detuning=0.0
+        )
+    expected = machine.generate_config()
+
+    enable_waveform_cache()
+    assert prefill_waveform_cache(machine.iterate_components()) > 0
+    config = machine.generate_config()
+
+    assert config["waveforms"].keys() == expected["waveforms"].keys()
+    for name, waveform in expected["waveforms"].items():
+        if waveform["type"] == "arbitrary":
+            np.testing.assert_allclose(
+                config["waveforms"][name]["samples"], waveform["samples"], atol=1e-15
+            )
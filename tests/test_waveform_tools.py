@@ -0,0 +1,175 @@
+"""Tests for the waveform post-processing tools."""
+
+import numpy as np
+import pytest
+
+from quam.components.ports import FEMPortsContainer
+
+from quam_builder.architecture.superconducting.qpu import FixedFrequencyQuam
+from quam_builder.builder.superconducting.add_default_pulses import add_DragGaussian_pulses
+from quam_builder.builder.superconducting.modify_quam import add_qubit
+from quam_builder.common.pulses import FlatTopGaussianPulse
+from quam_builder.tools.waveform_tools import (
+    BYTES_PER_SAMPLE,
+    analyze_waveform_memory,
+    deduplicate_waveforms,
+    waveform_fingerprint,
+    waveform_num_samples,
+)
+
+pytestmark = pytest.mark.usefixtures("compatible_quam_config")
+
+
+def _config():
+    samples = np.linspace(0, 0.1, 40).tolist()
+    return {
+        "waveforms": {
+            "a.wf": {"type": "arbitrary", "samples": samples},
+            "b.wf": {"type": "arbitrary", "samples": list(samples)},
+            "c.wf": {"type": "arbitrary", "samples": samples[::-1]},
+            "zero_wf": {"type": "constant", "sample": 0.0},
+            "a.zero": {"type": "constant", "sample": np.float64(0.0)},
+            "over.wf": {"type": "arbitrary", "samples": samples, "is_overridable": True},
+        },
+        "pulses": {
+            "a.pulse": {"waveforms": {"I": "a.wf", "Q": "a.zero"}},
+            "b.pulse": {"waveforms": {"I": "b.wf", "Q": "zero_wf"}},
+            "c.pulse": {"waveforms": {"single": "c.wf"}},
+            "over.pulse": {"waveforms": {"single": "over.wf"}},
+        },
+    }
+
+
+def test_fingerprint_ignores_sample_container_type():
+    samples = [0.1, 0.2, 0.3]
+    assert waveform_fingerprint({"type": "arbitrary", "samples": samples}) == waveform_fingerprint(
+        {"type": "arbitrary", "samples": np.array(samples)}
+    )
+
+
+def test_fingerprint_distinguishes_extra_fields():
+    samples = [0.1, 0.2, 0.3]
+    assert waveform_fingerprint({"type": "arbitrary", "samples": samples}) != waveform_fingerprint(
+        {"type": "arbitrary", "samples": samples, "max_allowed_error": 1e-3}
+    )
+
+
+def test_deduplicate_merges_identical_waveforms():
+    config = _config()
+    report = deduplicate_waveforms(config)
+
+    assert report.merged == {"b.wf": "a.wf", "a.zero": "zero_wf"}
+    assert set(config["waveforms"]) == {"a.wf", "c.wf", "zero_wf", "over.wf"}
+    assert config["pulses"]["a.pulse"]["waveforms"] == {"I": "a.wf", "Q": "zero_wf"}
+    assert config["pulses"]["b.pulse"]["waveforms"] == {"I": "a.wf", "Q": "zero_wf"}
+    assert config["pulses"]["c.pulse"]["waveforms"] == {"single": "c.wf"}
+
+
+def test_deduplicate_keeps_overridable_waveforms():
+    config = _config()
+    deduplicate_waveforms(config)
+    assert config["pulses"]["over.pulse"]["waveforms"] == {"single": "over.wf"}
+
+
+def test_deduplicate_reports_savings():
+    report = deduplicate_waveforms(_config())
+
+    assert report.num_waveforms_before == 6
+    assert report.num_waveforms_after == 4
+    assert report.samples_saved == 41
+    assert report.bytes_saved == 41 * BYTES_PER_SAMPLE
+
+
+def test_deduplicate_generated_config_scales_with_distinct_shapes():
+    machine = FixedFrequencyQuam(ports=FEMPortsContainer())
+    for qubit_id, base in (("q0", 1), ("q1", 3), ("q2", 5)):
+        add_qubit(
+            machine,
+            qubit_id,
+            {
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/{base}/1"},
+                "rr": {
+                    "opx_output": f"#/ports/mw_outputs/con1/{base + 1}/1",
+                    "opx_input": f"#/ports/mw_inputs/con1/{base + 1}/1",
+                },
+            },
+        )
+    config = machine.generate_config()
+    num_waveforms = len(config["waveforms"])
+
+    report = deduplicate_waveforms(config)
+
+    assert report.merged
+    assert len(config["waveforms"]) == num_waveforms - len(report.merged)
+    used = {name for pulse in config["pulses"].values() for name in pulse["waveforms"].values()}
+    assert used <= set(config["waveforms"])
+
+
+def _machine_with_flat_top(split_flat_top: bool = False):
+    machine = FixedFrequencyQuam(ports=FEMPortsContainer())
+    for qubit_id, fem in (("q0", 1), ("q1", 2)):
+        add_qubit(
+            machine,
+            qubit_id,
+            {
+                "xy": {"opx_output": f"#/ports/mw_outputs/con1/{fem}/1"},
+                "rr": {
+                    "opx_output": f"#/ports/mw_outputs/con1/{fem}/2",
+                    "opx_input": f"#/ports/mw_inputs/con1/{fem}/1",
+                },
+            },
+        )
+    for qubit in machine.qubits.values():
+        qubit.anharmonicity = -200e6
+        add_DragGaussian_pulses(qubit, amplitude=0.1, length=40, sigma=8, alpha=0.5, detuning=0.0)
+    machine.qubits["q0"].xy.operations["long"] = FlatTopGaussianPulse(
+        length=2048, flat_length=2000, amplitude=0.1, axis_angle=0.0, split_flat_top=split_flat_top
+    )
+    return machine
+
+
+def _config_num_samples(config):
+    return sum(
+        waveform_num_samples(wf) for wf in config["waveforms"].values() if wf["type"] == "arbitrary"
+    )
+
+
+def test_analyze_matches_generated_config():
+    machine = _machine_with_flat_top()
+    report = analyze_waveform_memory(machine)
+
+    assert report.total_samples == _config_num_samples(machine.generate_config())
+    assert set(report.samples_per_fem) == {("con1", 1), ("con1", 2)}
+    assert sum(report.samples_per_controller.values()) == report.total_samples
+    assert report.samples_per_fem[("con1", 1)] > report.samples_per_fem[("con1", 2)]
+
+
+def test_analyze_reports_largest_pulse_and_savings():
+    machine = _machine_with_flat_top()
+    report = analyze_waveform_memory(machine)
+
+    largest = report.largest(1)[0]
+    assert (largest.channel, largest.pulse) == ("q0.xy", "long")
+    assert (largest.controller, largest.fem) == ("con1", 1)
+    assert largest.num_samples == 2 * 2048
+    assert report.splittable_samples == largest.splittable_samples == 2 * 2000
+    assert report.duplicate_samples > 0
+
+    config = machine.generate_config()
+    num_samples = _config_num_samples(config)
+    deduplicate_waveforms(config)
+    assert report.duplicate_samples == num_samples - _config_num_samples(config)
+    assert "long" in str(report)
+
+
+def test_analyze_split_flat_top():
+    report = analyze_waveform_memory(_machine_with_flat_top(split_flat_top=True))
+    entry = next(e for e in report.entries if e.pulse == "long")
+
+    assert entry.num_samples == 2 * 2 * 24  # Rise and fall, I and Q
+    assert report.splittable_samples == 0
+
+
+def test_analyze_raises_when_budget_exceeded():
+    with pytest.raises(ValueError, match="q0.xy.long"):
+        analyze_waveform_memory(_machine_with_flat_top(), max_samples_per_fem=4000)